@@ -0,0 +1,101 @@
+"""ORM vs. raw asyncpg fast path, per repository query.
+
+Runs each hot read against the configured database (see `.env`) through
+both repository flavours on the same session and prints mean/p50/p95
+latency per call. Needs at least one currency rate and one deal.
+
+Usage:
+  python -m benchmarks.fast_path [--iterations 2000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import func, select
+
+from cea.db.database import async_session, engine
+from cea.db.models import CurrencyRate, Deal
+from cea.db.repositories.currency_rate import CurrencyRateRepository
+from cea.db.repositories.deal import DealRepository
+from cea.db.repositories.fast_currency_rate import FastCurrencyRateRepository
+from cea.db.repositories.fast_deal import FastDealRepository
+
+
+async def _measure(
+    call: Callable[[], Awaitable[Any]], iterations: int
+) -> list[float]:
+    for _ in range(min(iterations // 10, 100)):  # warm caches
+        await call()
+    timings: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _row(name: str, flavour: str, timings: list[float]) -> str:
+    q = statistics.quantiles(timings, n=100)
+    return (
+        f'{name:<28} {flavour:<5} '
+        f'{statistics.fmean(timings) * 1e6:>9.1f} '
+        f'{q[49] * 1e6:>9.1f} {q[94] * 1e6:>9.1f}'
+    )
+
+
+async def main(iterations: int) -> None:
+    orm_rates = CurrencyRateRepository(CurrencyRate)
+    fast_rates = FastCurrencyRateRepository(CurrencyRate)
+    orm_deals = DealRepository(Deal)
+    fast_deals = FastDealRepository(Deal)
+
+    async with async_session() as session:
+        rate_date = await session.scalar(select(func.max(CurrencyRate.rate_date)))
+        abbreviation = await session.scalar(
+            select(CurrencyRate.abbreviation).limit(1)
+        )
+        rate_id = await session.scalar(select(CurrencyRate.id).limit(1))
+        deal_id = await session.scalar(select(Deal.id).limit(1))
+        if rate_date is None or deal_id is None:
+            raise SystemExit('Seed at least one currency rate and one deal')
+
+        cases: list[tuple[str, Callable[[Any], Awaitable[Any]]]] = [
+            (
+                'get_latest_by_abbreviation',
+                lambda repo: repo.get_latest_by_abbreviation(
+                    session, abbreviation
+                ),
+            ),
+            (
+                'list_by_date',
+                lambda repo: repo.list_by_date(session, rate_date=rate_date),
+            ),
+            ('rates.get_by_id', lambda repo: repo.get_by_id(session, rate_id)),
+        ]
+        deal_cases: list[tuple[str, Callable[[Any], Awaitable[Any]]]] = [
+            ('deals.get_by_id', lambda repo: repo.get_by_id(session, deal_id)),
+            ('list_pending', lambda repo: repo.list_pending(session)),
+        ]
+
+        print(f'{"query":<28} {"path":<5} {"mean_us":>9} {"p50_us":>9} {"p95_us":>9}')
+        for pairs, (orm, fast) in (
+            (cases, (orm_rates, fast_rates)),
+            (deal_cases, (orm_deals, fast_deals)),
+        ):
+            for name, call in pairs:
+                for flavour, repo in (('orm', orm), ('fast', fast)):
+                    timings = await _measure(lambda: call(repo), iterations)
+                    # Keep the ORM identity map from growing across runs
+                    session.expunge_all()
+                    print(_row(name, flavour, timings))
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    asyncio.run(main(parser.parse_args().iterations))
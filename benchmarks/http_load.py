@@ -0,0 +1,299 @@
+"""In-process HTTP load benchmark for every API endpoint.
+
+Drives `cea.main:app` through httpx's ASGI transport (no network, no
+uvicorn) against the database configured in `.env`, which should be a
+local Postgres with migrations applied. Missing rates are seeded;
+previews and confirmations create deals. Everything the run creates is
+deleted again at the end, so repeated runs see the same data and their
+results stay comparable.
+
+For each endpoint it sends `--requests` requests from `--concurrency`
+concurrent clients and records throughput and p50/p95/p99 latency. Results
+are written as JSON; `--compare` against an earlier file prints the deltas
+and exits non-zero when p95 latency regressed beyond `--threshold`.
+
+Usage:
+  python -m benchmarks.http_load [--concurrency 16] [--requests 2000]
+      [--endpoints currencies,preview] [--output results.json]
+      [--compare baseline.json] [--threshold 0.10]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+# The benchmark must not hit NBRB or fight over leadership
+os.environ.setdefault('LOAD_RATES_ON_STARTUP', 'false')
+os.environ.setdefault('LOAD_RATES_DAILY', 'false')
+os.environ.setdefault('LOAD_RATES_LEADER_ELECTION', 'false')
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, func, select  # noqa: E402
+from sqlalchemy.dialects.postgresql import insert  # noqa: E402
+
+from cea.db.database import async_session  # noqa: E402
+from cea.db.models import CurrencyRate, Deal  # noqa: E402
+from cea.db.repositories import currency_rate_repository  # noqa: E402
+from cea.main import app  # noqa: E402
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+_SEED_RATES = (('USD', 1, 3.2571), ('EUR', 1, 3.4552), ('RUB', 100, 3.7011))
+# Deals deleted per statement during cleanup
+_CLEANUP_BATCH = 10_000
+
+RequestFactory = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+async def _seed_rates() -> datetime.date | None:
+    """Seed rates into an empty table; returns their date if it did."""
+    async with async_session() as session:
+        latest = await session.scalar(select(func.max(CurrencyRate.rate_date)))
+        if latest is not None:
+            return None
+        stmt = insert(CurrencyRate).values(
+            [
+                {
+                    'abbreviation': abbr,
+                    'scale': scale,
+                    'rate': rate,
+                    'rate_date': datetime.date.today(),
+                }
+                for abbr, scale, rate in _SEED_RATES
+            ]
+        ).on_conflict_do_nothing()
+        await session.execute(stmt)
+        await currency_rate_repository.bump_rate_set_version(session)
+        await session.commit()
+    return datetime.date.today()
+
+
+async def _cleanup(created: list[str], seeded: datetime.date | None) -> None:
+    """Delete the deals (and rates) this run created."""
+    async with async_session() as session:
+        for start in range(0, len(created), _CLEANUP_BATCH):
+            chunk = created[start:start + _CLEANUP_BATCH]
+            await session.execute(delete(Deal).where(Deal.id.in_(chunk)))
+        if seeded is not None:
+            await session.execute(
+                delete(CurrencyRate).where(
+                    CurrencyRate.rate_date == seeded,
+                    CurrencyRate.abbreviation.in_(
+                        [abbr for abbr, _, _ in _SEED_RATES]
+                    ),
+                )
+            )
+            await currency_rate_repository.bump_rate_set_version(session)
+        await session.commit()
+    print(f'Cleaned up {len(created)} deals created by this run')
+
+
+def _previewer(created: list[str]) -> RequestFactory:
+    """Preview request that records the deal it creates in `created`."""
+
+    async def preview(client: httpx.AsyncClient) -> httpx.Response:
+        resp = await client.post(
+            '/exchange/preview',
+            json={
+                'amount_from': 100.0, 'currency_from': 'USD', 'currency_to': 'EUR'
+            },
+        )
+        if resp.status_code < 400:
+            created.append(resp.json()['deal_id'])
+        return resp
+
+    return preview
+
+
+def _scenarios(
+    pending_ids: list[str], created: list[str]
+) -> dict[str, RequestFactory]:
+    report_params = {
+        'date_from': '2000-01-01T00:00:00',
+        'date_to': datetime.datetime.now().isoformat(),
+    }
+
+    async def confirm(client: httpx.AsyncClient) -> httpx.Response:
+        deal_id = pending_ids.pop()
+        return await client.post(
+            '/exchange/confirm', json={'deal_id': deal_id, 'result': 'CONFIRM'}
+        )
+
+    return {
+        'currencies': lambda c: c.get('/currencies'),
+        'preview': _previewer(created),
+        'confirm': confirm,
+        'pending': lambda c: c.get('/deals/pending'),
+        'report': lambda c: c.get('/deals/report', params=report_params),
+    }
+
+
+async def _run(
+    client: httpx.AsyncClient,
+    request: RequestFactory,
+    *,
+    requests: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                resp = await request(client)
+                ok = resp.status_code < 400
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 4),
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'mean_ms': round(statistics.fmean(latencies) * 1e3, 3),
+        'p50_ms': round(q[49] * 1e3, 3),
+        'p95_ms': round(q[94] * 1e3, 3),
+        'p99_ms': round(q[98] * 1e3, 3),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> bool:
+    """Print deltas against a baseline; True if p95 regressed anywhere."""
+    regressed = False
+    print(f'\n{"endpoint":<12} {"metric":<15} {"baseline":>10} {"current":>10} {"delta":>8}')
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        for metric in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms'):
+            before, after = base[metric], result[metric]
+            delta = (after - before) / before if before else 0.0
+            flag = ''
+            if metric == 'p95_ms' and delta > threshold:
+                flag, regressed = '  REGRESSION', True
+            print(
+                f'{name:<12} {metric:<15} {before:>10.2f} {after:>10.2f} '
+                f'{delta:>+7.1%}{flag}'
+            )
+    return regressed
+
+
+async def main(args: argparse.Namespace) -> int:
+    scenarios_wanted = args.endpoints.split(',')
+    pending_ids: list[str] = []
+    # Deals created by this run, deleted at the end
+    created: list[str] = []
+    scenarios = _scenarios(pending_ids, created)
+    unknown = set(scenarios_wanted) - set(scenarios)
+    if unknown:
+        raise SystemExit(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+    # httpx logs every request at INFO
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    seeded = await _seed_rates()
+    results: dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=transport, base_url='http://bench'
+            ) as client:
+                if 'confirm' in scenarios_wanted:
+                    # Every confirmation needs its own pending deal
+                    preview = _previewer(created)
+                    for _ in range(args.requests):
+                        pending_ids.append(
+                            (await preview(client)).json()['deal_id']
+                        )
+                for name in scenarios_wanted:
+                    for _ in range(min(args.warmup, args.requests)):
+                        if name != 'confirm':
+                            await scenarios[name](client)
+                    results[name] = await _run(
+                        client,
+                        scenarios[name],
+                        requests=args.requests,
+                        concurrency=args.concurrency,
+                    )
+                    r = results[name]
+                    print(
+                        f'{name:<12} {r["throughput_rps"]:>9.1f} rps  '
+                        f'p50 {r["p50_ms"]:>8.2f}  p95 {r["p95_ms"]:>8.2f}  '
+                        f'p99 {r["p99_ms"]:>8.2f} ms  errors {r["errors"]}'
+                    )
+    finally:
+        await _cleanup(created, seeded)
+
+    commit = _git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+        },
+        'results': results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f'http_load-{datetime.datetime.now():%Y%m%d-%H%M%S}-{commit or "nogit"}.json'
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f'\nResults written to {output}')
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if _compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument(
+        '--endpoints', default='currencies,preview,confirm,pending,report'
+    )
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--compare', default=None)
+    parser.add_argument('--threshold', type=float, default=0.10)
+    sys.exit(asyncio.run(main(parser.parse_args())))
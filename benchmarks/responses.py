@@ -0,0 +1,102 @@
+"""FastAPI `response_model` serialization vs. the trusted JSON path.
+
+Serves the same 10k-item `PendingDealOut` / `DealReportItem` lists through
+two in-process routes, one returning schema instances (revalidated and
+encoded by FastAPI) and one returning `trusted_json(...)`, and prints the
+mean/p50 request latency of each. No database needed.
+
+Usage:
+  python -m benchmarks.responses [--items 10000] [--iterations 30]
+"""
+
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+
+from cea.api.responses import trusted_json
+from cea.schemas.deal import DealReportItem, PendingDealOut
+
+
+def _pending(n: int) -> list[PendingDealOut]:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        PendingDealOut(
+            id=f'00000000-0000-4000-8000-{i:012d}',
+            created_at=now,
+            amount_from=100.0 + i,
+            amount_to=92.5311 + i,
+            currency_from='USD',
+            currency_to='EUR',
+            rate_from=3.2571,
+            scale_from=1,
+            rate_to=3.5234,
+            scale_to=1,
+        )
+        for i in range(n)
+    ]
+
+
+def _report(n: int) -> list[DealReportItem]:
+    return [
+        DealReportItem(
+            currency=f'C{i:05d}', in_amount=500.0 + i, out_amount=750.0, count=i
+        )
+        for i in range(n)
+    ]
+
+
+def _app(pending: list[PendingDealOut], report: list[DealReportItem]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/model/pending', response_model=list[PendingDealOut])
+    async def model_pending() -> Any:
+        return pending
+
+    @app.get('/fast/pending', response_model=list[PendingDealOut])
+    async def fast_pending() -> Any:
+        return trusted_json(pending, list[PendingDealOut])
+
+    @app.get('/model/report', response_model=list[DealReportItem])
+    async def model_report() -> Any:
+        return report
+
+    @app.get('/fast/report', response_model=list[DealReportItem])
+    async def fast_report() -> Any:
+        return trusted_json(report, list[DealReportItem])
+
+    return app
+
+
+async def main(items: int, iterations: int) -> None:
+    app = _app(_pending(items), _report(items))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        print(f'{items} items, {iterations} iterations')
+        print(f'{"route":<16} {"mean_ms":>9} {"p50_ms":>9} {"bytes":>10}')
+        for path in ('/model/pending', '/fast/pending', '/model/report', '/fast/report'):
+            await client.get(path)  # warm-up
+            timings: list[float] = []
+            size = 0
+            for _ in range(iterations):
+                start = time.perf_counter()
+                resp = await client.get(path)
+                timings.append(time.perf_counter() - start)
+                size = len(resp.content)
+            print(
+                f'{path:<16} {statistics.fmean(timings) * 1e3:>9.2f} '
+                f'{statistics.median(timings) * 1e3:>9.2f} {size:>10}'
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10_000)
+    parser.add_argument('--iterations', type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.iterations))
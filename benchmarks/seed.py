@@ -0,0 +1,296 @@
+"""Synthetic data generator: years of currency rates and millions of deals.
+
+Bulk-loads the database configured in `.env` with COPY so report and
+pending-list queries can be studied at realistic volume. Output depends
+only on `--seed`, `--end-date` and the sizing arguments, not on
+`--workers`: batch N is always generated from its own RNG stream.
+
+- Rates: one row per currency per day, a seeded random walk around a
+  realistic base rate. Existing (rate_date, abbreviation) rows are kept.
+- Deals: weighted currency mix (USD/EUR/RUB dominate), ~87% confirmed,
+  ~13% rejected, well under 1% pending and mostly from the last day; creation
+  time skewed towards recent days and business hours. Amounts are
+  log-normal and converted with that day's rates.
+
+Usage:
+  python -m benchmarks.seed [--deals 1000000] [--years 3] [--seed 42]
+      [--end-date YYYY-MM-DD] [--workers 8] [--batch-size 50000]
+      [--truncate] [--defer-indexes]
+"""
+
+import argparse
+import asyncio
+import bisect
+import datetime
+import math
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import accumulate
+from typing import Any
+
+import asyncpg
+
+from cea.db.database import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
+from cea.enums import DealStatusEnum
+
+# abbreviation, scale, BYN rate at the start of the series, daily volatility
+CURRENCIES: tuple[tuple[str, int, float, float], ...] = (
+    ('USD', 1, 3.2, 0.004),
+    ('EUR', 1, 3.5, 0.005),
+    ('RUB', 100, 3.6, 0.008),
+    ('CNY', 10, 4.5, 0.004),
+    ('PLN', 10, 8.0, 0.006),
+    ('GBP', 1, 4.1, 0.005),
+    ('UAH', 100, 8.5, 0.007),
+    ('KZT', 1000, 6.9, 0.006),
+)
+# Share of deal legs per currency, in CURRENCIES order
+CURRENCY_WEIGHTS = (0.42, 0.28, 0.15, 0.05, 0.04, 0.03, 0.02, 0.01)
+# Older deals are practically never left pending
+RECENT_STATUS_WEIGHTS = (0.05, 0.85, 0.10)
+STATUS_WEIGHTS = (0.002, 0.868, 0.13)
+STATUSES = (
+    DealStatusEnum.PENDING.value,
+    DealStatusEnum.CONFIRMED.value,
+    DealStatusEnum.REJECTED.value,
+)
+# Relative deal volume per hour of day (UTC+3 business hours peak)
+HOUR_WEIGHTS = (
+    1, 1, 1, 1, 1, 2, 4, 8, 12, 14, 14, 13,
+    12, 13, 14, 13, 11, 9, 7, 5, 4, 3, 2, 1,
+)
+DEAL_COLUMNS = (
+    'id', 'created_at', 'amount_from', 'amount_to', 'currency_from',
+    'currency_to', 'rate_from', 'scale_from', 'rate_to', 'scale_to', 'status',
+)
+RATE_COLUMNS = ('abbreviation', 'scale', 'rate', 'rate_date')
+# Rate caches compare this counter with theirs (see bump_rate_set_version)
+BUMP_RATE_SET_VERSION = (
+    'INSERT INTO rate_set_versions (id, version) VALUES (1, 1) '
+    'ON CONFLICT (id) DO UPDATE '
+    'SET version = rate_set_versions.version + 1, updated_at = now()'
+)
+
+
+def _dsn() -> str:
+    return f'postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+
+
+def rate_series(
+    seed: int, start: datetime.date, days: int
+) -> dict[str, list[float]]:
+    """Per-currency BYN rate for each day from `start`, rounded like NBRB."""
+    series: dict[str, list[float]] = {}
+    for abbreviation, _, base, volatility in CURRENCIES:
+        rng = random.Random(f'{seed}:rates:{abbreviation}')
+        rate, values = base, []
+        for _ in range(days):
+            rate *= math.exp(rng.gauss(0.0, volatility))
+            values.append(round(rate, 4))
+        series[abbreviation] = values
+    return series
+
+
+def deal_batch(
+    seed: int,
+    batch: int,
+    size: int,
+    start: datetime.date,
+    series: dict[str, list[float]],
+) -> list[tuple[Any, ...]]:
+    rng = random.Random(f'{seed}:deals:{batch}')
+    days = len(next(iter(series.values())))
+    scales = {abbreviation: scale for abbreviation, scale, _, _ in CURRENCIES}
+    abbreviations = [c[0] for c in CURRENCIES]
+    recent = list(accumulate(RECENT_STATUS_WEIGHTS))[:-1]
+    older = list(accumulate(STATUS_WEIGHTS))[:-1]
+    midnight = datetime.datetime.combine(
+        start, datetime.time(), tzinfo=datetime.timezone.utc
+    )
+
+    ages = [days * rng.random() ** 2 for _ in range(size)]  # recent-heavy
+    hours = rng.choices(range(24), weights=HOUR_WEIGHTS, k=size)
+    legs = rng.choices(abbreviations, weights=CURRENCY_WEIGHTS, k=2 * size)
+
+    rows: list[tuple[Any, ...]] = []
+    for i in range(size):
+        day = days - 1 - int(ages[i])
+        currency_from, currency_to = legs[2 * i], legs[2 * i + 1]
+        if currency_from == currency_to:
+            currency_to = abbreviations[
+                (abbreviations.index(currency_to) + 1) % len(abbreviations)
+            ]
+        rate_from = series[currency_from][day]
+        rate_to = series[currency_to][day]
+        scale_from, scale_to = scales[currency_from], scales[currency_to]
+        amount_from = round(rng.lognormvariate(5.5, 1.2), 2)
+        amount_to = round(
+            amount_from * rate_from / scale_from / (rate_to / scale_to), 4
+        )
+        status = STATUSES[
+            bisect.bisect(recent if ages[i] < 1 else older, rng.random())
+        ]
+        created_at = midnight + datetime.timedelta(
+            days=day,
+            hours=hours[i],
+            seconds=rng.randrange(3600),
+            microseconds=rng.randrange(1_000_000),
+        )
+        rows.append((
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            created_at,
+            amount_from,
+            amount_to,
+            currency_from,
+            currency_to,
+            rate_from,
+            scale_from,
+            rate_to,
+            scale_to,
+            status,
+        ))
+    return rows
+
+
+def _load_deal_batch(
+    seed: int, batch: int, size: int, start: datetime.date, days: int
+) -> int:
+    """Worker process entry point: generate one batch and COPY it."""
+    rows = deal_batch(seed, batch, size, start, rate_series(seed, start, days))
+
+    async def copy() -> None:
+        conn = await asyncpg.connect(_dsn())
+        try:
+            await conn.copy_records_to_table(
+                'deals', records=rows, columns=DEAL_COLUMNS
+            )
+        finally:
+            await conn.close()
+
+    asyncio.run(copy())
+    return len(rows)
+
+
+async def load_rates(
+    conn: asyncpg.Connection, series: dict[str, list[float]], start: datetime.date
+) -> int:
+    records = [
+        (abbreviation, scale, rate, start + datetime.timedelta(days=day))
+        for abbreviation, scale, _, _ in CURRENCIES
+        for day, rate in enumerate(series[abbreviation])
+    ]
+    async with conn.transaction():
+        await conn.execute(
+            'CREATE TEMP TABLE seed_rates '
+            '(LIKE currency_rates INCLUDING DEFAULTS) ON COMMIT DROP'
+        )
+        await conn.copy_records_to_table(
+            'seed_rates', records=records, columns=RATE_COLUMNS
+        )
+        status = await conn.execute(
+            'INSERT INTO currency_rates (abbreviation, scale, rate, rate_date) '
+            'SELECT abbreviation, scale, rate, rate_date FROM seed_rates '
+            'ON CONFLICT (rate_date, abbreviation) DO NOTHING'
+        )
+        inserted = int(status.rsplit(' ', 1)[-1])
+        if inserted:
+            await conn.execute(BUMP_RATE_SET_VERSION)
+    return inserted
+
+
+async def drop_secondary_indexes(conn: asyncpg.Connection) -> list[str]:
+    """Drop non-constraint indexes on deals; return their definitions."""
+    rows = await conn.fetch(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = 'deals' "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint)"
+    )
+    for row in rows:
+        await conn.execute(f'DROP INDEX {row["indexname"]}')
+    return [row['indexdef'] for row in rows]
+
+
+async def main(args: argparse.Namespace) -> None:
+    days = args.years * 365
+    start = args.end_date - datetime.timedelta(days=days - 1)
+    series = rate_series(args.seed, start, days)
+
+    conn = await asyncpg.connect(_dsn())
+    try:
+        if args.truncate:
+            async with conn.transaction():
+                await conn.execute('TRUNCATE deals, currency_rates')
+                await conn.execute(BUMP_RATE_SET_VERSION)
+        started = time.perf_counter()
+        inserted = await load_rates(conn, series, start)
+        print(
+            f'currency_rates: {inserted} rows inserted '
+            f'in {time.perf_counter() - started:.1f}s'
+        )
+
+        indexes = await drop_secondary_indexes(conn) if args.defer_indexes else []
+
+        started = time.perf_counter()
+        sizes = [args.batch_size] * (args.deals // args.batch_size)
+        if args.deals % args.batch_size:
+            sizes.append(args.deals % args.batch_size)
+        loaded = 0
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [
+                pool.submit(
+                    _load_deal_batch, args.seed, batch, size, start, days
+                )
+                for batch, size in enumerate(sizes)
+            ]
+            for future in as_completed(futures):
+                loaded += future.result()
+                elapsed = time.perf_counter() - started
+                print(
+                    f'\rdeals: {loaded}/{args.deals} '
+                    f'({loaded / elapsed:,.0f} rows/s)',
+                    end='',
+                    flush=True,
+                )
+        print(f'\ndeals: {loaded} rows in {time.perf_counter() - started:.1f}s')
+
+        if indexes:
+            started = time.perf_counter()
+            for definition in indexes:
+                await conn.execute(definition)
+            print(
+                f'deals: {len(indexes)} indexes rebuilt '
+                f'in {time.perf_counter() - started:.1f}s'
+            )
+
+        await conn.execute('ANALYZE deals')
+        await conn.execute('ANALYZE currency_rates')
+    finally:
+        await conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--deals', type=int, default=1_000_000)
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--end-date',
+        type=datetime.date.fromisoformat,
+        default=datetime.date.today(),
+        help='last day of the series (default: today)',
+    )
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=50_000)
+    parser.add_argument(
+        '--truncate',
+        action='store_true',
+        help='empty deals and currency_rates first',
+    )
+    parser.add_argument(
+        '--defer-indexes',
+        action='store_true',
+        help='drop secondary deals indexes during the load, rebuild after',
+    )
+    asyncio.run(main(parser.parse_args()))
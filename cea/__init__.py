@@ -0,0 +1 @@
+from cea import startup as startup  # noqa: F401  (STARTUP_PROFILE import timing)
@@ -2,10 +2,11 @@ import datetime
 
 from fastapi import APIRouter, Query
 
-from cea.dependencies import SessionDep
-from cea.schemas.currency import CurrencyRateOut
+from cea.dependencies import AdmitReads, SessionDep, release_session
+from cea.schemas.currency import CurrencyRateOut, CurrencyStatsOut
 from cea.services.currency_rate_service import CurrencyRateService
 from cea.api import docs
+from cea.api.responses import attributes_json, trusted_json
 
 router = APIRouter()
 
@@ -16,6 +17,7 @@ router = APIRouter()
     summary='List of Currency Rates',
     description=docs.currencies_description,
     responses=docs.currencies_responses,
+    dependencies=[AdmitReads],
 )
 async def list_currency_rates(
     session: SessionDep,
@@ -24,4 +26,39 @@ async def list_currency_rates(
         description='Filter by rate date (YYYY-MM-DD)',
     ),
 ):
-    return await CurrencyRateService.list_rates(session, rate_date=rate_date)
+    try:
+        rates = await CurrencyRateService.list_rates(
+            session, rate_date=rate_date
+        )
+    finally:
+        await release_session(session)
+    return attributes_json(rates, list[CurrencyRateOut])
+
+
+@router.get(
+    '/currencies/{abbreviation}/stats',
+    response_model=CurrencyStatsOut,
+    summary='Rolling rate statistics',
+    description=docs.currency_stats_description,
+    responses=docs.currency_stats_responses,
+    dependencies=[AdmitReads],
+)
+async def currency_stats(
+    abbreviation: str,
+    session: SessionDep,
+    windows: list[int] = Query(
+        default=[7, 30, 90],
+        description='Trailing windows in days (repeat the parameter)',
+    ),
+    rate_date: datetime.date | None = Query(
+        default=None,
+        description='As-of date (YYYY-MM-DD); latest known rate if omitted',
+    ),
+):
+    try:
+        stats = await CurrencyRateService.stats(
+            session, abbreviation, windows=windows, rate_date=rate_date
+        )
+    finally:
+        await release_session(session)
+    return trusted_json(stats, CurrencyStatsOut)
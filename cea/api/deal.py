@@ -2,17 +2,28 @@ import datetime
 
 from fastapi import APIRouter, Query
 
-from cea.dependencies import SessionDep
+from cea.dependencies import (
+    AdmitReports,
+    AdmitReads,
+    AdmitWrites,
+    SessionDep,
+    release_session,
+)
 from cea.schemas.deal import (
+    BulkConvertIn,
+    BulkConvertOut,
     DealReportItem,
     ExchangeConfirmIn,
     ExchangeConfirmOut,
     ExchangePreviewIn,
     ExchangePreviewOut,
+    ExchangeQuoteIn,
+    ExchangeQuoteOut,
     PendingDealOut,
 )
 from cea.services.processor import deal_service
 from cea.api import docs
+from cea.api.responses import trusted_json
 
 router = APIRouter()
 
@@ -23,6 +34,7 @@ router = APIRouter()
     summary='Preview exchange',
     description=docs.preview_description,
     responses=docs.preview_responses,
+    dependencies=[AdmitWrites],
     openapi_extra={
         "requestBody": {
             "content": {
@@ -32,7 +44,55 @@ router = APIRouter()
     },
 )
 async def preview_exchange(payload: ExchangePreviewIn, session: SessionDep):
-    return await deal_service.preview(session, payload)
+    try:
+        return await deal_service.preview(session, payload)
+    finally:
+        await release_session(session)
+
+
+@router.post(
+    '/exchange/quote',
+    response_model=ExchangeQuoteOut,
+    summary='Quote exchange (as-of date)',
+    description=docs.quote_description,
+    responses=docs.quote_responses,
+    dependencies=[AdmitReads],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"example": docs.quote_request_example}
+            }
+        }
+    },
+)
+async def quote_exchange(payload: ExchangeQuoteIn, session: SessionDep):
+    try:
+        return await deal_service.quote(session, payload)
+    finally:
+        await release_session(session)
+
+
+@router.post(
+    '/exchange/convert',
+    response_model=BulkConvertOut,
+    summary='Bulk conversion (as-of date)',
+    description=docs.convert_description,
+    responses=docs.convert_responses,
+    dependencies=[AdmitReports],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"example": docs.convert_request_example}
+            }
+        }
+    },
+)
+async def convert_bulk(payload: BulkConvertIn, session: SessionDep):
+    try:
+        result = await deal_service.convert_bulk(session, payload)
+    finally:
+        await release_session(session)
+    return trusted_json(result, BulkConvertOut)
 
 
 @router.post(
@@ -41,6 +101,7 @@ async def preview_exchange(payload: ExchangePreviewIn, session: SessionDep):
     summary='Confirm exchange',
     description=docs.confirm_description,
     responses=docs.confirm_responses,
+    dependencies=[AdmitWrites],
     openapi_extra={
         "requestBody": {
             "content": {
@@ -50,7 +111,10 @@ async def preview_exchange(payload: ExchangePreviewIn, session: SessionDep):
     },
 )
 async def confirm_exchange(payload: ExchangeConfirmIn, session: SessionDep):
-    return await deal_service.confirm(session, payload)
+    try:
+        return await deal_service.confirm(session, payload)
+    finally:
+        await release_session(session)
 
 
 @router.get(
@@ -59,9 +123,14 @@ async def confirm_exchange(payload: ExchangeConfirmIn, session: SessionDep):
     summary='List of Pending deals',
     description=docs.pending_description,
     responses=docs.pending_responses,
+    dependencies=[AdmitReads],
 )
 async def list_pending_deals(session: SessionDep):
-    return await deal_service.list_pending(session)
+    try:
+        deals = await deal_service.list_pending(session)
+    finally:
+        await release_session(session)
+    return trusted_json(deals, list[PendingDealOut])
 
 
 @router.get(
@@ -70,6 +139,7 @@ async def list_pending_deals(session: SessionDep):
     summary='Deal report',
     description=docs.report_description,
     responses=docs.report_responses,
+    dependencies=[AdmitReports],
 )
 async def deals_report(
     session: SessionDep,
@@ -83,6 +153,10 @@ async def deals_report(
         default=None, description='Optional currency code to filter'
     ),
 ):
-    return await deal_service.report(
-        session, date_from=date_from, date_to=date_to, currency=currency
-    )
+    try:
+        items = await deal_service.report(
+            session, date_from=date_from, date_to=date_to, currency=currency
+        )
+    finally:
+        await release_session(session)
+    return trusted_json(items, list[DealReportItem])
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Response
+
+from cea import metrics
+from cea.db.database import engine
+from cea.db.pool import pool_stats
+from cea.db.statements import statement_cache
+from cea.schemas.diagnostics import PoolStatsOut, StatementShapeStatsOut
+from cea.api import docs
+
+router = APIRouter()
+
+
+@router.get(
+    '/diagnostics/pool',
+    response_model=PoolStatsOut,
+    summary='Connection pool stats',
+    description=docs.pool_stats_description,
+    responses=docs.pool_stats_responses,
+)
+async def get_pool_stats():
+    return pool_stats(engine)
+
+
+@router.get(
+    '/diagnostics/statements',
+    response_model=dict[str, StatementShapeStatsOut],
+    summary='Statement cache stats',
+    description=docs.statement_stats_description,
+    responses=docs.statement_stats_responses,
+)
+async def get_statement_stats():
+    return statement_cache.snapshot()
+
+
+@router.get(
+    '/metrics',
+    response_class=Response,
+    summary='Prometheus metrics',
+    description=docs.metrics_description,
+    responses=docs.metrics_responses,
+)
+async def get_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE_LATEST)
@@ -29,8 +29,17 @@ common_error_responses: Dict[int, Dict[str, Any]] = {
         'content': {'application/json': {'example': _DETAIL_EXAMPLE}},
     },
     503: {
-        'description': "Internal dependency error",
+        'description': (
+            'Internal dependency error, or request shed by admission '
+            'control (then with `Retry-After`)'
+        ),
         "content": {"application/json": {"example": _DETAIL_EXAMPLE}},
+        'headers': {
+            'Retry-After': {
+                'description': 'Seconds to wait before retrying (overload)',
+                'schema': {'type': 'integer'},
+            }
+        },
     },
 }
 
@@ -76,6 +85,49 @@ currencies_responses: Dict[int, Dict[str, Any]] = {
 
 # Deals docs
 
+currency_stats_description = (
+    'Rolling statistics of a currency rate per unit (rate / scale) over '
+    'trailing windows in calendar days, as of `rate_date`: min, max, mean, '
+    'change over the window, mean daily return and volatility (standard '
+    'deviation of daily returns, not annualized). Computed from the '
+    'in-memory rate history, not by SQL. Unknown currency or no rate '
+    'before `rate_date`: 404.'
+)
+
+currency_stats_responses: Dict[int, Dict[str, Any]] = {
+    200: {
+        'description': 'Rate statistics per window',
+        'content': {
+            'application/json': {
+                'examples': {
+                    'sample': {
+                        'summary': 'Sample response',
+                        'value': {
+                            'abbreviation': 'USD',
+                            'rate_date': '2024-03-15',
+                            'rate': 3.2571,
+                            'daily_return': 0.0012,
+                            'windows': [
+                                {
+                                    'days': 7,
+                                    'observations': 7,
+                                    'min': 3.2489,
+                                    'max': 3.2612,
+                                    'mean': 3.2553,
+                                    'change': 0.0021,
+                                    'mean_daily_return': 0.0003,
+                                    'volatility': 0.0011,
+                                }
+                            ],
+                        },
+                    }
+                }
+            }
+        },
+    },
+} | common_error_responses
+
+
 preview_description = (
     'Exchange preview: creates a draft deal in PENDING status and '
     'calculates the amount to receive based on current rates.'
@@ -112,6 +164,81 @@ preview_responses: Dict[int, Dict[str, Any]] = {
 } | common_error_responses
 
 
+quote_description = (
+    'Exchange quote: calculates the amount to receive at the rates in '
+    'effect on `rate_date` (the latest rate on or before that day per '
+    'currency), or at the latest known rates if `rate_date` is omitted. '
+    'No deal is created; meant for repricing past deals and audits. '
+    'Served from an in-memory rate index.'
+)
+
+quote_request_example = {
+    'amount_from': 100.0,
+    'currency_from': 'USD',
+    'currency_to': 'EUR',
+    'rate_date': '2024-03-15',
+}
+
+quote_responses: Dict[int, Dict[str, Any]] = {
+    200: {
+        'description': 'Successful calculation',
+        'content': {
+            'application/json': {
+                'examples': {
+                    'sample': {
+                        'summary': 'Sample response',
+                        'value': {
+                            'amount_to': 92.5311,
+                            'rate_from': 3.2571,
+                            'scale_from': 1,
+                            'rate_date_from': '2024-03-15',
+                            'rate_to': 3.5234,
+                            'scale_to': 1,
+                            'rate_date_to': '2024-03-15',
+                        },
+                    }
+                }
+            }
+        },
+    },
+} | common_error_responses
+
+
+convert_description = (
+    'Bulk conversion: converts `amount_from[i]` from `currency_from[i]` to '
+    '`currency_to[i]` for every i at the rates in effect on `rate_date` '
+    '(latest known rates if omitted). Results match `/exchange/preview` '
+    'exactly (4 decimal places, half-up); no deals are created. At most '
+    '`BULK_CONVERT_MAX_ITEMS` amounts per request.'
+)
+
+convert_request_example = {
+    'amount_from': [100.0, 2500.5, 10.0],
+    'currency_from': ['USD', 'EUR', 'RUB'],
+    'currency_to': ['EUR', 'USD', 'USD'],
+    'rate_date': '2024-03-15',
+}
+
+convert_responses: Dict[int, Dict[str, Any]] = {
+    200: {
+        'description': 'Converted amounts, in request order',
+        'content': {
+            'application/json': {
+                'examples': {
+                    'sample': {
+                        'summary': 'Sample response',
+                        'value': {
+                            'amount_to': [92.5311, 2703.3719, 0.1066],
+                            'rate_date': '2024-03-15',
+                        },
+                    }
+                }
+            }
+        },
+    },
+} | common_error_responses
+
+
 confirm_description = (
     'Confirms or rejects a previously created draft deal. '
     'Possible errors: not found (404), already finalized (409).'
@@ -206,6 +333,151 @@ report_responses: Dict[int, Dict[str, Any]] = {
 } | common_error_responses
 
 
+# Diagnostics docs
+
+portfolio_value_description = (
+    'Values currency holdings in a target currency on each of the given '
+    'dates, using the latest rate on or before every date. Computed in one '
+    'pass over an in-memory dates x currencies rate block. Each total is '
+    'rounded once, half up to 4 decimal places like deal amounts, so it can '
+    'differ in the last place from a sum of separately rounded quotes. '
+    'Values are returned in request order.'
+)
+
+portfolio_value_request_example = {
+    'holdings': {'USD': 1000.0, 'EUR': 250.0, 'RUB': 100000.0},
+    'dates': ['2024-03-01', '2024-03-15', '2024-03-29'],
+    'currency': 'USD',
+}
+
+portfolio_value_responses: Dict[int, Dict[str, Any]] = {
+    200: {
+        'description': 'Portfolio value per date',
+        'content': {
+            'application/json': {
+                'examples': {
+                    'sample': {
+                        'summary': 'Sample response',
+                        'value': {
+                            'currency': 'USD',
+                            'values': [
+                                {'date': '2024-03-01', 'value': 2360.1234},
+                                {'date': '2024-03-15', 'value': 2371.9921},
+                                {'date': '2024-03-29', 'value': 2365.4402},
+                            ],
+                        },
+                    }
+                }
+            }
+        },
+    },
+} | common_error_responses
+
+
+pool_stats_description = (
+    'Live database connection pool statistics: occupancy, overflow and '
+    'a histogram of checkout wait times (seconds, cumulative buckets).'
+)
+
+pool_stats_responses: Dict[int, Dict[str, Any]] = {
+    200: {
+        'description': 'Successful response',
+        'content': {
+            'application/json': {
+                'example': {
+                    'pool_class': 'InstrumentedAsyncQueuePool',
+                    'size': 5,
+                    'checked_in': 3,
+                    'checked_out': 2,
+                    'overflow': 0,
+                    'max_overflow': 10,
+                    'timeout': 30.0,
+                    'timeouts': 0,
+                    'wait': {
+                        'buckets': [
+                            {'le': 0.001, 'count': 120},
+                            {'le': 0.005, 'count': 124},
+                        ],
+                        'count': 124,
+                        'sum': 0.0431,
+                        'max': 0.0042,
+                    },
+                }
+            }
+        },
+    },
+}
+
+
+statement_stats_description = (
+    'Per statement shape counters of the repository statement cache: how '
+    'often the pre-built statement was reused, time spent compiling it, '
+    "and executions served from SQLAlchemy's compiled cache."
+)
+
+statement_stats_responses: Dict[int, Dict[str, Any]] = {
+    200: {
+        'description': 'Successful response',
+        'content': {
+            'application/json': {
+                'example': {
+                    'CurrencyRate.get_latest_by_abbreviation': {
+                        'builds': 1,
+                        'hits': 1023,
+                        'compile_time': 0.00061,
+                        'executions': 1024,
+                        'compiled_cache_hits': 1023,
+                        'compiled_cache_misses': 1,
+                    },
+                }
+            }
+        },
+    },
+}
+
+
+metrics_description = (
+    'Prometheus metrics of this worker: request latency per route and '
+    'status, database statement latency per repository method, connection '
+    'pool occupancy, NBRB fetch latency and errors, and the last daily '
+    'rates scheduler run.'
+)
+
+metrics_responses: Dict[int, Dict[str, Any]] = {
+    200: {
+        'description': 'Prometheus text exposition format',
+        'content': {
+            'text/plain': {
+                'example': (
+                    'cea_db_query_duration_seconds_count'
+                    '{query="Deal.list_pending"} 42.0\n'
+                    'cea_db_pool_checked_out 2.0\n'
+                )
+            }
+        },
+    },
+}
+
+
+# Health docs
+
+live_description = 'Liveness probe: the process is up and serving requests.'
+
+ready_description = (
+    'Readiness probe: ready once a currency rate snapshot is available, '
+    'either loaded by this worker or already present in the database. '
+    'The startup rates load runs in the background and does not block it.'
+)
+
+ready_responses: Dict[int, Dict[str, Any]] = {
+    200: {
+        'description': 'Ready to serve traffic',
+        'content': {'application/json': {'example': {'status': 'ready'}}},
+    },
+    503: common_error_responses[503],
+}
+
+
 # OpenAPI tags metadata
 
 openapi_tags = [
@@ -217,4 +489,16 @@ openapi_tags = [
         'name': 'Deal',
         'description': 'Preview, confirm, and report on exchange deals.',
     },
+    {
+        'name': 'Portfolio',
+        'description': 'Valuation of currency holdings over time.',
+    },
+    {
+        'name': 'Diagnostics',
+        'description': 'Operational insight into the running service.',
+    },
+    {
+        'name': 'Health',
+        'description': 'Liveness and readiness probes.',
+    },
 ]
@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+
+from cea.dependencies import SessionDep, release_session
+from cea.schemas.health import HealthOut
+from cea.services.errors import DependencyError
+from cea.services.readiness import rates_readiness
+from cea.api import docs
+
+router = APIRouter()
+
+
+@router.get(
+    '/health/live',
+    response_model=HealthOut,
+    summary='Liveness probe',
+    description=docs.live_description,
+)
+async def live():
+    return HealthOut(status='ok')
+
+
+@router.get(
+    '/health/ready',
+    response_model=HealthOut,
+    summary='Readiness probe',
+    description=docs.ready_description,
+    responses=docs.ready_responses,
+)
+async def ready(session: SessionDep):
+    try:
+        is_ready = await rates_readiness.check(session)
+    finally:
+        await release_session(session)
+    if not is_ready:
+        raise DependencyError('No currency rates available yet')
+    return HealthOut(status='ready')
@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+
+from cea.dependencies import AdmitReports, SessionDep, release_session
+from cea.schemas.portfolio import PortfolioValueIn, PortfolioValueOut
+from cea.services.portfolio_service import PortfolioService
+from cea.api import docs
+from cea.api.responses import trusted_json
+
+router = APIRouter()
+
+
+@router.post(
+    '/portfolio/value',
+    response_model=PortfolioValueOut,
+    summary='Portfolio value across dates',
+    description=docs.portfolio_value_description,
+    responses=docs.portfolio_value_responses,
+    dependencies=[AdmitReports],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": docs.portfolio_value_request_example
+                }
+            }
+        }
+    },
+)
+async def portfolio_value(payload: PortfolioValueIn, session: SessionDep):
+    try:
+        result = await PortfolioService.value(session, payload)
+    finally:
+        await release_session(session)
+    return trusted_json(result, PortfolioValueOut)
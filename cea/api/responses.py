@@ -0,0 +1,44 @@
+"""Fast JSON responses for trusted service outputs.
+
+FastAPI validates whatever a route returns against its `response_model`,
+runs it through `jsonable_encoder` and then `json.dumps`. For values the
+service layer already built as schema instances that is a second full pass
+over every row. Returning a ready `Response` skips all of it; routes keep
+`response_model` for the OpenAPI schema only.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def adapter_for(tp: Any) -> TypeAdapter[Any]:
+    """Precompiled (validator + serializer) adapter, built once per type."""
+
+    return TypeAdapter(tp)
+
+
+def trusted_json(content: Any, tp: Any, *, status_code: int = 200) -> Response:
+    """Serialize already validated `content` of type `tp` straight to JSON."""
+
+    return Response(
+        content=adapter_for(tp).dump_json(content),
+        status_code=status_code,
+        media_type='application/json',
+    )
+
+
+def attributes_json(content: Any, tp: Any, *, status_code: int = 200) -> Response:
+    """Validate ORM rows/records into `tp` once, then serialize to JSON."""
+
+    adapter = adapter_for(tp)
+    return Response(
+        content=adapter.dump_json(
+            adapter.validate_python(content, from_attributes=True)
+        ),
+        status_code=status_code,
+        media_type='application/json',
+    )
@@ -1,9 +1,15 @@
 from fastapi import APIRouter
 from cea.api.currency_rates import router as currency_rates_router
 from cea.api.deal import router as deal_router
+from cea.api.diagnostics import router as diagnostics_router
+from cea.api.health import router as health_router
+from cea.api.portfolio import router as portfolio_router
 
 router = APIRouter()
 
 
 router.include_router(currency_rates_router, tags=['Currency Rates'])
 router.include_router(deal_router, tags=['Deal'])
+router.include_router(portfolio_router, tags=['Portfolio'])
+router.include_router(diagnostics_router, tags=['Diagnostics'])
+router.include_router(health_router, tags=['Health'])
@@ -1,15 +1,26 @@
-import httpx
+import time
 from datetime import date
 from typing import Any
 
+from cea.metrics import nbrb_fetch_duration, nbrb_fetch_errors
+from cea.tracing import traced
+
 
 class NBRBClient:
     """Minimal async client for NBRB exchange rates API."""
 
-    def __init__(self, base_url: str | None = None, timeout: float = 10.0) -> None:
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: float = 10.0,
+        *,
+        name: str = 'nbrb',
+    ) -> None:
         self.base_url = base_url or 'https://api.nbrb.by/exrates'
         self._timeout = timeout
+        self.name = name
 
+    @traced
     async def get_daily_rates(
         self, ondate: date | None = None
     ) -> list[dict[str, Any]]:
@@ -26,13 +37,23 @@ class NBRBClient:
         if ondate is not None:
             params['ondate'] = ondate.isoformat()
 
+        # httpx is a noticeable share of cold-start imports; load on first use
+        import httpx
+
         url = f'{self.base_url}/rates'
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            if not isinstance(data, list):
-                raise ValueError(
-                    'Unexpected NBRB response format: expected list'
-                )
-            return data
+        started = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(timeout=self._timeout) as client:
+                resp = await client.get(url, params=params)
+                resp.raise_for_status()
+                data = resp.json()
+                if not isinstance(data, list):
+                    raise ValueError(
+                        'Unexpected NBRB response format: expected list'
+                    )
+                return data
+        except Exception as e:
+            nbrb_fetch_errors.labels(type(e).__name__).inc()
+            raise
+        finally:
+            nbrb_fetch_duration.observe(time.perf_counter() - started)
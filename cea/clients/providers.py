@@ -0,0 +1,178 @@
+"""Rate providers: the NBRB client, its mirrors and a hedged composite.
+
+Any object with an async `get_daily_rates(ondate)` returning NBRB-shaped
+items (`Cur_Abbreviation`, `Cur_Scale`, `Cur_OfficialRate`, `Date`) is a
+provider; sources with another format convert to that shape themselves,
+so `RateLoaderService._map_nbrb_item` handles all of them. Tests use local
+fakes (see tests/test_providers.py):
+
+    class FakeProvider:
+        def __init__(self, name, delay=0.0):
+            self.name, self.delay = name, delay
+
+        async def get_daily_rates(self, ondate=None):
+            await asyncio.sleep(self.delay)
+            return [{'Cur_Abbreviation': 'USD', 'Cur_Scale': 1,
+                     'Cur_OfficialRate': 3.2, 'Date': '2024-01-02T00:00:00'}]
+
+    provider = HedgedRateProvider(
+        [FakeProvider('primary', delay=5), FakeProvider('mirror')],
+        hedge_delay=0.1,
+    )
+    loader = RateLoaderService(provider)
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import date
+from typing import Any, Protocol, Sequence
+
+from cea.clients.nbrb import NBRBClient
+from cea.metrics import rate_provider_hedges, rate_provider_wins
+from cea.tracing import traced
+
+# Comma-separated base URLs of NBRB-compatible mirrors, tried after NBRB
+RATES_MIRROR_URLS = [
+    url.strip()
+    for url in os.getenv('RATES_MIRROR_URLS', '').split(',')
+    if url.strip()
+]
+RATES_HEDGE_QUANTILE = float(os.getenv('RATES_HEDGE_QUANTILE', '0.95'))
+RATES_HEDGE_DELAY = float(os.getenv('RATES_HEDGE_DELAY', '2.0'))
+RATES_FETCH_DEADLINE = float(os.getenv('RATES_FETCH_DEADLINE', '30'))
+
+# Latency samples kept per provider, and needed before the quantile is used
+_LATENCY_WINDOW = 100
+_MIN_SAMPLES = 5
+_MIN_HEDGE_DELAY = 0.05
+
+
+class RateProvider(Protocol):
+    name: str
+
+    async def get_daily_rates(
+        self, ondate: date | None = None
+    ) -> list[dict[str, Any]]: ...
+
+
+class RateProviderError(Exception):
+    """Every provider failed (or the deadline passed)."""
+
+
+class HedgedRateProvider:
+    """Query providers in order with hedging and failover.
+
+    The first provider is asked first. If it hasn't answered within its
+    `hedge_quantile` latency (`hedge_delay` until enough samples are
+    seen), the next one is asked as well and whichever answers first
+    wins; a failure moves on to the next provider right away. The whole
+    fetch is bounded by `deadline` seconds, so one degraded upstream
+    cannot stall the daily load.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[RateProvider],
+        *,
+        hedge_quantile: float = RATES_HEDGE_QUANTILE,
+        hedge_delay: float = RATES_HEDGE_DELAY,
+        deadline: float = RATES_FETCH_DEADLINE,
+    ) -> None:
+        if not providers:
+            raise ValueError('At least one rate provider is required')
+        self.providers = list(providers)
+        self.name = '+'.join(p.name for p in self.providers)
+        self.hedge_quantile = hedge_quantile
+        self.hedge_delay = hedge_delay
+        self.deadline = deadline
+        self._latencies: dict[str, deque[float]] = {
+            p.name: deque(maxlen=_LATENCY_WINDOW) for p in self.providers
+        }
+
+    def hedge_after(self, provider: RateProvider) -> float:
+        """Seconds to wait on `provider` before asking the next one."""
+        samples = self._latencies[provider.name]
+        if len(samples) < _MIN_SAMPLES:
+            return self.hedge_delay
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self.hedge_quantile * len(ordered)))
+        return max(_MIN_HEDGE_DELAY, ordered[index])
+
+    async def _timed(
+        self, provider: RateProvider, ondate: date | None
+    ) -> list[dict[str, Any]]:
+        # Failures are not recorded: a fast connection refused would pull
+        # the quantile towards zero and make every fetch hedge at once
+        started = time.perf_counter()
+        try:
+            rates = await provider.get_daily_rates(ondate)
+        except asyncio.CancelledError:
+            # A losing request took at least this long; keeps the quantile
+            # from only seeing the fast answers
+            self._latencies[provider.name].append(time.perf_counter() - started)
+            raise
+        self._latencies[provider.name].append(time.perf_counter() - started)
+        return rates
+
+    @traced
+    async def get_daily_rates(
+        self, ondate: date | None = None
+    ) -> list[dict[str, Any]]:
+        waiting = deque(self.providers)
+        running: dict[asyncio.Task, RateProvider] = {}
+        errors: list[str] = []
+
+        def start_next() -> RateProvider:
+            provider = waiting.popleft()
+            task = asyncio.create_task(self._timed(provider, ondate))
+            running[task] = provider
+            return provider
+
+        last = start_next()
+        try:
+            async with asyncio.timeout(self.deadline):
+                while running:
+                    done, _ = await asyncio.wait(
+                        running,
+                        timeout=self.hedge_after(last) if waiting else None,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if not done:
+                        rate_provider_hedges.labels('slow').inc()
+                        last = start_next()
+                        continue
+                    for task in done:
+                        provider = running.pop(task)
+                        if task.exception() is None:
+                            rate_provider_wins.labels(provider.name).inc()
+                            return task.result()
+                        errors.append(f'{provider.name}: {task.exception()!r}')
+                    if waiting:
+                        rate_provider_hedges.labels('failover').inc()
+                        last = start_next()
+        except TimeoutError:
+            errors.append(f'deadline of {self.deadline:g}s exceeded')
+        finally:
+            # Losers are gone when this returns, and the outcome of tasks
+            # that finished together with the winner is collected
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+        raise RateProviderError('All rate providers failed: ' + '; '.join(errors))
+
+
+def build_rate_provider() -> RateProvider:
+    """NBRB alone, or NBRB hedged with `RATES_MIRROR_URLS`."""
+    if not RATES_MIRROR_URLS:
+        return NBRBClient()
+    return HedgedRateProvider(
+        [
+            NBRBClient(),
+            *(
+                NBRBClient(url, name=f'mirror{i}')
+                for i, url in enumerate(RATES_MIRROR_URLS, 1)
+            ),
+        ]
+    )
@@ -1,8 +1,14 @@
 import os
+from typing import Any
+from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
 
+from cea import metrics, query_budget
+from cea.db.pool import InstrumentedAsyncQueuePool
+from cea.db.statements import statement_cache
+
 load_dotenv()
 
 DB_USER = os.getenv("DB_USERNAME")
@@ -13,10 +19,91 @@ DB_NAME = os.getenv("DB_NAME")
 
 DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+# Connection pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").strip().lower() == "true"
+# asyncpg statement cache and SQLAlchemy's prepared statement cache (per connection)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+# PgBouncer in transaction pooling mode cannot keep named prepared statements
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").strip().lower() == "true"
+
+
+def _connect_args() -> dict[str, Any]:
+    if DB_PGBOUNCER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    }
+
+
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args=_connect_args(),
+)
+statement_cache.install(engine)
+if metrics.METRICS_ENABLED:
+    metrics.install(engine)
+if query_budget.QUERY_BUDGET_ENABLED:
+    query_budget.install(engine)
 
 async_session = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
 
+
+class LazySession:
+    """Request-scoped stand-in for an `AsyncSession`.
+
+    The real session is only created on first attribute access, so requests
+    that never touch the database never build one. `release()` closes it and
+    hands its connection back to the pool right away; using the proxy again
+    afterwards transparently starts a fresh session.
+    """
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: async_sessionmaker[AsyncSession]) -> None:
+        self._factory = factory
+        self._session: AsyncSession | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    async def release(self) -> None:
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+
+async def release_session(session: AsyncSession) -> None:
+    """Return the connection to the pool once the last query has finished.
+
+    Loaded ORM objects stay readable (they are detached, not expired).
+    """
+    if isinstance(session, LazySession):
+        await session.release()
+    else:
+        await session.close()
+
+
 async def get_db():
-    async with async_session() as session:
+    session = LazySession(async_session)
+    try:
         yield session
+    finally:
+        await session.release()
@@ -0,0 +1,65 @@
+import time
+from typing import Any, Sequence, Type
+
+from asyncpg import Connection, Record
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cea.db.models.base import Base
+from cea.metrics import observe_query
+from cea.query_budget import record_query
+
+
+def select_sql(model: Type[Base], where: str, suffix: str = '') -> str:
+    """Plain SQL `SELECT` of all model columns, in declaration order."""
+
+    columns = ', '.join(c.name for c in model.__table__.columns)
+    sql = f'SELECT {columns} FROM {model.__tablename__} WHERE {where}'
+    return f'{sql} {suffix}' if suffix else sql
+
+
+class FastPathMixin:
+    """Helpers to run hand-written SQL straight on the asyncpg connection.
+
+    The connection is borrowed from the session, so fast-path reads share
+    its pool checkout and transaction with regular ORM statements. asyncpg
+    prepares each distinct SQL string once per connection and keeps it in
+    its statement cache (see `DB_STATEMENT_CACHE_SIZE`).
+
+    These statements bypass SQLAlchemy engine events, so their duration is
+    recorded here: in metrics under `<Model>.<query>`, like cached ORM
+    shapes, and against the request's query budget.
+    """
+
+    @staticmethod
+    async def _driver_connection(session: AsyncSession) -> Connection:
+        connection = await session.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    def _observe(self, query: str, sql: str, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        observe_query(
+            f'{self.model.__name__}.{query}',  # type: ignore[attr-defined]
+            elapsed,
+        )
+        record_query(sql, elapsed)
+
+    async def _fetch(
+        self, session: AsyncSession, sql: str, *args: Any, query: str
+    ) -> Sequence[Record]:
+        conn = await self._driver_connection(session)
+        started = time.perf_counter()
+        try:
+            return await conn.fetch(sql, *args)
+        finally:
+            self._observe(query, sql, started)
+
+    async def _fetchrow(
+        self, session: AsyncSession, sql: str, *args: Any, query: str
+    ) -> Record | None:
+        conn = await self._driver_connection(session)
+        started = time.perf_counter()
+        try:
+            return await conn.fetchrow(sql, *args)
+        finally:
+            self._observe(query, sql, started)
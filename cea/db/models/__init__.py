@@ -1,3 +1,4 @@
 from cea.db.models.base import Base as Base
 from cea.db.models.currency_rate import CurrencyRate as CurrencyRate
 from cea.db.models.deal import Deal as Deal
+from cea.db.models.rate_set_version import RateSetVersion as RateSetVersion
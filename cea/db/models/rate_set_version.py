@@ -0,0 +1,21 @@
+import datetime
+
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, SmallInteger, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from cea.db.models.base import Base
+
+
+class RateSetVersion(Base):
+    """Single-row counter bumped in the transaction of every change to
+    currency_rates; rate caches compare it instead of the rows."""
+
+    __tablename__ = 'rate_set_versions'
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (CheckConstraint('id = 1', name='single_row'),)
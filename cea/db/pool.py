@@ -0,0 +1,136 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from cea.tracing import span
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+# Smoothing factor of the connection hold time moving average
+HOLD_TIME_ALPHA = 0.1
+
+# QueuePool._do_get() recurses on overflow races; only time the outer call
+_in_checkout: ContextVar[bool] = ContextVar('_in_checkout', default=False)
+
+
+class WaitHistogram:
+    """Cumulative histogram of pool checkout wait times."""
+
+    def __init__(self, buckets: tuple[float, ...] = WAIT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        cumulative = 0
+        buckets: list[dict[str, Any]] = []
+        # The last bucket (le=None) is the +Inf overflow bucket
+        for le, n in zip((*self.buckets, None), self.counts):
+            cumulative += n
+            buckets.append({'le': le, 'count': cumulative})
+        return {
+            'buckets': buckets,
+            'count': self.count,
+            'sum': self.sum,
+            'max': self.max,
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waits.
+
+    The measured time covers waiting for a free connection and, when the
+    pool is allowed to overflow, opening a new one. Pool starvation shows
+    up as a shift towards the upper buckets and as `timeouts`.
+
+    It also tracks checkouts in progress and a moving average of how long
+    connections are held, for `estimated_wait()`.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = WaitHistogram()
+        self.timeouts = 0
+        self.waiting = 0
+        self.hold_time = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        if _in_checkout.get():
+            return super()._do_get()
+
+        token = _in_checkout.set(True)
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            with span('db.pool.checkout'):
+                record = super()._do_get()
+            record.info['cea_checked_out_at'] = time.perf_counter()
+            return record
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            self.wait_histogram.observe(time.perf_counter() - start)
+            _in_checkout.reset(token)
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        checked_out_at = record.info.pop('cea_checked_out_at', None)
+        if checked_out_at is not None:
+            held = time.perf_counter() - checked_out_at
+            self.hold_time += HOLD_TIME_ALPHA * (held - self.hold_time)
+        super()._do_return_conn(record)
+
+    def estimated_wait(self) -> float:
+        """Expected wait of a new checkout, in seconds.
+
+        Little's law: checkouts queued ahead of it, each holding a
+        connection for the average hold time, served by the pool capacity
+        in parallel. Zero while connections are free.
+        """
+        capacity = self.size() + max(self._max_overflow, 0)
+        if self.checkedout() < capacity:
+            return 0.0
+        return (self.waiting + 1) * self.hold_time / max(capacity, 1)
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """Live occupancy and wait statistics of the engine's pool."""
+
+    pool = engine.pool
+    stats: dict[str, Any] = {
+        'pool_class': type(pool).__name__,
+        'size': pool.size() if hasattr(pool, 'size') else 0,
+        'checked_in': pool.checkedin() if hasattr(pool, 'checkedin') else 0,
+        'checked_out': (
+            pool.checkedout() if hasattr(pool, 'checkedout') else 0
+        ),
+        'overflow': (
+            max(pool.overflow(), 0) if hasattr(pool, 'overflow') else 0
+        ),
+        'max_overflow': getattr(pool, '_max_overflow', 0),
+        'timeout': getattr(pool, '_timeout', 0.0),
+        'timeouts': 0,
+        'wait': WaitHistogram().snapshot(),
+    }
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats['timeouts'] = pool.timeouts
+        stats['wait'] = pool.wait_histogram.snapshot()
+    return stats
@@ -0,0 +1,81 @@
+"""Lightweight read-only rows returned by the fast-path repositories.
+
+They expose the same attributes as the ORM models, so services and
+`from_attributes` schemas can use either interchangeably.
+"""
+
+import datetime
+from decimal import Decimal
+from typing import Any
+
+from cea.enums import DealStatusEnum
+
+
+class CurrencyRateRecord:
+    __slots__ = ('id', 'abbreviation', 'scale', 'rate', 'rate_date')
+
+    def __init__(
+        self,
+        id: int,
+        abbreviation: str,
+        scale: int,
+        rate: Decimal,
+        rate_date: datetime.date,
+    ) -> None:
+        self.id = id
+        self.abbreviation = abbreviation
+        self.scale = scale
+        self.rate = rate
+        self.rate_date = rate_date
+
+    def __repr__(self) -> str:
+        return (
+            f'CurrencyRateRecord({self.abbreviation!r}, {self.rate_date}, '
+            f'{self.rate}/{self.scale})'
+        )
+
+
+class DealRecord:
+    __slots__ = (
+        'id',
+        'created_at',
+        'amount_from',
+        'amount_to',
+        'currency_from',
+        'currency_to',
+        'rate_from',
+        'scale_from',
+        'rate_to',
+        'scale_to',
+        'status',
+    )
+
+    def __init__(
+        self,
+        id: Any,
+        created_at: datetime.datetime,
+        amount_from: Decimal,
+        amount_to: Decimal | None,
+        currency_from: str,
+        currency_to: str,
+        rate_from: float | None,
+        scale_from: int | None,
+        rate_to: float | None,
+        scale_to: int | None,
+        status: str,
+    ) -> None:
+        # asyncpg decodes uuid/enum columns natively; match the ORM types
+        self.id = str(id)
+        self.created_at = created_at
+        self.amount_from = amount_from
+        self.amount_to = amount_to
+        self.currency_from = currency_from
+        self.currency_to = currency_to
+        self.rate_from = rate_from
+        self.scale_from = scale_from
+        self.rate_to = rate_to
+        self.scale_to = scale_to
+        self.status = DealStatusEnum(status)
+
+    def __repr__(self) -> str:
+        return f'DealRecord({self.id!r}, {self.status})'
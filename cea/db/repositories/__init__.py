@@ -1,6 +1,19 @@
+import os
+
 from cea.db.models import CurrencyRate, Deal
 from cea.db.repositories.currency_rate import CurrencyRateRepository
 from cea.db.repositories.deal import DealRepository
+from cea.db.repositories.fast_currency_rate import FastCurrencyRateRepository
+from cea.db.repositories.fast_deal import FastDealRepository
+
+# Serve the hottest reads via raw asyncpg instead of the ORM
+DB_FAST_PATH = os.getenv('DB_FAST_PATH', 'false').strip().lower() == 'true'
 
-currency_rate_repository = CurrencyRateRepository(CurrencyRate)
-deal_repository = DealRepository(Deal)
+if DB_FAST_PATH:
+    currency_rate_repository: CurrencyRateRepository = (
+        FastCurrencyRateRepository(CurrencyRate)
+    )
+    deal_repository: DealRepository = FastDealRepository(Deal)
+else:
+    currency_rate_repository = CurrencyRateRepository(CurrencyRate)
+    deal_repository = DealRepository(Deal)
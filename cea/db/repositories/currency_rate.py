@@ -1,30 +1,154 @@
 from datetime import date
 
-from sqlalchemy import select
+from sqlalchemy import Date, bindparam, cast, exists, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cea.db.models.currency_rate import CurrencyRate
+from cea.db.models.rate_set_version import RateSetVersion
 from cea.db.repository import BaseRepository
+from cea.tracing import traced
 
 
 class CurrencyRateRepository(BaseRepository[CurrencyRate]):
+    @traced
     async def list_by_date(
         self, session: AsyncSession, *, rate_date: date | None
     ) -> list[CurrencyRate]:
         effective_date = rate_date or date.today()
+        stmt = self._statement(
+            'list_by_date',
+            lambda: self._build_select(
+                where=self.model.rate_date == bindparam('rate_date')
+            ),
+        )
         return (
-            await self._read(
-                session, where=self.model.rate_date == effective_date
-            )
+            await session.execute(stmt, {'rate_date': effective_date})
         ).scalars().all()
 
+    @traced
+    async def exists_any(self, session: AsyncSession) -> bool:
+        stmt = self._statement(
+            'exists_any',
+            lambda: self._build_select(entities=[self.model.id], limit=1),
+        )
+        return (await session.execute(stmt)).first() is not None
+
+    @traced
     async def get_latest_by_abbreviation(
         self, session: AsyncSession, abbreviation: str
     ) -> CurrencyRate | None:
-        stmt = (
-            select(CurrencyRate)
-            .where(CurrencyRate.abbreviation == abbreviation)
-            .order_by(CurrencyRate.rate_date.desc())
-            .limit(1)
+        stmt = self._statement(
+            'get_latest_by_abbreviation',
+            lambda: (
+                select(CurrencyRate)
+                .where(CurrencyRate.abbreviation == bindparam('abbreviation'))
+                .order_by(CurrencyRate.rate_date.desc())
+                .limit(1)
+            ),
+        )
+        return (
+            await session.execute(stmt, {'abbreviation': abbreviation})
+        ).scalar_one_or_none()
+
+    @traced
+    async def latest_rates(self, session: AsyncSession) -> list[RowMapping]:
+        """Latest (id, abbreviation, scale, rate, rate_date) row of every
+        currency, ordered by abbreviation."""
+        stmt = self._statement(
+            'latest_rates',
+            lambda: (
+                select(
+                    CurrencyRate.id,
+                    CurrencyRate.abbreviation,
+                    CurrencyRate.scale,
+                    CurrencyRate.rate,
+                    CurrencyRate.rate_date,
+                )
+                .distinct(CurrencyRate.abbreviation)
+                .order_by(CurrencyRate.abbreviation, CurrencyRate.rate_date.desc())
+            ),
+        )
+        return list((await session.execute(stmt)).mappings())
+
+    @traced
+    async def history(
+        self, session: AsyncSession, *, date_from: date
+    ) -> list[RowMapping]:
+        """(abbreviation, rate_date, scale, rate) rows from `date_from` on,
+        ordered by currency and date."""
+        stmt = self._statement(
+            'history',
+            lambda: (
+                select(
+                    CurrencyRate.abbreviation,
+                    CurrencyRate.rate_date,
+                    CurrencyRate.scale,
+                    CurrencyRate.rate,
+                )
+                .where(CurrencyRate.rate_date >= bindparam('date_from'))
+                .order_by(CurrencyRate.abbreviation, CurrencyRate.rate_date)
+            ),
+        )
+        return list(
+            (await session.execute(stmt, {'date_from': date_from})).mappings()
+        )
+
+    @traced
+    async def rate_set_version(self, session: AsyncSession) -> int:
+        """Counter bumped by every transaction that changes currency_rates
+        (see `bump_rate_set_version`); 0 before the first one."""
+        stmt = self._statement(
+            'rate_set_version',
+            lambda: select(RateSetVersion.version).where(RateSetVersion.id == 1),
+        )
+        return (await session.execute(stmt)).scalar_one_or_none() or 0
+
+    @traced
+    async def bump_rate_set_version(self, session: AsyncSession) -> int:
+        """Advance the rate-set version within the caller's transaction, so
+        it commits (or rolls back) together with the rate changes."""
+
+        def build():
+            stmt = insert(RateSetVersion).values(id=1, version=1)
+            return stmt.on_conflict_do_update(
+                index_elements=[RateSetVersion.id],
+                set_={
+                    'version': RateSetVersion.version + 1,
+                    'updated_at': func.now(),
+                },
+            ).returning(RateSetVersion.version)
+
+        stmt = self._statement('bump_rate_set_version', build)
+        return (await session.execute(stmt)).scalar_one()
+
+    @traced
+    async def missing_dates(
+        self, session: AsyncSession, *, date_from: date, date_to: date
+    ) -> list[date]:
+        """Dates in [date_from, date_to] without any stored rate, ascending."""
+
+        def build():
+            day = cast(
+                func.generate_series(
+                    bindparam('date_from', type_=Date),
+                    bindparam('date_to', type_=Date),
+                    literal_column("interval '1 day'"),
+                ).column_valued('day'),
+                Date,
+            )
+            return (
+                select(day)
+                .where(~exists().where(CurrencyRate.rate_date == day))
+                .order_by(day)
+            )
+
+        stmt = self._statement('missing_dates', build)
+        return list(
+            (
+                await session.execute(
+                    stmt, {'date_from': date_from, 'date_to': date_to}
+                )
+            ).scalars()
         )
-        return (await session.execute(stmt)).scalar_one_or_none()
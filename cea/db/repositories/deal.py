@@ -1,22 +1,27 @@
 import datetime
 from typing import Any, Sequence
 
-from sqlalchemy import Row, and_, func, or_, select
+from sqlalchemy import Row, and_, bindparam, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cea.db.models.deal import Deal
 from cea.db.repository import BaseRepository
 from cea.enums import DealStatusEnum
+from cea.tracing import traced
 
 
 class DealRepository(BaseRepository[Deal]):
+    @traced
     async def list_pending(self, session: AsyncSession) -> Sequence[Deal]:
-        return (
-            await self._read(
-                session, where=self.model.status == DealStatusEnum.PENDING
-            )
-        ).scalars().all()
+        stmt = self._statement(
+            'list_pending',
+            lambda: self._build_select(
+                where=self.model.status == DealStatusEnum.PENDING
+            ),
+        )
+        return (await session.execute(stmt)).scalars().all()
 
+    @traced
     async def list_confirmed_between(
         self,
         session: AsyncSession,
@@ -24,41 +29,52 @@ class DealRepository(BaseRepository[Deal]):
         date_from: datetime.datetime,
         date_to: datetime.datetime,
     ) -> Sequence[Deal]:
-        return (
-            await self._read(
-                session,
-                where=(
-                    and_(
-                        self.model.status == DealStatusEnum.CONFIRMED,
-                        self.model.created_at >= date_from,
-                        self.model.created_at <= date_to,
-                    )
+        stmt = self._statement(
+            'list_confirmed_between',
+            lambda: self._build_select(
+                where=and_(
+                    self.model.status == DealStatusEnum.CONFIRMED,
+                    self.model.created_at >= bindparam('date_from'),
+                    self.model.created_at <= bindparam('date_to'),
                 ),
                 order_by=self.model.created_at,
+            ),
+        )
+        return (
+            await session.execute(
+                stmt, {'date_from': date_from, 'date_to': date_to}
             )
         ).scalars().all()
 
-    def _base_where(
-        self,
-        *,
-        date_from: datetime.datetime,
-        date_to: datetime.datetime,
-        currency: str | None = None,
-    ) -> list[Any]:
+    def _base_where(self, *, by_currency: bool = False) -> list[Any]:
+        """Report filter; values are bound via `_base_params`."""
         where_: list[Any] = [
             self.model.status == DealStatusEnum.CONFIRMED,
-            self.model.created_at >= date_from,
-            self.model.created_at <= date_to,
+            self.model.created_at >= bindparam('date_from'),
+            self.model.created_at <= bindparam('date_to'),
         ]
-        if currency:
+        if by_currency:
             where_.append(
                 or_(
-                    self.model.currency_from == currency, 
-                    self.model.currency_to == currency,
+                    self.model.currency_from == bindparam('currency'), 
+                    self.model.currency_to == bindparam('currency'),
                 )
             )
         return where_
 
+    @staticmethod
+    def _base_params(
+        *,
+        date_from: datetime.datetime,
+        date_to: datetime.datetime,
+        currency: str | None = None,
+    ) -> dict[str, Any]:
+        params: dict[str, Any] = {'date_from': date_from, 'date_to': date_to}
+        if currency:
+            params['currency'] = currency
+        return params
+
+    @traced
     async def sum_in_by_currency(
         self,
         session: AsyncSession,
@@ -68,20 +84,27 @@ class DealRepository(BaseRepository[Deal]):
         currency: str | None = None,
     ) -> dict[str, float]:
         """Sum amount_to grouped by currency_to."""
-        base_where = self._base_where(
-            date_from=date_from, date_to=date_to, currency=currency
+        by_currency = bool(currency)
+        stmt = self._statement(
+            f'sum_in_by_currency[{by_currency}]',
+            lambda: (
+                select(
+                    self.model.currency_to, 
+                    func.coalesce(func.sum(self.model.amount_to), 0),
+                )
+                .where(*self._base_where(by_currency=by_currency))
+                .group_by(self.model.currency_to)
+            ),
         )
-        stmt = (
-            select(
-                self.model.currency_to, 
-                func.coalesce(func.sum(self.model.amount_to), 0),
-            )
-            .where(*base_where)
-            .group_by(self.model.currency_to)
+        res = await session.execute(
+            stmt,
+            self._base_params(
+                date_from=date_from, date_to=date_to, currency=currency
+            ),
         )
-        res = await session.execute(stmt)
         return {k: float(v or 0) for k, v in res.all()}
 
+    @traced
     async def sum_out_by_currency(
         self,
         session: AsyncSession,
@@ -91,20 +114,27 @@ class DealRepository(BaseRepository[Deal]):
         currency: str | None = None,
     ) -> dict[str, float]:
         """Sum amount_from grouped by currency_from."""
-        base_where = self._base_where(
-            date_from=date_from, date_to=date_to, currency=currency
+        by_currency = bool(currency)
+        stmt = self._statement(
+            f'sum_out_by_currency[{by_currency}]',
+            lambda: (
+                select(
+                    self.model.currency_from, 
+                    func.coalesce(func.sum(self.model.amount_from), 0),
+                )
+                .where(*self._base_where(by_currency=by_currency))
+                .group_by(self.model.currency_from)
+            ),
         )
-        stmt = (
-            select(
-                self.model.currency_from, 
-                func.coalesce(func.sum(self.model.amount_from), 0),
-            )
-            .where(*base_where)
-            .group_by(self.model.currency_from)
+        res = await session.execute(
+            stmt,
+            self._base_params(
+                date_from=date_from, date_to=date_to, currency=currency
+            ),
         )
-        res = await session.execute(stmt)
         return {k: float(v or 0) for k, v in res.all()}
 
+    @traced
     async def count_by_currency(
         self,
         session: AsyncSession,
@@ -114,19 +144,26 @@ class DealRepository(BaseRepository[Deal]):
         currency: str | None = None,
     ) -> dict[str, int]:
         """Count confirmed deals per currency, counting either side participation."""
-        base_where = self._base_where(
-            date_from=date_from, date_to=date_to, currency=currency
+        by_currency = bool(currency)
+        stmt = self._statement(
+            f'count_by_currency[{by_currency}]',
+            lambda: select(
+                self.model.currency_from, self.model.currency_to
+            ).where(*self._base_where(by_currency=by_currency)),
+        )
+        res = await session.execute(
+            stmt,
+            self._base_params(
+                date_from=date_from, date_to=date_to, currency=currency
+            ),
         )
-        stmt = select(
-            self.model.currency_from, self.model.currency_to
-        ).where(*base_where)
-        res = await session.execute(stmt)
         counts: dict[str, int] = {}
         for c_from, c_to in res.all():
             counts[c_from] = counts.get(c_from, 0) + 1
             counts[c_to] = counts.get(c_to, 0) + 1
         return counts
 
+    @traced
     async def sums_by_currency(
         self,
         session: AsyncSession,
@@ -0,0 +1,51 @@
+from datetime import date
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cea.db.fast_repository import FastPathMixin, select_sql
+from cea.db.models.currency_rate import CurrencyRate
+from cea.db.records import CurrencyRateRecord
+from cea.db.repositories.currency_rate import CurrencyRateRepository
+from cea.tracing import traced
+
+_GET_BY_ID = select_sql(CurrencyRate, 'id = $1')
+_LIST_BY_DATE = select_sql(CurrencyRate, 'rate_date = $1')
+_LATEST_BY_ABBREVIATION = select_sql(
+    CurrencyRate, 'abbreviation = $1', 'ORDER BY rate_date DESC LIMIT 1'
+)
+
+
+class FastCurrencyRateRepository(FastPathMixin, CurrencyRateRepository):
+    """`CurrencyRateRepository` with hot reads served by raw asyncpg."""
+
+    @traced
+    async def get_by_id(
+        self, session: AsyncSession, instance_id: Any
+    ) -> CurrencyRateRecord | None:
+        row = await self._fetchrow(
+            session, _GET_BY_ID, int(instance_id), query='get_by_id'
+        )
+        return CurrencyRateRecord(*row) if row is not None else None
+
+    @traced
+    async def list_by_date(
+        self, session: AsyncSession, *, rate_date: date | None
+    ) -> list[CurrencyRateRecord]:
+        effective_date = rate_date or date.today()
+        rows = await self._fetch(
+            session, _LIST_BY_DATE, effective_date, query='list_by_date'
+        )
+        return [CurrencyRateRecord(*row) for row in rows]
+
+    @traced
+    async def get_latest_by_abbreviation(
+        self, session: AsyncSession, abbreviation: str
+    ) -> CurrencyRateRecord | None:
+        row = await self._fetchrow(
+            session,
+            _LATEST_BY_ABBREVIATION,
+            abbreviation,
+            query='get_latest_by_abbreviation',
+        )
+        return CurrencyRateRecord(*row) if row is not None else None
@@ -0,0 +1,36 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cea.db.fast_repository import FastPathMixin, select_sql
+from cea.db.models.deal import Deal
+from cea.db.records import DealRecord
+from cea.db.repositories.deal import DealRepository
+from cea.enums import DealStatusEnum
+from cea.tracing import traced
+
+_GET_BY_ID = select_sql(Deal, 'id = $1')
+_LIST_BY_STATUS = select_sql(Deal, 'status = $1')
+
+
+class FastDealRepository(FastPathMixin, DealRepository):
+    """`DealRepository` with hot reads served by raw asyncpg."""
+
+    @traced
+    async def get_by_id(
+        self, session: AsyncSession, instance_id: Any
+    ) -> DealRecord | None:
+        row = await self._fetchrow(
+            session, _GET_BY_ID, str(instance_id), query='get_by_id'
+        )
+        return DealRecord(*row) if row is not None else None
+
+    @traced
+    async def list_pending(self, session: AsyncSession) -> list[DealRecord]:
+        rows = await self._fetch(
+            session,
+            _LIST_BY_STATUS,
+            DealStatusEnum.PENDING.value,
+            query='list_pending',
+        )
+        return [DealRecord(*row) for row in rows]
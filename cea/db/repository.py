@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Generic, Type, TypeAlias, TypeVar
+from typing import Any, Callable, Generic, Mapping, Type, TypeAlias, TypeVar
 
 from pydantic import BaseModel
 from sqlalchemy import (
@@ -7,7 +7,9 @@ from sqlalchemy import (
     Delete,
     Result,
     Row,
+    Select,
     Update,
+    bindparam,
     delete,
     func,
     select,
@@ -18,11 +20,14 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute, QueryableAttribute
 
+from cea.metrics import query_label
 from cea.db.errors import (
     RepositoryError,
     RepositoryIntegrityConflictError,
 )
 from cea.db.models.base import Base
+from cea.db.statements import StatementT, statement_cache
+from cea.tracing import traced
 
 _logger = logging.getLogger(__name__)
 
@@ -38,6 +43,26 @@ class BaseRepository(Generic[ModelType]):
 
         self.model = model
 
+    def _statement(
+        self, shape: str, build: Callable[[], StatementT]
+    ) -> StatementT:
+        """
+        Return the statement cached under `shape`, building it on first use.
+
+        Per-call values must be `bindparam()` placeholders, supplied as
+        parameters when executing the statement.
+
+        Args:
+            shape (str): Statement shape name, unique within the model.
+            build (Callable[[], StatementT]): Statement factory.
+
+        Returns:
+            StatementT: Cached statement.
+        """
+
+        return statement_cache.get(f'{self.model.__name__}.{shape}', build)
+
+    @traced
     async def create(
         self, session: AsyncSession, data: CreateDataSchema | None = None, **value_kwargs: Any
     ) -> ModelType:
@@ -72,7 +97,8 @@ class BaseRepository(Generic[ModelType]):
 
             instance = self.model(**values)
             session.add(instance)
-            await session.commit()
+            with query_label(f'{self.model.__name__}.create'):
+                await session.commit()
 
             return instance
         except IntegrityError:
@@ -97,10 +123,15 @@ class BaseRepository(Generic[ModelType]):
         order_by: InstrumentedAttribute | ColumnElement | None = None,
         offset: int | None = None,
         limit: int | None = None,
+        params: Mapping[str, Any] | None = None,
     ) -> Result[Any]:
         """
         Find (filtering by `where`) records in db.
 
+        The statement is built on every call; hot reads should cache it
+        with `_statement(shape, lambda: self._build_select(...))` instead,
+        so that the arguments are only evaluated when the shape is built.
+
         Args:
             session (AsyncSession): SQLAlchemy asynchronous session.
             entities (list[InstrumentedAttribute] | None): Columns
@@ -116,11 +147,34 @@ class BaseRepository(Generic[ModelType]):
                 to `None`.
             limit (int | None): How many rows to skip. Defaults
                 to `None`.
+            params (Mapping[str, Any] | None): Values for `bindparam()`
+                placeholders. Defaults to `None`.
 
         Returns:
             Result[Any]: Query result.
         """
 
+        statement = self._build_select(
+            entities=entities,
+            where=where,
+            order_by=order_by,
+            offset=offset,
+            limit=limit,
+        )
+        with query_label(f'{self.model.__name__}._read'):
+            return await session.execute(statement, params)
+
+    def _build_select(
+        self,
+        *,
+        entities: list[QueryableAttribute] | None = None,
+        where: (
+            ColumnElement[bool] | tuple[ColumnElement[bool], ...] | None
+        ) = None,
+        order_by: InstrumentedAttribute | ColumnElement | None = None,
+        offset: int | None = None,
+        limit: int | None = None,
+    ) -> Select[Any]:
         statement = select(*entities) if entities else select(self.model)
 
         if where is not None:
@@ -136,8 +190,9 @@ class BaseRepository(Generic[ModelType]):
         if limit is not None:
             statement = statement.limit(limit)
 
-        return await session.execute(statement)
+        return statement
 
+    @traced
     async def update_by_id(
         self,
         session: AsyncSession,
@@ -175,14 +230,15 @@ class BaseRepository(Generic[ModelType]):
             .where(self.model.id == instance_id)  # type: ignore
             .values(**value_kwargs)
         )
-        if returning:
-            return await self._apply_and_execute_returning(
-                session, statement, is_commit=is_commit, returning=returning
-            )
+        with query_label(f'{self.model.__name__}.update_by_id'):
+            if returning:
+                return await self._apply_and_execute_returning(
+                    session, statement, is_commit=is_commit, returning=returning
+                )
 
-        await session.execute(statement)
-        if is_commit:
-            await session.commit()
+            await session.execute(statement)
+            if is_commit:
+                await session.commit()
 
         return None
 
@@ -204,12 +260,17 @@ class BaseRepository(Generic[ModelType]):
         return result.first()
 
 
+    @traced
     async def get_by_id(
         self, session: AsyncSession, instance_id: Any
     ) -> ModelType | None:
         """Fetch single row by primary key 'id'."""
 
-        result = await session.execute(
-            select(self.model).where(self.model.id == instance_id)  # type: ignore[attr-defined]
+        statement = self._statement(
+            'get_by_id',
+            lambda: select(self.model).where(
+                self.model.id == bindparam('id')  # type: ignore[attr-defined]
+            ),
         )
+        result = await session.execute(statement, {'id': instance_id})
         return result.scalar_one_or_none()
@@ -0,0 +1,101 @@
+import time
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Dialect
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import Executable
+
+StatementT = TypeVar('StatementT', bound=Executable)
+
+# Execution option carrying the shape name down to engine events
+SHAPE_OPTION = 'cea_shape'
+
+
+class ShapeStats:
+    __slots__ = (
+        'builds',
+        'hits',
+        'compile_time',
+        'executions',
+        'compiled_cache_hits',
+        'compiled_cache_misses',
+    )
+
+    def __init__(self) -> None:
+        self.builds = 0
+        self.hits = 0
+        self.compile_time = 0.0
+        self.executions = 0
+        self.compiled_cache_hits = 0
+        self.compiled_cache_misses = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class StatementCache:
+    """Pre-built, parameterized statements keyed by shape name.
+
+    A statement is constructed once per shape and reused with different
+    bound parameters afterwards. Reusing the same object also lets
+    SQLAlchemy memoize its cache key, so after the first execution the
+    compiled SQL is always served from the engine's compiled cache.
+
+    Counters per shape: `builds`/`hits` of this cache, `compile_time`
+    spent compiling the statement on build, and executions split by
+    whether the engine found the compiled form in its own cache.
+    """
+
+    def __init__(self) -> None:
+        self._statements: dict[str, Executable] = {}
+        self._stats: dict[str, ShapeStats] = {}
+        self._dialect: Dialect | None = None
+
+    def get(self, shape: str, build: Callable[[], StatementT]) -> StatementT:
+        statement = self._statements.get(shape)
+        if statement is not None:
+            self._stats[shape].hits += 1
+            return statement  # type: ignore[return-value]
+
+        stats = self._stats.setdefault(shape, ShapeStats())
+        statement = build().execution_options(**{SHAPE_OPTION: shape})
+        if self._dialect is not None:
+            start = time.perf_counter()
+            statement.compile(dialect=self._dialect)
+            stats.compile_time += time.perf_counter() - start
+        stats.builds += 1
+        self._statements[shape] = statement
+        return statement
+
+    def install(self, engine: AsyncEngine) -> None:
+        """Track compiled cache hits of cached shapes executed on `engine`."""
+
+        self._dialect = engine.dialect
+        event.listen(
+            engine.sync_engine, 'before_cursor_execute', self._on_execute
+        )
+
+    def _on_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        if context is None:
+            return
+        stats = self._stats.get(context.execution_options.get(SHAPE_OPTION))
+        if stats is None:
+            return
+        stats.executions += 1
+        if context.cache_hit == CacheStats.CACHE_HIT:
+            stats.compiled_cache_hits += 1
+        elif context.cache_hit == CacheStats.CACHE_MISS:
+            stats.compiled_cache_misses += 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {
+            shape: stats.as_dict()
+            for shape, stats in sorted(self._stats.items())
+        }
+
+
+statement_cache = StatementCache()
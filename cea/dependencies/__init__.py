@@ -1 +1,5 @@
+from cea.dependencies.dependencies import AdmitReads as AdmitReads
+from cea.dependencies.dependencies import AdmitReports as AdmitReports
+from cea.dependencies.dependencies import AdmitWrites as AdmitWrites
 from cea.dependencies.dependencies import SessionDep as SessionDep
+from cea.dependencies.dependencies import release_session as release_session
@@ -1,9 +1,32 @@
-from typing import Annotated
+from typing import Annotated, Any, AsyncIterator
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from cea.db.database import get_db
+from cea.db.database import get_db, release_session
+from cea.services.admission import (
+    AdmissionLimiter,
+    reads_limiter,
+    reports_limiter,
+    writes_limiter,
+)
 
 
+# Lazily created per request; routes call `release_session` when done with it
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
+
+
+def admission(limiter: AdmissionLimiter) -> Any:
+    """Route dependency that holds an admission slot for the request."""
+
+    async def admit() -> AsyncIterator[None]:
+        async with limiter.slot():
+            yield
+
+    return Depends(admit)
+
+
+# Endpoint classes for `dependencies=[...]` of the routes
+AdmitReads = admission(reads_limiter)
+AdmitWrites = admission(writes_limiter)
+AdmitReports = admission(reports_limiter)
@@ -1,6 +1,7 @@
+import asyncio
 import logging
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from datetime import date
 
 from fastapi import FastAPI
@@ -8,9 +9,18 @@ from fastapi.responses import JSONResponse
 
 from cea.api.routers import router
 from cea.api.docs import openapi_tags
-from cea.db.database import async_session
+from cea.metrics import METRICS_ENABLED, MetricsMiddleware
+from cea.query_budget import QUERY_BUDGET_ENABLED, QueryBudgetMiddleware
+from cea.request_profiler import PROFILING_ENABLED, RequestProfilerMiddleware
+from cea.tracing import TracingMiddleware, setup_tracing, shutdown_tracing
+from cea.db.database import async_session, engine
+from cea.services.leader import AdvisoryLockLeader
+from cea.services.rate_index import rate_index
+from cea.services.readiness import rates_readiness
 from cea.services.rate_loader import RateLoaderService
 from cea.services.scheduler import DailyRatesScheduler, _parse_time_utc
+from cea.startup import profiler
+from cea.warmup import warm_up_serializers, warm_up_statements
 from cea.services.errors import (
     ServiceError,
     ValidationError,
@@ -18,6 +28,7 @@ from cea.services.errors import (
     ConflictError,
     ExternalServiceError,
     DependencyError,
+    OverloadedError,
 )
 
 logging.basicConfig(
@@ -30,20 +41,68 @@ def _enabled(env_name: str, default: str = 'true') -> bool:
     return os.getenv(env_name, default).strip().lower() == 'true'
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # One-shot load on startup (idempotent upsert)
-    if _enabled('LOAD_RATES_ON_STARTUP', 'true'):
+async def _startup(leader: AdvisoryLockLeader | None) -> None:
+    """Warm up, elect the rates leader and run the one-shot load.
+
+    Runs off the startup path; /health/ready gates traffic meanwhile.
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        with profiler.phase('warm_up'):
+            warm_up_serializers()
+            await warm_up_statements(async_session)
+    except Exception:
+        logger.exception('Warm-up failed')
+    finally:
+        rates_readiness.mark_warm()
+
+    try:
+        if leader is not None:
+            with profiler.phase('leader_election'):
+                await leader.start()
+        if not _enabled('LOAD_RATES_ON_STARTUP', 'true'):
+            return
+        if leader is not None and not leader.is_leader:
+            return
         service = RateLoaderService()
-        async with async_session() as session:
-            try:
-                await service.fetch_and_upsert_for_date(
+        with profiler.phase('startup_load'):
+            async with async_session() as session:
+                loaded = await service.fetch_and_upsert_for_date(
                     session, ondate=date.today()
                 )
-            except ServiceError as e:
-                logging.getLogger(__name__).warning(
-                    'Startup rate load skipped due to service error: %s', e
-                )
+        if loaded.total:
+            rates_readiness.mark_ready()
+    except ServiceError as e:
+        logger.warning('Startup rate load skipped due to service error: %s', e)
+    except Exception:
+        logger.exception('Startup rate load failed')
+    finally:
+        profiler.report()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    profiler.mark('imports_and_app_setup')
+    setup_tracing()
+    # Rates from the host's snapshot file before the first DB query
+    rate_index.load_snapshot()
+
+    # Only one worker/pod (the advisory lock holder) loads rates
+    leader: AdvisoryLockLeader | None = None
+    if _enabled('LOAD_RATES_LEADER_ELECTION', 'true'):
+        leader = AdvisoryLockLeader(
+            engine,
+            key=int(os.getenv('LOAD_RATES_LOCK_KEY', '7261746573')),
+            retry_interval=float(
+                os.getenv('LOAD_RATES_LEADER_RETRY_SECONDS', '30')
+            ),
+        )
+        app.state.rates_leader = leader
+
+    # Warm-up, leader election and the one-shot load (idempotent upsert)
+    # run in the background; /health/ready gates traffic until rates are
+    # available
+    startup = asyncio.create_task(_startup(leader), name='startup')
 
     # Daily scheduler
     scheduler: DailyRatesScheduler | None = None
@@ -53,15 +112,29 @@ async def lifespan(app: FastAPI):
             async_session,
             RateLoaderService(),
             _parse_time_utc(time_str),
+            leader=leader,
+            jitter=float(os.getenv('LOAD_RATES_JITTER_SECONDS', '300')),
+            catchup_days=int(os.getenv('LOAD_RATES_CATCHUP_DAYS', '30')),
+            catchup_concurrency=int(
+                os.getenv('LOAD_RATES_CATCHUP_CONCURRENCY', '4')
+            ),
+            retries=int(os.getenv('LOAD_RATES_RETRIES', '3')),
         )
-        scheduler.start()
+        # First catch-up once the startup task has elected the leader
+        scheduler.start(after=startup)
         app.state.rate_scheduler = scheduler
 
     try:
         yield
     finally:
+        startup.cancel()
+        with suppress(asyncio.CancelledError):
+            await startup
         if scheduler is not None:
             await scheduler.stop()
+        if leader is not None:
+            await leader.stop()
+        shutdown_tracing()
 
 
 app = FastAPI(
@@ -72,6 +145,14 @@ app = FastAPI(
 )
 
 app.include_router(router)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if QUERY_BUDGET_ENABLED:
+    app.add_middleware(QueryBudgetMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(RequestProfilerMiddleware)
+# Outermost, so the server span covers the other middleware as well
+app.add_middleware(TracingMiddleware)
 
 # Exception handlers for service-layer errors
 
@@ -86,5 +167,13 @@ _ERROR_CODE_MAP: dict[type[ServiceError], int] = {
 
 @app.exception_handler(ServiceError)
 async def handle_service_error(_, exc: ServiceError):
-    status = _ERROR_CODE_MAP.get(type(exc), 500)
-    return JSONResponse(status_code=status, content={"detail": str(exc)})
+    status = next(
+        (_ERROR_CODE_MAP[cls] for cls in type(exc).__mro__ if cls in _ERROR_CODE_MAP),
+        500,
+    )
+    headers = None
+    if isinstance(exc, OverloadedError):
+        headers = {'Retry-After': str(exc.retry_after)}
+    return JSONResponse(
+        status_code=status, content={"detail": str(exc)}, headers=headers
+    )
@@ -0,0 +1,261 @@
+"""Prometheus metrics for `/metrics`.
+
+Collected per process: with several uvicorn workers each one exposes its
+own registry, so scrape the workers (pods) individually.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    HistogramMetricFamily,
+)
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cea.db.pool import pool_stats
+from cea.db.statements import SHAPE_OPTION
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').strip().lower() == 'true'
+
+_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+http_request_duration = Histogram(
+    'cea_http_request_duration_seconds',
+    'HTTP request latency by route template and status code.',
+    ['method', 'route', 'status'],
+    buckets=_LATENCY_BUCKETS,
+)
+db_query_duration = Histogram(
+    'cea_db_query_duration_seconds',
+    'Database statement latency by repository method.',
+    ['query'],
+    buckets=_LATENCY_BUCKETS,
+)
+nbrb_fetch_duration = Histogram(
+    'cea_nbrb_fetch_duration_seconds',
+    'Latency of NBRB rate requests.',
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+nbrb_fetch_errors = Counter(
+    'cea_nbrb_fetch_errors_total',
+    'Failed NBRB rate requests by exception type.',
+    ['error'],
+)
+rate_provider_hedges = Counter(
+    'cea_rate_provider_hedges_total',
+    'Extra rate provider requests by reason: slow (hedge) or failover.',
+    ['reason'],
+)
+rate_provider_wins = Counter(
+    'cea_rate_provider_wins_total',
+    'Rate fetches answered by each provider.',
+    ['provider'],
+)
+scheduler_runs = Counter(
+    'cea_rates_scheduler_runs_total',
+    'Daily rates scheduler runs by result (success, failure, skipped).',
+    ['result'],
+)
+scheduler_last_run = Gauge(
+    'cea_rates_scheduler_last_run_timestamp_seconds',
+    'Unix time of the last daily rates scheduler run.',
+)
+scheduler_last_success = Gauge(
+    'cea_rates_scheduler_last_run_success',
+    '1 if the last daily rates scheduler run loaded rates, 0 otherwise.',
+)
+scheduler_last_rows = Gauge(
+    'cea_rates_scheduler_last_run_rows',
+    'Rates inserted or updated by the last successful daily rates scheduler run.',
+)
+rates_catchup_days = Counter(
+    'cea_rates_catchup_days_total',
+    'Missing rate dates handled by the scheduler catch-up by result '
+    '(filled, empty, failed).',
+    ['result'],
+)
+admission_rejections = Counter(
+    'cea_admission_rejections_total',
+    'Requests shed by admission control by endpoint class and reason.',
+    ['endpoint_class', 'reason'],
+)
+admission_in_flight = Gauge(
+    'cea_admission_in_flight',
+    'Requests holding an admission slot by endpoint class.',
+    ['endpoint_class'],
+)
+singleflight_calls = Counter(
+    'cea_singleflight_calls_total',
+    'Service calls by single-flight role: leader (ran the computation) or '
+    'coalesced (shared an in-flight result).',
+    ['flight', 'role'],
+)
+rate_book_reads = Counter(
+    'cea_rate_book_reads_total',
+    'Shared rate book reads by outcome: shared (fresh book), refreshed (this '
+    'worker refreshed it), stale (served while another worker refreshes) or '
+    'fallback (no book; the caller queried the DB).',
+    ['outcome'],
+)
+rate_book_publishes = Counter(
+    'cea_rate_book_publishes_total',
+    'Shared rate book generations published by trigger (load, refresh).',
+    ['trigger'],
+)
+
+# Label for statements that carry no statement cache shape
+_query_label: ContextVar[str | None] = ContextVar('_query_label', default=None)
+
+
+@contextmanager
+def query_label(name: str) -> Iterator[None]:
+    """Attribute the statements executed inside the block to `name`."""
+    token = _query_label.set(name)
+    try:
+        yield
+    finally:
+        _query_label.reset(token)
+
+
+def observe_query(name: str, seconds: float) -> None:
+    """Record a statement that bypassed the engine (asyncpg fast path)."""
+    db_query_duration.labels(name).observe(seconds)
+
+
+def record_scheduler_run(result: str, rows: int | None = None) -> None:
+    scheduler_runs.labels(result).inc()
+    if result == 'skipped':
+        return
+    scheduler_last_run.set_to_current_time()
+    scheduler_last_success.set(1 if result == 'success' else 0)
+    if rows is not None:
+        scheduler_last_rows.set(rows)
+
+
+class _PoolCollector(Collector):
+    """Pool occupancy, read from the engine at scrape time."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    def collect(self) -> Iterator[Any]:
+        stats = pool_stats(self._engine)
+        for name in ('size', 'checked_in', 'checked_out', 'overflow', 'max_overflow'):
+            if stats.get(name) is not None:
+                yield GaugeMetricFamily(
+                    f'cea_db_pool_{name}',
+                    f'Connection pool {name.replace("_", " ")}.',
+                    value=stats[name],
+                )
+        if stats.get('timeouts') is not None:
+            yield CounterMetricFamily(
+                'cea_db_pool_checkout_timeouts',
+                'Pool checkouts that timed out.',
+                value=stats['timeouts'],
+            )
+        wait = stats.get('wait')
+        if wait is not None:
+            yield HistogramMetricFamily(
+                'cea_db_pool_checkout_wait_seconds',
+                'Time spent waiting for a pooled connection.',
+                buckets=[
+                    ('+Inf' if b['le'] is None else str(b['le']), b['count'])
+                    for b in wait['buckets']
+                ],
+                sum_value=wait['sum'],
+            )
+
+
+def _label(context: Any) -> str:
+    if context is not None:
+        shape = context.execution_options.get(SHAPE_OPTION)
+        if shape is not None:
+            return shape
+    return _query_label.get() or 'other'
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('cea_query_start', []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['cea_query_start'].pop()
+    db_query_duration.labels(_label(context)).observe(
+        time.perf_counter() - started
+    )
+
+
+def _on_error(exception_context) -> None:
+    conn = exception_context.connection
+    starts = conn.info.get('cea_query_start') if conn is not None else None
+    if starts:
+        started = starts.pop()
+        db_query_duration.labels(
+            _label(exception_context.execution_context)
+        ).observe(time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """Observe request latency labeled by route template and status.
+
+    Pure ASGI (no `BaseHTTPMiddleware` task/stream overhead). Requests that
+    match no route are labeled `<unmatched>` to keep cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get('route')
+            http_request_duration.labels(
+                scope['method'],
+                getattr(route, 'path', '<unmatched>'),
+                str(status),
+            ).observe(time.perf_counter() - start)
+
+
+def install(engine: AsyncEngine) -> None:
+    """Time statements executed on `engine` and expose its pool."""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, 'before_cursor_execute', _before_execute)
+    event.listen(sync_engine, 'after_cursor_execute', _after_execute)
+    event.listen(sync_engine, 'handle_error', _on_error)
+    REGISTRY.register(_PoolCollector(engine))
+
+
+def render() -> bytes:
+    return generate_latest(REGISTRY)
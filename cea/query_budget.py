@@ -0,0 +1,194 @@
+"""Per-request SQL statement count and DB time.
+
+Every statement executed while handling a request (ORM through engine
+events, raw asyncpg fast path through `record_query`) is counted and
+timed. The totals are sent back as a `Server-Timing` header, and requests
+over the configured count or time budget are logged with their
+statements.
+
+For tests, `expect_queries(n)` fails with `QueryBudgetExceeded` when the
+block runs more than `n` statements:
+
+    with expect_queries(3):
+        await deal_service.confirm(session, payload)
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_ENABLED = (
+    os.getenv('QUERY_BUDGET_ENABLED', 'true').strip().lower() == 'true'
+)
+QUERY_BUDGET_COUNT = int(os.getenv('QUERY_BUDGET_COUNT', '10'))
+QUERY_BUDGET_MS = float(os.getenv('QUERY_BUDGET_MS', '250'))
+
+# Statements kept per request for the over-budget log line
+_MAX_LOGGED_STATEMENTS = 50
+_MAX_STATEMENT_LENGTH = 300
+
+
+def _parse_route_budgets(raw: str) -> dict[str, int]:
+    """`/exchange/confirm=3,/deals/report=4` -> {route: max statements}."""
+    budgets: dict[str, int] = {}
+    for item in raw.split(','):
+        if item.strip():
+            route, _, count = item.strip().rpartition('=')
+            budgets[route] = int(count)
+    return budgets
+
+
+# Per route template statement budgets, overriding QUERY_BUDGET_COUNT
+QUERY_BUDGET_ROUTES = _parse_route_budgets(os.getenv('QUERY_BUDGET_ROUTES', ''))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryTracker:
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: list[tuple[str, float]] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if len(self.statements) < _MAX_LOGGED_STATEMENTS:
+            self.statements.append(
+                (' '.join(statement.split())[:_MAX_STATEMENT_LENGTH], seconds)
+            )
+
+    def describe(self) -> str:
+        return '\n'.join(
+            f'  {seconds * 1e3:8.2f} ms  {statement}'
+            for statement, seconds in self.statements
+        )
+
+
+_tracker: ContextVar[QueryTracker | None] = ContextVar('_tracker', default=None)
+
+
+def record_query(statement: str, seconds: float) -> None:
+    """Count a statement against the current request, if any."""
+    tracker = _tracker.get()
+    if tracker is not None:
+        tracker.record(statement, seconds)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryTracker]:
+    """Collect the statements executed inside the block."""
+    tracker = QueryTracker()
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+@contextmanager
+def expect_queries(max_count: int) -> Iterator[QueryTracker]:
+    """Fail if the block executes more than `max_count` statements."""
+    with track_queries() as tracker:
+        yield tracker
+    if tracker.count > max_count:
+        raise QueryBudgetExceeded(
+            f'{tracker.count} statements executed, budget is {max_count}:\n'
+            f'{tracker.describe()}'
+        )
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if _tracker.get() is not None:
+        conn.info.setdefault('cea_budget_start', []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    tracker = _tracker.get()
+    starts = conn.info.get('cea_budget_start')
+    if tracker is not None and starts:
+        tracker.record(statement, time.perf_counter() - starts.pop())
+
+
+def _on_error(exception_context) -> None:
+    conn = exception_context.connection
+    starts = conn.info.get('cea_budget_start') if conn is not None else None
+    tracker = _tracker.get()
+    if tracker is not None and starts:
+        tracker.record(
+            exception_context.statement or '',
+            time.perf_counter() - starts.pop(),
+        )
+
+
+def install(engine: AsyncEngine) -> None:
+    """Count and time statements executed on `engine` per request."""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, 'before_cursor_execute', _before_execute)
+    event.listen(sync_engine, 'after_cursor_execute', _after_execute)
+    event.listen(sync_engine, 'handle_error', _on_error)
+
+
+class QueryBudgetMiddleware:
+    """Add `Server-Timing: db;dur=..;desc="N statements"` to responses and
+    log requests over their statement or DB time budget."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        with track_queries() as tracker:
+
+            async def send_wrapper(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    timing = (
+                        f'db;dur={tracker.seconds * 1e3:.2f};'
+                        f'desc="{tracker.count} statements", '
+                        f'app;dur={(time.perf_counter() - start) * 1e3:.2f}'
+                    )
+                    message['headers'] = [
+                        *message.get('headers', ()),
+                        (b'server-timing', timing.encode('latin-1')),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._check(scope, tracker)
+
+    @staticmethod
+    def _check(scope: Scope, tracker: QueryTracker) -> None:
+        route = getattr(scope.get('route'), 'path', scope['path'])
+        budget = QUERY_BUDGET_ROUTES.get(route, QUERY_BUDGET_COUNT)
+        if tracker.count <= budget and tracker.seconds * 1e3 <= QUERY_BUDGET_MS:
+            return
+        _logger.warning(
+            'Query budget exceeded: %s %s ran %d statements in %.2f ms '
+            '(budget %d statements, %.0f ms)\n%s',
+            scope['method'],
+            route,
+            tracker.count,
+            tracker.seconds * 1e3,
+            budget,
+            QUERY_BUDGET_MS,
+            tracker.describe(),
+        )
@@ -0,0 +1,161 @@
+"""Sampling profiler for individual requests (pyinstrument).
+
+On demand: with `PROFILING_TOKEN` set, a request carrying
+`X-Profile: <token>` (or `?profile=<token>`) is profiled and answered with
+the profile instead of its normal body: an interactive HTML flame/call
+tree by default, or a speedscope JSON with `X-Profile-Format: speedscope`
+(`?profile_format=speedscope`). The original status code is returned in
+`X-Profiled-Status`.
+
+Background: `PROFILING_SAMPLE_RATE` (0..1) of all requests are profiled
+and written as speedscope JSON files to `PROFILING_DIR`.
+
+pyinstrument samples the stack every `PROFILING_INTERVAL` seconds and, in
+async mode, only attributes samples to the profiled request's task.
+"""
+
+import asyncio
+import hmac
+import logging
+import os
+import random
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_logger = logging.getLogger(__name__)
+
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_INTERVAL = float(os.getenv('PROFILING_INTERVAL', '0.001'))
+PROFILING_DIR = Path(os.getenv('PROFILING_DIR', 'profiles'))
+
+PROFILING_ENABLED = bool(PROFILING_TOKEN) or PROFILING_SAMPLE_RATE > 0
+
+
+def _profiler():
+    # Imported lazily: only needed once a request is actually profiled
+    from pyinstrument import Profiler
+
+    return Profiler(interval=PROFILING_INTERVAL, async_mode='enabled')
+
+
+def _render(session, fmt: str) -> tuple[bytes, bytes]:
+    """Render a profile session; returns (body, content type)."""
+    if fmt == 'speedscope':
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        return SpeedscopeRenderer().render(session).encode(), b'application/json'
+    from pyinstrument.renderers import HTMLRenderer
+
+    return HTMLRenderer().render(session).encode(), b'text/html; charset=utf-8'
+
+
+class RequestProfilerMiddleware:
+    """Profile requests on operator demand or at a background sample rate."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        fmt = self._requested_format(scope)
+        if fmt is not None:
+            await self._profile_to_response(scope, receive, send, fmt)
+        elif PROFILING_SAMPLE_RATE > 0 and random.random() < PROFILING_SAMPLE_RATE:
+            await self._profile_to_disk(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    @staticmethod
+    def _requested_format(scope: Scope) -> str | None:
+        """Profile format if the request carries a valid operator token."""
+        if not PROFILING_TOKEN:
+            return None
+        headers = dict(scope.get('headers', ()))
+        query = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        token = headers.get(b'x-profile', b'').decode('latin-1') or query.get(
+            'profile', ''
+        )
+        # Bytes: compare_digest rejects non-ASCII str with a TypeError
+        if not token or not hmac.compare_digest(
+            token.encode(), PROFILING_TOKEN.encode()
+        ):
+            return None
+        return (
+            headers.get(b'x-profile-format', b'').decode('latin-1')
+            or query.get('profile_format')
+            or 'html'
+        )
+
+    async def _profile_to_response(
+        self, scope: Scope, receive: Receive, send: Send, fmt: str
+    ) -> None:
+        status = 500
+
+        async def swallow(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+        profiler = _profiler()
+        profiler.start()
+        try:
+            await self.app(scope, receive, swallow)
+        except Exception:
+            # The profile of a failing request is what the operator is after
+            _logger.exception('Profiled request failed')
+        finally:
+            profiler.stop()
+
+        body, content_type = _render(profiler.last_session, fmt)
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', content_type),
+                (b'content-length', str(len(body)).encode()),
+                (b'x-profiled-status', str(status).encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _profile_to_disk(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        try:
+            profiler = _profiler()
+            profiler.start()
+        except Exception:
+            _logger.exception('Could not start request profiler')
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            route = getattr(scope.get('route'), 'path', scope['path'])
+            try:
+                await asyncio.to_thread(
+                    self._write, profiler.last_session, scope['method'], route
+                )
+            except Exception:
+                _logger.exception('Could not write request profile')
+
+    @staticmethod
+    def _write(session, method: str, route: str) -> None:
+        body, _ = _render(session, 'speedscope')
+        slug = route.strip('/').replace('/', '_').replace('{', '').replace('}', '')
+        name = (
+            f'{time.strftime("%Y%m%dT%H%M%S")}-{method}-{slug or "root"}-'
+            f'{session.duration * 1e3:.0f}ms-{uuid.uuid4().hex[:8]}'
+            '.speedscope.json'
+        )
+        PROFILING_DIR.mkdir(parents=True, exist_ok=True)
+        (PROFILING_DIR / name).write_bytes(body)
@@ -11,3 +11,26 @@ class CurrencyRateOut(BaseModel):
     scale: int
     rate: float
     rate_date: datetime.date
+
+
+class RateWindowStats(BaseModel):
+    # Trailing window in calendar days, ending at the stats' rate_date
+    days: int
+    observations: int
+    min: float
+    max: float
+    mean: float
+    # Change over the window: last / rate before the window - 1
+    change: float | None
+    mean_daily_return: float | None
+    # Standard deviation of daily returns (not annualized)
+    volatility: float | None
+
+
+class CurrencyStatsOut(BaseModel):
+    abbreviation: str
+    rate_date: datetime.date
+    # BYN per one unit of the currency (rate / scale)
+    rate: float
+    daily_return: float | None
+    windows: list[RateWindowStats]
@@ -40,6 +40,38 @@ class ExchangePreviewOut(BaseModel):
     status: DealStatusEnum
 
 
+class ExchangeQuoteIn(BaseModel):
+    amount_from: float
+    currency_from: str
+    currency_to: str
+    # As-of date: rates in effect on that day; latest known rates if omitted
+    rate_date: datetime.date | None = None
+
+
+class ExchangeQuoteOut(BaseModel):
+    amount_to: float
+    rate_from: float
+    scale_from: int
+    rate_date_from: datetime.date
+    rate_to: float
+    scale_to: int
+    rate_date_to: datetime.date
+
+
+class BulkConvertIn(BaseModel):
+    # Parallel arrays: element i converts amount_from[i] of currency_from[i]
+    amount_from: list[float]
+    currency_from: list[str]
+    currency_to: list[str]
+    # As-of date: rates in effect on that day; latest known rates if omitted
+    rate_date: datetime.date | None = None
+
+
+class BulkConvertOut(BaseModel):
+    amount_to: list[float]
+    rate_date: datetime.date
+
+
 class ExchangeConfirmIn(BaseModel):
     deal_id: str
     result: ConfirmActionEnum
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+
+
+class WaitBucketOut(BaseModel):
+    le: float | None
+    count: int
+
+
+class WaitHistogramOut(BaseModel):
+    buckets: list[WaitBucketOut]
+    count: int
+    sum: float
+    max: float
+
+
+class PoolStatsOut(BaseModel):
+    pool_class: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    timeouts: int
+    wait: WaitHistogramOut
+
+
+class StatementShapeStatsOut(BaseModel):
+    builds: int
+    hits: int
+    compile_time: float
+    executions: int
+    compiled_cache_hits: int
+    compiled_cache_misses: int
@@ -0,0 +1,20 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class PortfolioValueIn(BaseModel):
+    # Amount held per currency abbreviation
+    holdings: dict[str, float]
+    dates: list[datetime.date]
+    currency: str
+
+
+class PortfolioValuePoint(BaseModel):
+    date: datetime.date
+    value: float
+
+
+class PortfolioValueOut(BaseModel):
+    currency: str
+    values: list[PortfolioValuePoint]
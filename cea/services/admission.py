@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from cea.db.database import engine
+from cea.db.pool import InstrumentedAsyncQueuePool
+from cea.metrics import admission_in_flight, admission_rejections
+from cea.services.errors import OverloadedError
+
+ADMISSION_ENABLED = (
+    os.getenv('ADMISSION_ENABLED', 'true').strip().lower() == 'true'
+)
+ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', '1'))
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded queue for one endpoint class.
+
+    Up to `concurrency` requests run at once and up to `queue` more wait
+    for a slot (at most `queue_timeout` seconds). Anything beyond that is
+    rejected right away with `OverloadedError` (503 + Retry-After) instead
+    of piling up on the connection pool until clients time out. Requests
+    are also shed while the pool's estimated checkout wait exceeds
+    `max_pool_wait`.
+
+    Each class has its own slots, so heavy reports can hold at most
+    `concurrency` connections and never starve previews.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        concurrency: int,
+        queue: int,
+        queue_timeout: float,
+        max_pool_wait: float,
+    ) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.queue_timeout = queue_timeout
+        self.max_pool_wait = max_pool_wait
+        self._slots = asyncio.Semaphore(concurrency)
+        self.active = 0
+        self.waiting = 0
+
+    def _reject(self, reason: str) -> OverloadedError:
+        admission_rejections.labels(self.name, reason).inc()
+        return OverloadedError(
+            f'Service overloaded ({self.name}: {reason}), retry later',
+            retry_after=ADMISSION_RETRY_AFTER,
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if not ADMISSION_ENABLED:
+            yield
+            return
+
+        pool = engine.pool
+        if (
+            isinstance(pool, InstrumentedAsyncQueuePool)
+            and pool.estimated_wait() > self.max_pool_wait
+        ):
+            raise self._reject('pool_wait')
+
+        if self._slots.locked():
+            if self.waiting >= self.queue:
+                raise self._reject('queue_full')
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self._slots.acquire(), timeout=self.queue_timeout
+                )
+            except asyncio.TimeoutError:
+                raise self._reject('queue_timeout') from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+
+        self.active += 1
+        admission_in_flight.labels(self.name).inc()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            admission_in_flight.labels(self.name).dec()
+            self._slots.release()
+
+
+def _limiter(
+    name: str,
+    concurrency: str,
+    queue: str,
+    queue_timeout: str,
+    max_pool_wait: str,
+) -> AdmissionLimiter:
+    prefix = f'ADMISSION_{name.upper()}'
+    return AdmissionLimiter(
+        name,
+        concurrency=int(os.getenv(f'{prefix}_CONCURRENCY', concurrency)),
+        queue=int(os.getenv(f'{prefix}_QUEUE', queue)),
+        queue_timeout=float(os.getenv(f'{prefix}_QUEUE_TIMEOUT', queue_timeout)),
+        max_pool_wait=float(os.getenv(f'{prefix}_MAX_POOL_WAIT', max_pool_wait)),
+    )
+
+
+# Reports are shed first: fewer slots and a lower pool wait threshold
+reads_limiter = _limiter('reads', '16', '64', '5', '1.0')
+writes_limiter = _limiter('writes', '16', '64', '5', '1.0')
+reports_limiter = _limiter('reports', '2', '8', '10', '0.25')
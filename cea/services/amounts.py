@@ -0,0 +1,50 @@
+"""Half-up rounding of float64 amounts, consistent with Decimal.
+
+Deal amounts are rounded to 4 decimal places with ROUND_HALF_UP on exact
+`Decimal` values (`DealService._calc_amount_to`). Vectorized code computes
+in float64 instead; that agrees everywhere except right next to a rounding
+tie, where float error could round the other way. `round_half_up` rounds
+the floats and takes those few elements from an exact `Decimal` result.
+"""
+
+from decimal import Decimal
+from typing import Callable
+
+import numpy as np
+
+# Amounts are rounded to 4 decimal places
+_QUANTUM = 10_000
+# Float results this close to a rounding tie (relative) are recomputed
+# with Decimal. float64 error of a few operations is ~1e-15 relative
+# (and grows ~1e-16 per term of a sum).
+_TIE_TOLERANCE = 1e-13
+
+
+def round_half_up(
+    values: np.ndarray,
+    exact: Callable[[int], Decimal],
+    magnitude: np.ndarray | None = None,
+) -> np.ndarray:
+    """Round `values` to 4 decimal places, half up (away from zero, like
+    ROUND_HALF_UP).
+
+    `exact(i)` returns element i computed and rounded with Decimal; it is
+    only called for elements next to a rounding tie. `magnitude` bounds
+    the size of the terms each value was computed from (e.g. the sum of
+    their absolute values, when positive and negative terms cancel); the
+    float error, and so the tie tolerance, scales with it. Defaults to
+    `abs(values)`.
+    """
+    scaled = np.abs(values) * _QUANTUM
+    if magnitude is None:
+        magnitude = scaled
+    else:
+        magnitude = np.abs(magnitude) * _QUANTUM
+    # + 0.0 turns the -0.0 of tiny negative values into 0.0
+    rounded = np.copysign(np.floor(scaled + 0.5), values) + 0.0
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= (
+        _TIE_TOLERANCE * np.maximum(1.0, magnitude)
+    )
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = float(exact(int(i))) * _QUANTUM
+    return rounded / _QUANTUM
@@ -6,14 +6,49 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from cea.db.models.currency_rate import CurrencyRate
 from cea.db.repositories import currency_rate_repository
 from cea.db.errors import RepositoryError
-from cea.services.errors import DependencyError
+from cea.schemas.currency import CurrencyStatsOut
+from cea.services.errors import DependencyError, NotFoundError, ValidationError
+from cea.services.rate_book import BookRate, rate_book
+from cea.services.rate_index import rate_index
+from cea.services.singleflight import SingleFlight
+from cea.tracing import traced
+
+STATS_MAX_WINDOWS = 10
+STATS_MAX_WINDOW_DAYS = 3650
+
+# Identical concurrent listings share one lookup
+_list_rates_flight: SingleFlight[list[CurrencyRate | BookRate]] = SingleFlight(
+    'list_rates'
+)
 
 
 class CurrencyRateService:
     @staticmethod
+    @traced
     async def list_rates(
         session: AsyncSession, *, rate_date: date | None
-    ) -> list[CurrencyRate]:
+    ) -> list[CurrencyRate | BookRate]:
+        return await _list_rates_flight.do(
+            rate_date,
+            lambda: CurrencyRateService._list_rates(session, rate_date=rate_date),
+        )
+
+    @staticmethod
+    async def _list_rates(
+        session: AsyncSession, *, rate_date: date | None
+    ) -> list[CurrencyRate | BookRate]:
+        try:
+            book = await rate_book.current(session)
+        except Exception as e:
+            raise DependencyError(str(e)) from e
+        if (
+            book is not None
+            and book.last_date is not None
+            and (rate_date or date.today()) >= book.last_date
+        ):
+            # Nothing is stored after the book's last date, so the DB
+            # lookup would end up listing that date as well
+            return book.on_last_date()
         try:
             rows = await currency_rate_repository.list_by_date(
                 session, rate_date=rate_date
@@ -33,6 +68,7 @@ class CurrencyRateService:
             raise DependencyError(str(e)) from e
 
     @staticmethod
+    @traced
     async def get_latest(
         session: AsyncSession, abbreviation: str
     ) -> CurrencyRate | None:
@@ -42,3 +78,46 @@ class CurrencyRateService:
             )
         except Exception as e:
             raise DependencyError(str(e)) from e
+
+    @staticmethod
+    @traced
+    async def has_snapshot(session: AsyncSession) -> bool:
+        try:
+            return await currency_rate_repository.exists_any(session)
+        except Exception as e:
+            raise DependencyError(str(e)) from e
+
+    @staticmethod
+    @traced
+    async def stats(
+        session: AsyncSession,
+        abbreviation: str,
+        *,
+        windows: list[int],
+        rate_date: date | None = None,
+    ) -> CurrencyStatsOut:
+        """Rolling statistics over trailing windows (in days) of the rate
+        history, as of `rate_date` (latest known rate if omitted)."""
+        if not windows or len(windows) > STATS_MAX_WINDOWS:
+            raise ValidationError(
+                f'Between 1 and {STATS_MAX_WINDOWS} windows are required'
+            )
+        if any(not 1 <= w <= STATS_MAX_WINDOW_DAYS for w in windows):
+            raise ValidationError(
+                f'Windows must be between 1 and {STATS_MAX_WINDOW_DAYS} days'
+            )
+        try:
+            await rate_index.ensure_fresh(session)
+        except Exception as e:
+            raise DependencyError(str(e)) from e
+        as_of = rate_date or rate_index.last_date
+        stats = (
+            rate_index.window_stats(abbreviation, as_of, windows)
+            if as_of is not None
+            else None
+        )
+        if stats is None:
+            raise NotFoundError(
+                f'No {abbreviation} rate on or before {as_of or "today"}'
+            )
+        return CurrencyStatsOut(**stats)
@@ -1,6 +1,9 @@
+import os
 from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
+from typing import Sequence
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cea.db.repositories import currency_rate_repository, deal_repository
@@ -13,13 +16,27 @@ from cea.services.errors import (
     ValidationError,
 )
 from cea.schemas.deal import (
+    BulkConvertIn,
+    BulkConvertOut,
     DealReportItem,
     ExchangeConfirmIn,
     ExchangeConfirmOut,
     ExchangePreviewIn,
     ExchangePreviewOut,
+    ExchangeQuoteIn,
+    ExchangeQuoteOut,
     PendingDealOut,
 )
+from cea.services.amounts import round_half_up
+from cea.services.rate_book import rate_book
+from cea.services.rate_index import rate_index
+from cea.services.singleflight import SingleFlight
+from cea.tracing import traced
+
+# Identical concurrent reports share one aggregation query
+_report_flight: SingleFlight[list[DealReportItem]] = SingleFlight('deal_report')
+
+BULK_CONVERT_MAX_ITEMS = int(os.getenv('BULK_CONVERT_MAX_ITEMS', '1000000'))
 
 
 class DealService:
@@ -35,6 +52,33 @@ class DealService:
         amount_to = byn_from / (rate_to / Decimal(scale_to))
         return amount_to.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
 
+    @classmethod
+    def _calc_amounts_to(
+        cls,
+        amounts_from: np.ndarray,
+        rates_from: np.ndarray,
+        scales_from: np.ndarray,
+        rates_to: np.ndarray,
+        scales_to: np.ndarray,
+    ) -> np.ndarray:
+        """Vectorized `_calc_amount_to` over float64 arrays, same results.
+
+        The float computation is exact enough everywhere except next to a
+        rounding tie, where float error could flip ROUND_HALF_UP; those
+        (rare) elements are recomputed with `_calc_amount_to`.
+        """
+        return round_half_up(
+            amounts_from * (rates_from / scales_from) / (rates_to / scales_to),
+            lambda i: cls._calc_amount_to(
+                Decimal(str(amounts_from[i])),
+                Decimal(str(rates_from[i])),
+                int(scales_from[i]),
+                Decimal(str(rates_to[i])),
+                int(scales_to[i]),
+            ),
+        )
+
+    @traced
     async def preview(
         self, session: AsyncSession, payload: ExchangePreviewIn
     ) -> ExchangePreviewOut:
@@ -45,16 +89,21 @@ class DealService:
             raise ValidationError('currency_from and currency_to must differ')
 
         try:
-            rate_from_row = (
-                await currency_rate_repository.get_latest_by_abbreviation(
-                    session, payload.currency_from
+            book = await rate_book.current(session)
+            if book is not None:
+                rate_from_row = book.rates.get(payload.currency_from)
+                rate_to_row = book.rates.get(payload.currency_to)
+            else:
+                rate_from_row = (
+                    await currency_rate_repository.get_latest_by_abbreviation(
+                        session, payload.currency_from
+                    )
                 )
-            )
-            rate_to_row = (
-                await currency_rate_repository.get_latest_by_abbreviation(
-                    session, payload.currency_to
+                rate_to_row = (
+                    await currency_rate_repository.get_latest_by_abbreviation(
+                        session, payload.currency_to
+                    )
                 )
-            )
         except Exception as e:
             raise DependencyError(str(e)) from e
 
@@ -104,6 +153,127 @@ class DealService:
             status=DealStatusEnum.PENDING,
         )
 
+    @traced
+    async def quote(
+        self, session: AsyncSession, payload: ExchangeQuoteIn
+    ) -> ExchangeQuoteOut:
+        """Price an exchange at the rates in effect on `payload.rate_date`
+        (latest known rates if omitted) without creating a deal.
+
+        Served from the in-memory rate index, so repricing past deals for
+        audits does not query the DB per deal.
+        """
+        if payload.amount_from is None or payload.amount_from <= 0:
+            raise ValidationError('amount_from must be a positive number')
+        if payload.currency_from == payload.currency_to:
+            raise ValidationError('currency_from and currency_to must differ')
+
+        try:
+            await rate_index.ensure_fresh(session)
+        except Exception as e:
+            raise DependencyError(str(e)) from e
+        as_of = payload.rate_date or rate_index.last_date
+        if as_of is None:
+            raise ValidationError('No rates loaded')
+        rate_from = rate_index.as_of(payload.currency_from, as_of)
+        rate_to = rate_index.as_of(payload.currency_to, as_of)
+        for abbreviation, point in (
+            (payload.currency_from, rate_from),
+            (payload.currency_to, rate_to),
+        ):
+            if point is None:
+                raise ValidationError(
+                    f'No {abbreviation} rate on or before {as_of}'
+                )
+
+        if rate_from.scale == 0 or rate_to.scale == 0:
+            raise DependencyError('Currency scale cannot be zero')
+        if rate_to.rate == 0.0:
+            raise DependencyError('Target currency rate cannot be zero')
+
+        amount_to = self._calc_amount_to(
+            Decimal(str(payload.amount_from)),
+            Decimal(str(rate_from.rate)),
+            rate_from.scale,
+            Decimal(str(rate_to.rate)),
+            rate_to.scale,
+        )
+        return ExchangeQuoteOut(
+            amount_to=float(amount_to),
+            rate_from=rate_from.rate,
+            scale_from=rate_from.scale,
+            rate_date_from=rate_from.rate_date,
+            rate_to=rate_to.rate,
+            scale_to=rate_to.scale,
+            rate_date_to=rate_to.rate_date,
+        )
+
+    @traced
+    async def convert_bulk(
+        self, session: AsyncSession, payload: BulkConvertIn
+    ) -> BulkConvertOut:
+        """Convert many amounts at once at the rates in effect on
+        `payload.rate_date` (latest known rates if omitted).
+
+        Same results as `preview` per element, without creating deals.
+        Per-currency factors are gathered once from the rate index and the
+        arithmetic runs vectorized over the whole batch.
+        """
+        count = len(payload.amount_from)
+        if len(payload.currency_from) != count or len(payload.currency_to) != count:
+            raise ValidationError(
+                'amount_from, currency_from and currency_to must be equally long'
+            )
+        if count > BULK_CONVERT_MAX_ITEMS:
+            raise ValidationError(
+                f'At most {BULK_CONVERT_MAX_ITEMS} amounts per request'
+            )
+        amounts = np.asarray(payload.amount_from, dtype=np.float64)
+        invalid = np.flatnonzero(~(amounts > 0))
+        if invalid.size:
+            raise ValidationError(
+                f'amount_from[{invalid[0]}] must be a positive number'
+            )
+
+        try:
+            await rate_index.ensure_fresh(session)
+        except Exception as e:
+            raise DependencyError(str(e)) from e
+        as_of = payload.rate_date or rate_index.last_date
+        if as_of is None:
+            raise ValidationError('No rates loaded')
+
+        codes = sorted(set(payload.currency_from) | set(payload.currency_to))
+        rates = np.empty(len(codes), dtype=np.float64)
+        scales = np.empty(len(codes), dtype=np.float64)
+        for i, code in enumerate(codes):
+            point = rate_index.as_of(code, as_of)
+            if point is None:
+                raise ValidationError(f'No {code} rate on or before {as_of}')
+            if point.scale == 0:
+                raise DependencyError('Currency scale cannot be zero')
+            if point.rate == 0.0:
+                raise DependencyError(f'{code} rate cannot be zero')
+            rates[i] = point.rate
+            scales[i] = point.scale
+
+        position = {code: i for i, code in enumerate(codes)}
+        from_idx = self._positions(payload.currency_from, position)
+        to_idx = self._positions(payload.currency_to, position)
+        amounts_to = self._calc_amounts_to(
+            amounts, rates[from_idx], scales[from_idx], rates[to_idx], scales[to_idx]
+        )
+        return BulkConvertOut.model_construct(
+            amount_to=amounts_to.tolist(), rate_date=as_of
+        )
+
+    @staticmethod
+    def _positions(codes: Sequence[str], position: dict[str, int]) -> np.ndarray:
+        return np.fromiter(
+            (position[code] for code in codes), dtype=np.intp, count=len(codes)
+        )
+
+    @traced
     async def confirm(
         self, session: AsyncSession, payload: ExchangeConfirmIn
     ) -> ExchangeConfirmOut:
@@ -140,6 +310,7 @@ class DealService:
             id=updated_model.id, status=updated_model.status
         )
 
+    @traced
     async def list_pending(
         self, session: AsyncSession
     ) -> list[PendingDealOut]:
@@ -167,6 +338,7 @@ class DealService:
             for d in deals
         ]
 
+    @traced
     async def report(
         self,
         session: AsyncSession,
@@ -178,6 +350,21 @@ class DealService:
         if date_from > date_to:
             raise ValidationError('date_from must be <= date_to')
 
+        return await _report_flight.do(
+            (date_from, date_to, currency),
+            lambda: self._report(
+                session, date_from=date_from, date_to=date_to, currency=currency
+            ),
+        )
+
+    @staticmethod
+    async def _report(
+        session: AsyncSession,
+        *,
+        date_from: datetime,
+        date_to: datetime,
+        currency: str | None,
+    ) -> list[DealReportItem]:
         try:
             in_sum, out_sum, counts = await deal_repository.sums_by_currency(
                 session, date_from=date_from, date_to=date_to, currency=currency
@@ -21,3 +21,11 @@ class ExternalServiceError(ServiceError):
 class DependencyError(ServiceError):
     """Internal dependency (DB, repository) error (HTTP 503)."""
 
+
+class OverloadedError(DependencyError):
+    """Request shed by admission control (HTTP 503 with Retry-After)."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import suppress
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+_logger = logging.getLogger(__name__)
+
+
+class AdvisoryLockLeader:
+    """Leader election across processes via a Postgres advisory lock.
+
+    The leader holds a session-level `pg_try_advisory_lock(key)` on a
+    dedicated connection. If the leader process dies its connection closes,
+    Postgres drops the lock and the next follower that retries takes over.
+    The lock connection is heartbeated; losing it demotes to follower.
+
+    Session-level advisory locks need a real server session, so the engine
+    must not go through PgBouncer in transaction pooling mode.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        key: int,
+        retry_interval: float = 30.0,
+    ) -> None:
+        self._engine = engine
+        self._key = key
+        self._interval = retry_interval
+        self._conn: AsyncConnection | None = None
+        self._task: asyncio.Task | None = None
+        self._stop_evt = asyncio.Event()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._conn is not None
+
+    async def start(self) -> None:
+        """Make one acquisition attempt, then keep retrying in background."""
+        await self._tick()
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop(), name='rates-leader')
+
+    async def stop(self) -> None:
+        self._stop_evt.set()
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        await self._release()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._stop_evt.wait(), timeout=self._interval
+                )
+                return
+            except asyncio.TimeoutError:
+                pass
+            await self._tick()
+
+    async def _tick(self) -> None:
+        try:
+            if self._conn is None:
+                await self._try_acquire()
+            else:
+                await self._heartbeat()
+        except Exception:
+            _logger.exception('Rates leader election failed')
+            await self._invalidate()
+
+    async def _try_acquire(self) -> None:
+        conn = await self._engine.connect()
+        try:
+            acquired = await conn.scalar(
+                select(func.pg_try_advisory_lock(self._key))
+            )
+            # Keep the session (and the lock), not an idle transaction
+            await conn.commit()
+        except BaseException:
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return
+        self._conn = conn
+        _logger.info('Acquired rates leadership (lock %s)', self._key)
+
+    async def _heartbeat(self) -> None:
+        assert self._conn is not None
+        await self._conn.execute(text('SELECT 1'))
+        await self._conn.commit()
+
+    async def _release(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            await conn.execute(select(func.pg_advisory_unlock(self._key)))
+            await conn.commit()
+            await conn.close()
+        except Exception:
+            # Closing the server session drops the lock as well
+            with suppress(Exception):
+                await conn.invalidate()
+                await conn.close()
+        _logger.info('Released rates leadership (lock %s)', self._key)
+
+    async def _invalidate(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            with suppress(Exception):
+                await conn.invalidate()
+                await conn.close()
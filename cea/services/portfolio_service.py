@@ -0,0 +1,95 @@
+import os
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cea.schemas.portfolio import (
+    PortfolioValueIn,
+    PortfolioValueOut,
+    PortfolioValuePoint,
+)
+from cea.services.amounts import round_half_up
+from cea.services.errors import DependencyError, ValidationError
+from cea.services.rate_index import rate_index
+from cea.tracing import traced
+
+PORTFOLIO_MAX_DATES = int(os.getenv('PORTFOLIO_MAX_DATES', '10000'))
+
+
+class PortfolioService:
+    @staticmethod
+    @traced
+    async def value(
+        session: AsyncSession, payload: PortfolioValueIn
+    ) -> PortfolioValueOut:
+        """Value `payload.holdings` in `payload.currency` on every date.
+
+        Rates for all (currency, date) pairs come from the in-memory rate
+        index as one dates x currencies block (latest rate on or before
+        each date); the totals are then a single matrix product. Each total
+        is rounded once, half up (away from zero for negative holdings) to
+        4 decimal places like deal amounts, so it can differ in the last
+        place from a sum of separately rounded per-currency conversions.
+        """
+        if not payload.holdings:
+            raise ValidationError('holdings must not be empty')
+        if not payload.dates:
+            raise ValidationError('dates must not be empty')
+        if len(payload.dates) > PORTFOLIO_MAX_DATES:
+            raise ValidationError(
+                f'At most {PORTFOLIO_MAX_DATES} dates per request'
+            )
+
+        try:
+            await rate_index.ensure_fresh(session)
+        except Exception as e:
+            raise DependencyError(str(e)) from e
+
+        held = list(payload.holdings)
+        # Target currency last: row -1 of the block
+        rates, scales = rate_index.matrix(
+            [*held, payload.currency], payload.dates
+        )
+        missing = np.argwhere(np.isnan(rates))
+        if missing.size:
+            row, col = missing[0]
+            code = payload.currency if row == len(held) else held[row]
+            raise ValidationError(
+                f'No {code} rate on or before {payload.dates[col]}'
+            )
+        if not np.all(scales):
+            raise DependencyError('Currency scale cannot be zero')
+        if not np.all(rates[-1]):
+            raise DependencyError('Target currency rate cannot be zero')
+
+        byn_per_unit = rates / scales
+        amounts = np.fromiter(
+            payload.holdings.values(), dtype=np.float64, count=len(held)
+        )
+
+        def exact(j: int) -> Decimal:
+            byn = sum(
+                Decimal(str(amount))
+                * (Decimal(str(rates[i, j])) / Decimal(int(scales[i, j])))
+                for i, amount in enumerate(amounts.tolist())
+            )
+            target = Decimal(str(rates[-1, j])) / Decimal(int(scales[-1, j]))
+            return (byn / target).quantize(
+                Decimal('0.0001'), rounding=ROUND_HALF_UP
+            )
+
+        target = byn_per_unit[-1]
+        totals = round_half_up(
+            amounts @ byn_per_unit[:-1] / target,
+            exact,
+            # Long and short holdings cancel; float error doesn't
+            np.abs(amounts) @ byn_per_unit[:-1] / target,
+        )
+        return PortfolioValueOut(
+            currency=payload.currency,
+            values=[
+                PortfolioValuePoint(date=day, value=value)
+                for day, value in zip(payload.dates, totals.tolist())
+            ],
+        )
@@ -0,0 +1,355 @@
+"""Host-wide book of the latest rate per currency, in shared memory.
+
+With `RATE_BOOK_PATH` set (a file on tmpfs, e.g. /dev/shm/cea-rate-book),
+the latest rate of every currency lives in one fixed-size mapped file that
+all workers on the host read, instead of each worker querying or caching
+its own copy. Memory stays constant as the worker count grows.
+
+The file is a versioned double buffer:
+
+    header  magic b'CEABOOK\\0', format version (u16), reserved (u16),
+            slot capacity (u32), published generation (u64)
+    slots   two, at 64 and 64 + slot size: generation (u64), payload
+            size (u32), payload CRC-32 (u32), then `capacity` bytes
+
+A writer (one at a time, under an `flock` on the file) fills the slot the
+current generation is not in, stamps it with the next generation and only
+then publishes that generation in the header. Readers never lock: they
+read the header generation, copy the payload of its slot, and retry if the
+slot's generation changed meanwhile or the CRC doesn't match (a writer
+lapped them). Each worker decodes a generation once and keeps the result.
+A worker whose book looks stale first checks that the path still names
+the file it mapped, and maps the new one if the file was recreated.
+
+The worker that runs the loader republishes right after every load that
+changed rates. A book older than `RATE_BOOK_MAX_AGE_SECONDS` (loads done
+on other hosts) is refreshed from the DB by the first worker that takes
+the lock; the others keep serving the current book meanwhile. That is one
+refresh per host rather than one per worker.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cea.db.database import async_session
+from cea.db.repositories import currency_rate_repository
+from cea.metrics import rate_book_publishes, rate_book_reads
+from cea.services.rate_loader import on_rates_changed
+from cea.services.singleflight import SingleFlight
+
+_logger = logging.getLogger(__name__)
+
+RATE_BOOK_PATH = os.getenv('RATE_BOOK_PATH', '')
+RATE_BOOK_MAX_AGE_SECONDS = float(os.getenv('RATE_BOOK_MAX_AGE_SECONDS', '60'))
+
+MAGIC = b'CEABOOK\0'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<8sHHIQ')
+_GENERATION = struct.Struct('<Q')
+_GENERATION_OFFSET = 16
+_SLOT = struct.Struct('<QII')
+_SLOT_CAPACITY = 64 * 1024
+_SLOTS_OFFSET = 64
+_SIZE = _SLOTS_OFFSET + 2 * (_SLOT.size + _SLOT_CAPACITY)
+# Reads racing more writers than this fall back to the DB
+_READ_ATTEMPTS = 8
+
+
+class RateBookError(Exception):
+    pass
+
+
+class BookRate(NamedTuple):
+    id: int
+    abbreviation: str
+    scale: int
+    rate: Decimal
+    rate_date: date
+
+
+class Book:
+    """One published generation: the latest rate of every currency."""
+
+    __slots__ = ('generation', 'rates', 'last_date', 'verified_at')
+
+    def __init__(
+        self, generation: int, rates: dict[str, BookRate], verified_at: float
+    ) -> None:
+        self.generation = generation
+        self.rates = rates
+        self.last_date = max(
+            (rate.rate_date for rate in rates.values()), default=None
+        )
+        # Wall clock: compared across processes
+        self.verified_at = verified_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.verified_at
+
+    def on_last_date(self) -> list[BookRate]:
+        """Rates dated `last_date`: what a listing of that date returns."""
+        return [
+            rate for rate in self.rates.values() if rate.rate_date == self.last_date
+        ]
+
+
+def encode(rows: Iterable[Mapping[str, Any]], verified_at: float) -> bytes:
+    """Serialize latest-rate rows (rates as exact decimal strings)."""
+    return json.dumps(
+        {
+            'verified_at': verified_at,
+            'rates': [
+                [
+                    row['id'],
+                    row['abbreviation'],
+                    row['scale'],
+                    str(row['rate']),
+                    row['rate_date'].toordinal(),
+                ]
+                for row in rows
+            ],
+        },
+        separators=(',', ':'),
+    ).encode()
+
+
+def decode(generation: int, payload: bytes) -> Book:
+    data = json.loads(payload)
+    rates = {}
+    for id_, abbreviation, scale, rate, day in data['rates']:
+        rates[abbreviation] = BookRate(
+            id_, abbreviation, scale, Decimal(rate), date.fromordinal(day)
+        )
+    return Book(generation, rates, data['verified_at'])
+
+
+def _file_id(st: os.stat_result) -> tuple[int, int, int]:
+    return st.st_dev, st.st_ino, st.st_size
+
+
+def _slot_offset(generation: int) -> int:
+    return _SLOTS_OFFSET + (generation & 1) * (_SLOT.size + _SLOT_CAPACITY)
+
+
+class SharedBook:
+    """The mapped book file: `read` is lock-free, `publish` needs `lock`."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._map: mmap.mmap | None = None
+        # (device, inode, size) of the mapped file
+        self._file_id: tuple[int, int, int] | None = None
+        self._book: Book | None = None
+
+    def _attach(self) -> mmap.mmap | None:
+        if self._map is not None:
+            return self._map
+        try:
+            with open(self.path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                if st.st_size != _SIZE:
+                    return None  # not created yet (or not ours, see publish)
+                mapped = mmap.mmap(f.fileno(), _SIZE, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        magic, fmt, _, capacity, _ = _HEADER.unpack_from(mapped)
+        if (magic, fmt, capacity) != (MAGIC, FORMAT_VERSION, _SLOT_CAPACITY):
+            mapped.close()
+            return None
+        self._map = mapped
+        self._file_id = _file_id(st)
+        return mapped
+
+    def _detach(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._map = self._file_id = self._book = None
+
+    def reattach_if_replaced(self) -> None:
+        """Drop the mapping if `path` was deleted or recreated since it was
+        mapped; the next `read` maps the current file."""
+        if self._map is None:
+            return
+        try:
+            current = _file_id(os.stat(self.path))
+        except FileNotFoundError:
+            current = None
+        if current != self._file_id:
+            self._detach()
+
+    def read(self) -> Book | None:
+        """Latest published book; None if there is none or readers keep
+        getting lapped by writers."""
+        mapped = self._attach()
+        if mapped is None:
+            return None
+        for _ in range(_READ_ATTEMPTS):
+            (generation,) = _GENERATION.unpack_from(mapped, _GENERATION_OFFSET)
+            if generation == 0:
+                return None
+            if self._book is not None and self._book.generation == generation:
+                return self._book
+            base = _slot_offset(generation)
+            stamped, size, crc = _SLOT.unpack_from(mapped, base)
+            if stamped != generation or size > _SLOT_CAPACITY:
+                continue
+            start = base + _SLOT.size
+            payload = mapped[start:start + size]
+            (stamped,) = _GENERATION.unpack_from(mapped, base)
+            if stamped != generation or zlib.crc32(payload) != crc:
+                continue
+            self._book = decode(generation, payload)
+            return self._book
+        return None
+
+    def lock(self, *, wait: bool) -> int | None:
+        """Open the file and take the writer lock; returns the descriptor
+        (closing it releases the lock) or None if another writer holds it
+        and `wait` is false."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    def publish(self, fd: int, payload: bytes) -> int:
+        """Write `payload` as the next generation; `fd` must come from
+        `lock`. Returns the published generation."""
+        if len(payload) > _SLOT_CAPACITY:
+            raise RateBookError(
+                f'Rate book of {len(payload)} bytes exceeds the slot capacity'
+            )
+        size = os.fstat(fd).st_size
+        if size not in (0, _SIZE):
+            raise RateBookError(f'{self.path}: not a rate book')
+        if size == 0:
+            os.ftruncate(fd, _SIZE)
+        with mmap.mmap(fd, _SIZE) as mapped:
+            if size == 0:
+                _HEADER.pack_into(
+                    mapped, 0, MAGIC, FORMAT_VERSION, 0, _SLOT_CAPACITY, 0
+                )
+            magic, fmt, _, capacity, current = _HEADER.unpack_from(mapped)
+            if (magic, fmt, capacity) != (MAGIC, FORMAT_VERSION, _SLOT_CAPACITY):
+                raise RateBookError(f'{self.path}: incompatible rate book')
+            generation = current + 1
+            base = _slot_offset(generation)
+            # Readers still copying the generation this slot held retry
+            _SLOT.pack_into(mapped, base, 0, 0, 0)
+            start = base + _SLOT.size
+            mapped[start:start + len(payload)] = payload
+            _SLOT.pack_into(
+                mapped, base, generation, len(payload), zlib.crc32(payload)
+            )
+            _GENERATION.pack_into(mapped, _GENERATION_OFFSET, generation)
+        if self._map is not None and _file_id(os.fstat(fd)) != self._file_id:
+            self._detach()  # published into a new file: read that one
+        return generation
+
+
+class RateBook:
+    def __init__(
+        self,
+        path: str = RATE_BOOK_PATH,
+        max_age: float = RATE_BOOK_MAX_AGE_SECONDS,
+    ) -> None:
+        self._shared = SharedBook(path) if path else None
+        self._max_age = max_age
+        self._flight: SingleFlight[Book | None] = SingleFlight('rate_book')
+        self._publishing: asyncio.Task | None = None
+        self._dirty = False
+
+    async def current(self, session: AsyncSession) -> Book | None:
+        """The host's book, refreshed from the DB by this worker first if it
+        is stale and no other worker is refreshing it. None when the book
+        is off or unavailable: callers then query the DB themselves."""
+        if self._shared is None:
+            return None
+        book = self._shared.read()
+        if book is None or book.age >= self._max_age:
+            # The file may have been deleted or recreated under our mapping
+            self._shared.reattach_if_replaced()
+            book = self._shared.read()
+        if book is not None and book.age < self._max_age:
+            rate_book_reads.labels('shared').inc()
+            return book
+        refreshed = await self._flight.do(None, lambda: self._refresh(session))
+        if refreshed is not None:
+            rate_book_reads.labels('refreshed').inc()
+            return refreshed
+        # Another worker is refreshing it: the current book is still the
+        # best this host has
+        rate_book_reads.labels('stale' if book is not None else 'fallback').inc()
+        return book
+
+    async def _refresh(self, session: AsyncSession) -> Book | None:
+        return await self._publish(session, wait=False, trigger='refresh')
+
+    async def _publish(
+        self, session: AsyncSession, *, wait: bool, trigger: str
+    ) -> Book | None:
+        """Read the latest rates and publish them, holding the writer lock
+        so that the last writer always publishes the newest rates."""
+        shared = self._shared
+        try:
+            if wait:
+                fd = await asyncio.to_thread(shared.lock, wait=True)
+            else:
+                fd = shared.lock(wait=False)
+        except OSError as e:
+            _logger.warning('Rate book %s unavailable: %s', shared.path, e)
+            return None
+        if fd is None:
+            return None
+        try:
+            rows = await currency_rate_repository.latest_rates(session)
+            shared.publish(fd, encode(rows, time.time()))
+        except (OSError, RateBookError) as e:
+            _logger.warning('Could not publish rate book %s: %s', shared.path, e)
+            return None
+        finally:
+            os.close(fd)
+        rate_book_publishes.labels(trigger).inc()
+        return shared.read()
+
+    def on_rates_changed(self, rows: list[dict[str, Any]]) -> None:
+        """Republish after a load; loads during a publish queue one more."""
+        if self._shared is None:
+            return
+        self._dirty = True
+        if self._publishing is None or self._publishing.done():
+            self._publishing = asyncio.get_running_loop().create_task(
+                self._publish_changes(), name='rate-book-publish'
+            )
+
+    async def _publish_changes(self) -> None:
+        while self._dirty:
+            self._dirty = False
+            try:
+                async with async_session() as session:
+                    await self._publish(session, wait=True, trigger='load')
+            except Exception:
+                _logger.exception('Rate book publish failed')
+
+
+rate_book = RateBook()
+on_rates_changed(rate_book.on_rates_changed)
@@ -0,0 +1,350 @@
+"""In-memory, per-currency, date-sorted rate history.
+
+Each currency keeps three parallel arrays (date ordinals, rates, scales),
+so "the rate in effect on day D" is one `bisect` instead of an
+`ORDER BY rate_date DESC LIMIT 1` query per currency per date.
+
+The index is loaded with one query on first use. In the process that runs
+the loader it is updated in place from `on_rates_changed`. Every
+`RATE_INDEX_REFRESH_SECONDS` each process compares the rate-set version
+(a counter the loader bumps with every change) with the DB and, when it
+moved, reloads the whole history (a few thousand rows), picking up loads
+done by other workers however old the dates they changed.
+
+With `RATE_SNAPSHOT_PATH` set, the index is also persisted as a binary
+snapshot (`rate_snapshot`) whenever the version changes, and a starting
+worker maps that file instead of querying: its series read straight from
+the shared pages until a load writes to them. The first refresh checks
+the snapshot's version against the DB and reloads everything if it is
+stale.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Any, Iterable, Mapping, NamedTuple, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cea.db.database import async_session
+from cea.db.repositories import currency_rate_repository
+from cea.services.rate_loader import on_rates_changed
+from cea.services.rate_snapshot import (
+    RateSnapshot,
+    SnapshotError,
+    encode,
+    read_version,
+    write,
+)
+from cea.services.singleflight import SingleFlight
+
+_logger = logging.getLogger(__name__)
+
+RATE_INDEX_REFRESH_SECONDS = float(
+    os.getenv('RATE_INDEX_REFRESH_SECONDS', '60')
+)
+RATE_SNAPSHOT_PATH = os.getenv('RATE_SNAPSHOT_PATH', '')
+
+
+class RatePoint(NamedTuple):
+    rate_date: date
+    scale: int
+    rate: float
+
+
+class RateSeries:
+    """Rates of one currency, ascending by date."""
+
+    __slots__ = ('days', 'rates', 'scales')
+
+    def __init__(self) -> None:
+        self.days = array('q')  # date.toordinal()
+        self.rates = array('d')
+        self.scales = array('q')
+
+    @classmethod
+    def from_buffers(
+        cls, days: memoryview, rates: memoryview, scales: memoryview
+    ) -> 'RateSeries':
+        """Read-only series over snapshot columns; copied on first write."""
+        series = cls.__new__(cls)
+        series.days, series.rates, series.scales = days, rates, scales
+        return series
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _own(self) -> None:
+        if isinstance(self.days, memoryview):
+            self.days = array('q', self.days)
+            self.rates = array('d', self.rates)
+            self.scales = array('q', self.scales)
+
+    def put(self, day: int, scale: int, rate: float) -> None:
+        self._own()
+        if not self.days or day > self.days[-1]:
+            # Loads arrive in date order: append without searching
+            self.days.append(day)
+            self.rates.append(rate)
+            self.scales.append(scale)
+            return
+        i = bisect_left(self.days, day)
+        if i < len(self.days) and self.days[i] == day:
+            self.rates[i] = rate
+            self.scales[i] = scale
+        else:
+            self.days.insert(i, day)
+            self.rates.insert(i, rate)
+            self.scales.insert(i, scale)
+
+    def as_of(self, day: int) -> int:
+        """Position of the last rate on or before `day`, -1 if none."""
+        return bisect_right(self.days, day) - 1
+
+    def columns(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Zero-copy NumPy views of (days, rates, scales).
+
+        The arrays cannot grow while a view is alive, so use them within
+        one synchronous computation and don't keep them around.
+        """
+        return (
+            np.frombuffer(self.days, dtype=np.dtype(f'i{self.days.itemsize}')),
+            np.frombuffer(self.rates, dtype=np.float64),
+            np.frombuffer(self.scales, dtype=np.dtype(f'i{self.scales.itemsize}')),
+        )
+
+
+def _merge(
+    series: dict[str, RateSeries],
+    last_date: date | None,
+    rows: Iterable[Mapping[str, Any]],
+) -> date | None:
+    """Put rows into `series`; returns the newest date seen."""
+    for row in rows:
+        target = series.get(row['abbreviation'])
+        if target is None:
+            target = series[row['abbreviation']] = RateSeries()
+        target.put(row['rate_date'].toordinal(), row['scale'], float(row['rate']))
+        if last_date is None or row['rate_date'] > last_date:
+            last_date = row['rate_date']
+    return last_date
+
+
+class RateIndex:
+    def __init__(self) -> None:
+        self.series: dict[str, RateSeries] = {}
+        self.last_date: date | None = None
+        # DB rate-set version the series were last reconciled with
+        self.version: int | None = None
+        self._refreshed_at: float | None = None
+        self._flight: SingleFlight[None] = SingleFlight('rate_index')
+        self._snapshot: RateSnapshot | None = None
+        self._snapshot_version: int | None = None
+        self._pending_refresh: asyncio.Task | None = None
+
+    def apply(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Insert or replace (abbreviation, rate_date, scale, rate) rows."""
+        self.last_date = _merge(self.series, self.last_date, rows)
+
+    def load_snapshot(self, path: str = RATE_SNAPSHOT_PATH) -> bool:
+        """Map a snapshot file written by any worker; True if loaded."""
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            snapshot = RateSnapshot(path)
+        except (OSError, ValueError, SnapshotError) as e:
+            _logger.warning('Ignoring rate snapshot %s: %s', path, e)
+            return False
+        self.series = {
+            code: RateSeries.from_buffers(days, rates, scales)
+            for code, days, rates, scales in snapshot
+        }
+        self.last_date = max(
+            (date.fromordinal(s.days[-1]) for s in self.series.values() if s),
+            default=None,
+        )
+        self.version = self._snapshot_version = snapshot.version
+        self._snapshot = snapshot  # the series views point into its mapping
+        self._refreshed_at = time.monotonic()
+        _logger.info(
+            'Mapped rate snapshot %s (%d currencies, version %s)',
+            path,
+            len(self.series),
+            snapshot.version,
+        )
+        return True
+
+    async def ensure_fresh(self, session: AsyncSession) -> None:
+        refreshed_at = self._refreshed_at
+        if (
+            refreshed_at is not None
+            and time.monotonic() - refreshed_at < RATE_INDEX_REFRESH_SECONDS
+        ):
+            return
+        await self._flight.do(None, lambda: self._refresh(session))
+
+    async def _refresh(self, session: AsyncSession) -> None:
+        version = await currency_rate_repository.rate_set_version(session)
+        if version != self.version:
+            # A change may touch any date (catch-up, backfills, corrections):
+            # reload everything. Rows are read after the version: if a load
+            # commits in between, they are newer than `version` and the next
+            # refresh reloads again. Built aside and swapped in at once, so
+            # readers never see a partial index.
+            series: dict[str, RateSeries] = {}
+            rows = await currency_rate_repository.history(
+                session, date_from=date.min
+            )
+            self.series, self.last_date = series, _merge(series, None, rows)
+        self.version = version
+        self._refreshed_at = time.monotonic()
+        if RATE_SNAPSHOT_PATH and version != self._snapshot_version:
+            await self._save_snapshot(version)
+
+    async def _save_snapshot(self, version: int) -> None:
+        # Another worker on this host may have written it already
+        if await asyncio.to_thread(read_version, RATE_SNAPSHOT_PATH) == version:
+            self._snapshot_version = version
+            return
+        # Encoded here, so a concurrent apply() cannot change it half-way
+        data = encode(
+            {
+                code: (series.days, series.rates, series.scales)
+                for code, series in self.series.items()
+            },
+            version,
+        )
+        try:
+            await asyncio.to_thread(write, RATE_SNAPSHOT_PATH, data)
+        except OSError:
+            _logger.exception('Could not write rate snapshot')
+            return
+        self._snapshot_version = version
+
+    def on_rates_changed(self, rows: list[dict[str, Any]]) -> None:
+        """Apply a load's changes; with snapshots on, also reconcile with
+        the DB and rewrite the snapshot right away."""
+        self.apply(rows)
+        if not RATE_SNAPSHOT_PATH or (
+            self._pending_refresh is not None and not self._pending_refresh.done()
+        ):
+            return
+        self._refreshed_at = None
+        self._pending_refresh = asyncio.get_running_loop().create_task(
+            self._refresh_now(), name='rate-index-refresh'
+        )
+
+    async def _refresh_now(self) -> None:
+        try:
+            async with async_session() as session:
+                await self.ensure_fresh(session)
+        except Exception:
+            _logger.exception('Rate index refresh failed')
+
+    def as_of(self, abbreviation: str, day: date) -> RatePoint | None:
+        """Rate of `abbreviation` in effect on `day` (latest on or before)."""
+        series = self.series.get(abbreviation)
+        if series is None:
+            return None
+        i = series.as_of(day.toordinal())
+        if i < 0:
+            return None
+        return RatePoint(
+            date.fromordinal(series.days[i]), series.scales[i], series.rates[i]
+        )
+
+    def window_stats(
+        self, abbreviation: str, day: date, windows: Sequence[int]
+    ) -> dict[str, Any] | None:
+        """Trailing-window statistics of `abbreviation` as of `day`.
+
+        Computed vectorized over the series arrays, per unit of currency
+        (rate / scale, so scale changes don't show up as jumps). Only the
+        longest window plus one preceding rate is sliced out. None if the
+        currency has no rate on or before `day`.
+        """
+        series = self.series.get(abbreviation)
+        if not series:
+            return None
+        days, rates, scales = series.columns()
+        end = int(np.searchsorted(days, day.toordinal(), side='right'))
+        if end == 0:
+            return None
+        last_day = int(days[end - 1])
+        # One extra rate before the longest window for its first return
+        lo = max(
+            int(np.searchsorted(days, last_day - max(windows), side='right')) - 1,
+            0,
+        )
+        window_days = days[lo:end]
+        values = rates[lo:end] / scales[lo:end]
+        returns = values[1:] / values[:-1] - 1.0
+
+        stats = []
+        for length in windows:
+            start = int(
+                np.searchsorted(window_days, last_day - length, side='right')
+            )
+            window = values[start:]
+            # Returns into each day of the window (needs a previous rate)
+            window_returns = returns[max(start - 1, 0):]
+            stats.append({
+                'days': length,
+                'observations': int(window.size),
+                'min': float(window.min()),
+                'max': float(window.max()),
+                'mean': float(window.mean()),
+                'change': (
+                    float(values[-1] / values[start - 1] - 1.0)
+                    if start > 0
+                    else None
+                ),
+                'mean_daily_return': (
+                    float(window_returns.mean()) if window_returns.size else None
+                ),
+                'volatility': (
+                    float(window_returns.std(ddof=1))
+                    if window_returns.size > 1
+                    else None
+                ),
+            })
+        return {
+            'abbreviation': abbreviation,
+            'rate_date': date.fromordinal(last_day),
+            'rate': float(values[-1]),
+            'daily_return': float(returns[-1]) if returns.size else None,
+            'windows': stats,
+        }
+
+    def matrix(
+        self, codes: Sequence[str], days: Sequence[date]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rates and scales in effect for every (currency, day) pair.
+
+        Both have shape (len(codes), len(days)); the rate is NaN where a
+        currency has no rate on or before the day.
+        """
+        ordinals = np.fromiter(
+            (day.toordinal() for day in days), dtype=np.int64, count=len(days)
+        )
+        rates = np.full((len(codes), len(days)), np.nan)
+        scales = np.ones((len(codes), len(days)))
+        for i, code in enumerate(codes):
+            series = self.series.get(code)
+            if not series:
+                continue
+            known_days, known_rates, known_scales = series.columns()
+            pos = np.searchsorted(known_days, ordinals, side='right') - 1
+            found = pos >= 0
+            rates[i, found] = known_rates[pos[found]]
+            scales[i, found] = known_scales[pos[found]]
+        return rates, scales
+
+
+rate_index = RateIndex()
+on_rates_changed(rate_index.on_rates_changed)
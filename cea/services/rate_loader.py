@@ -1,17 +1,67 @@
+import logging
 from datetime import date, datetime
-from typing import Any
+from typing import Any, Callable
 
+from sqlalchemy import literal_column, tuple_
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from cea.clients.nbrb import NBRBClient
+from cea.clients.providers import RateProvider, build_rate_provider
 from cea.db.models.currency_rate import CurrencyRate
+from cea.db.repositories import currency_rate_repository
 from cea.services.errors import ExternalServiceError
+from cea.tracing import traced
+
+_logger = logging.getLogger(__name__)
+
+# Called with the inserted/updated rows after a load that changed something
+RatesListener = Callable[[list[dict[str, Any]]], None]
+_listeners: list[RatesListener] = []
+_CHANGE_KEYS = ('abbreviation', 'scale', 'rate', 'rate_date')
+
+
+def on_rates_changed(listener: RatesListener) -> RatesListener:
+    """Register `listener` to invalidate/refresh caches on rate changes."""
+    _listeners.append(listener)
+    return listener
+
+
+def _notify(changed: list[dict[str, Any]]) -> None:
+    for listener in _listeners:
+        try:
+            listener(changed)
+        except Exception:
+            _logger.exception('Rates listener %r failed', listener)
+
+
+class RateUpsertResult:
+    __slots__ = ('inserted', 'updated', 'unchanged')
+
+    def __init__(
+        self, inserted: int = 0, updated: int = 0, unchanged: int = 0
+    ) -> None:
+        self.inserted = inserted
+        self.updated = updated
+        self.unchanged = unchanged
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated
+
+    @property
+    def total(self) -> int:
+        return self.changed + self.unchanged
+
+    def __repr__(self) -> str:
+        return (
+            f'RateUpsertResult(inserted={self.inserted}, '
+            f'updated={self.updated}, unchanged={self.unchanged})'
+        )
 
 
 class RateLoaderService:
-    def __init__(self, client: NBRBClient | None = None) -> None:
-        self.client = client or NBRBClient()
+    def __init__(self, client: RateProvider | None = None) -> None:
+        self.client = client or build_rate_provider()
 
     @staticmethod
     def _map_nbrb_item(item: dict[str, Any]) -> dict[str, Any]:
@@ -32,21 +82,25 @@ class RateLoaderService:
             'rate_date': dt.date(),
         }
 
+    @traced
     async def fetch_and_upsert_for_date(
         self, session: AsyncSession, *, ondate: date | None = None
-    ) -> int:
-        """Fetch rates and upsert into currency_rates. Returns affected rows count."""
+    ) -> RateUpsertResult:
+        """Fetch rates and upsert into currency_rates, writing only rows that
+        are new or differ from the stored ones."""
         try:
             items = await self.client.get_daily_rates(ondate)
         except Exception as e:
             # Normalize any client exception to service-layer error
             raise ExternalServiceError(str(e)) from e
         if not items:
-            return 0
+            return RateUpsertResult()
 
         rows = [self._map_nbrb_item(it) for it in items]
         stmt = insert(CurrencyRate).values(rows)
-        # Unique constraint on (rate_date, abbreviation)
+        # Unique constraint on (rate_date, abbreviation). Identical rows are
+        # skipped by the WHERE (no dead tuple, no WAL) and not returned;
+        # xmax = 0 tells a fresh insert from an update.
         stmt = stmt.on_conflict_do_update(
             index_elements=[
                 CurrencyRate.rate_date, CurrencyRate.abbreviation
@@ -55,7 +109,30 @@ class RateLoaderService:
                 'scale': stmt.excluded.scale,
                 'rate': stmt.excluded.rate,
             },
+            where=tuple_(CurrencyRate.scale, CurrencyRate.rate).is_distinct_from(
+                tuple_(stmt.excluded.scale, stmt.excluded.rate)
+            ),
+        ).returning(
+            CurrencyRate.abbreviation,
+            CurrencyRate.scale,
+            CurrencyRate.rate,
+            CurrencyRate.rate_date,
+            (literal_column('xmax') == 0).label('inserted'),
         )
-        await session.execute(stmt)
+        changed = (await session.execute(stmt)).mappings().all()
+        if changed:
+            await currency_rate_repository.bump_rate_set_version(session)
         await session.commit()
-        return len(rows)
+
+        inserted = sum(1 for row in changed if row['inserted'])
+        result = RateUpsertResult(
+            inserted=inserted,
+            updated=len(changed) - inserted,
+            unchanged=len(rows) - len(changed),
+        )
+        _logger.info('Rates for %s: %r', ondate or 'today', result)
+        if changed:
+            _notify([
+                {key: row[key] for key in _CHANGE_KEYS} for row in changed
+            ])
+        return result
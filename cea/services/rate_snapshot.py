@@ -0,0 +1,129 @@
+"""Binary, memory-mappable snapshot of the rate history.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    header     magic b'CEARATES', format version (u16), reserved (u16),
+               currency count (u32), rate-set version (u64), written at
+               (f64, unix time)
+    directory  per currency: abbreviation (8 bytes, NUL padded), rate
+               count (u64), byte offset of its block (u64)
+    blocks     per currency, three fixed-width columns of `count` items:
+               date ordinals (i64), rates (f64), scales (i64)
+
+Abbreviations are stored once in the directory (and interned on read);
+the columns are read in place as `memoryview`s over the shared mapping,
+so every worker on a host uses the same page cache pages. The rate-set
+version ties the file to the `currency_rates` state it was written from.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from contextlib import suppress
+from typing import Iterator, Mapping, Sequence
+
+MAGIC = b'CEARATES'
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct('<8sHHIQd')
+_ENTRY = struct.Struct('<8sQQ')
+_ITEM = 8  # bytes per column item
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def encode(series: Mapping[str, Sequence[Sequence]], version: int) -> bytes:
+    """Serialize {abbreviation: (days, rates, scales)} arrays."""
+    codes = sorted(series)
+    offset = _HEADER.size + _ENTRY.size * len(codes)
+    directory = []
+    blocks = []
+    for code in codes:
+        days, rates, scales = series[code]
+        directory.append(_ENTRY.pack(code.encode('ascii'), len(days), offset))
+        for column, fmt in ((days, 'q'), (rates, 'd'), (scales, 'q')):
+            block = struct.pack(f'<{len(column)}{fmt}', *column)
+            blocks.append(block)
+            offset += len(block)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(codes), version, time.time())
+    return b''.join([header, *directory, *blocks])
+
+
+def write(path: str, data: bytes) -> None:
+    """Atomically replace `path`: readers keep their old mapping."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.rates-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; workers may differ
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def read_version(path: str) -> int | None:
+    """Rate-set version in the header of `path`, None if unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+        magic, fmt, _, _, version, _ = _HEADER.unpack(header)
+    except (OSError, struct.error):
+        return None
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        return None
+    return version
+
+
+class RateSnapshot:
+    """A mapped snapshot file; keep it alive as long as its views are used."""
+
+    def __init__(self, path: str) -> None:
+        if sys.byteorder != 'little':
+            # Columns are read in place as native integers/floats
+            raise SnapshotError('Rate snapshots need a little-endian host')
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if len(view) < _HEADER.size:
+            raise SnapshotError(f'{path}: truncated header')
+        magic, fmt, _, count, version, written_at = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise SnapshotError(f'{path}: not a rate snapshot')
+        if fmt != FORMAT_VERSION:
+            raise SnapshotError(f'{path}: unsupported format version {fmt}')
+        self.path = path
+        self.version = version
+        self.written_at = written_at
+        self._view = view
+        self._entries = []
+        for i in range(count):
+            code, n, offset = _ENTRY.unpack_from(
+                view, _HEADER.size + i * _ENTRY.size
+            )
+            if offset + 3 * _ITEM * n > len(view):
+                raise SnapshotError(f'{path}: truncated data')
+            self._entries.append(
+                (sys.intern(code.rstrip(b'\0').decode('ascii')), n, offset)
+            )
+
+    def __iter__(
+        self,
+    ) -> Iterator[tuple[str, memoryview, memoryview, memoryview]]:
+        """(abbreviation, days, rates, scales) with zero-copy column views."""
+        for code, n, offset in self._entries:
+            size = _ITEM * n
+            yield (
+                code,
+                self._view[offset:offset + size].cast('q'),
+                self._view[offset + size:offset + 2 * size].cast('d'),
+                self._view[offset + 2 * size:offset + 3 * size].cast('q'),
+            )
@@ -0,0 +1,38 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cea.services.currency_rate_service import CurrencyRateService
+
+
+class RatesReadiness:
+    """Whether this worker can serve rate-dependent requests.
+
+    Ready once the warm-up phase has finished and a rate snapshot is known
+    to exist: either a load in this process succeeded, or the database
+    already holds rates (for example yesterday's, while today's load is
+    still running or failing). Stays ready afterwards, so a readiness
+    probe costs at most one cheap query until the first success.
+    """
+
+    def __init__(self) -> None:
+        self._warm = False
+        self._ready = False
+
+    @property
+    def is_ready(self) -> bool:
+        return self._warm and self._ready
+
+    def mark_warm(self) -> None:
+        self._warm = True
+
+    def mark_ready(self) -> None:
+        self._ready = True
+
+    async def check(self, session: AsyncSession) -> bool:
+        if not self._warm:
+            return False
+        if not self._ready:
+            self._ready = await CurrencyRateService.has_snapshot(session)
+        return self._ready
+
+
+rates_readiness: RatesReadiness = RatesReadiness()
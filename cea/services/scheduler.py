@@ -2,15 +2,23 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 from contextlib import suppress
 from datetime import date, datetime, time, timedelta, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from cea.db.repositories import currency_rate_repository
+from cea.metrics import rates_catchup_days, record_scheduler_run
+from cea.services.leader import AdvisoryLockLeader
 from cea.services.rate_loader import RateLoaderService
 
 _logger = logging.getLogger(__name__)
 
+# Catch-up retry backoff: full jitter over base * 2**attempt, capped
+_BACKOFF_BASE = 2.0
+_BACKOFF_CAP = 60.0
+
 
 def _parse_time_utc(hhmm: str) -> time:
     hh, mm = hhmm.split(":", 1)
@@ -27,24 +35,57 @@ def _next_run(now: datetime, at_utc: time) -> datetime:
     return today_run + timedelta(days=1)
 
 
+def _jittered(at: datetime, jitter: float) -> datetime:
+    """Spread a fleet's runs over `jitter` seconds after `at`."""
+    if jitter <= 0:
+        return at
+    return at + timedelta(seconds=random.uniform(0, jitter))
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt))
+
+
 class DailyRatesScheduler:
+    """Load today's rates once a day and fill gaps in recent history.
+
+    The daily run starts at `run_time_utc` plus a random delay of up to
+    `jitter` seconds. On start and after each run, dates of the last
+    `catchup_days` days without any rate are found with one query and
+    loaded `catchup_concurrency` at a time, each retried up to `retries`
+    times with jittered exponential backoff.
+    """
+
     def __init__(
         self,
         session_factory: async_sessionmaker[AsyncSession],
         loader: RateLoaderService,
         run_time_utc: time,
+        leader: AdvisoryLockLeader | None = None,
+        *,
+        jitter: float = 0.0,
+        catchup_days: int = 30,
+        catchup_concurrency: int = 4,
+        retries: int = 3,
     ) -> None:
         self._sf = session_factory
         self._loader = loader
         self._at = run_time_utc
+        self._leader = leader
+        self._jitter = jitter
+        self._catchup_days = catchup_days
+        self._catchup_slots = asyncio.Semaphore(catchup_concurrency)
+        self._retries = retries
         self._task: asyncio.Task | None = None
         self._stop_evt = asyncio.Event()
 
-    def start(self) -> None:
+    def start(self, after: asyncio.Future | None = None) -> None:
+        """Start the loop; the first catch-up waits for `after` (e.g. the
+        startup task, which elects the leader) to finish."""
         if self._task and not self._task.done():
             return
         self._task = asyncio.create_task(
-            self._loop(), name='daily-rates-scheduler'
+            self._loop(after), name='daily-rates-scheduler'
         )
 
     async def stop(self) -> None:
@@ -54,10 +95,72 @@ class DailyRatesScheduler:
             with suppress(asyncio.CancelledError):
                 await self._task
 
-    async def _loop(self) -> None:
+    def _is_leader(self) -> bool:
+        return self._leader is None or self._leader.is_leader
+
+    async def catch_up(self) -> int:
+        """Load rates for recent dates that have none; returns days filled."""
+        if self._catchup_days <= 0 or not self._is_leader():
+            return 0
+        today = date.today()
+        try:
+            async with self._sf() as session:
+                missing = await currency_rate_repository.missing_dates(
+                    session,
+                    date_from=today - timedelta(days=self._catchup_days - 1),
+                    date_to=today,
+                )
+        except Exception:
+            _logger.exception('Rates gap detection failed')
+            return 0
+        if not missing:
+            return 0
+
+        _logger.info(
+            'Catching up rates for %d missing dates (%s .. %s)',
+            len(missing),
+            missing[0],
+            missing[-1],
+        )
+        filled = await asyncio.gather(*(self._load_day(day) for day in missing))
+        failed = [day for day, ok in zip(missing, filled) if not ok]
+        if failed:
+            _logger.warning('Rates still missing for %s', ', '.join(map(str, failed)))
+        return len(missing) - len(failed)
+
+    async def _load_day(self, day: date) -> bool:
+        for attempt in range(self._retries + 1):
+            if attempt:
+                await asyncio.sleep(_backoff(attempt - 1))
+            async with self._catchup_slots:
+                try:
+                    async with self._sf() as session:
+                        result = await self._loader.fetch_and_upsert_for_date(
+                            session, ondate=day
+                        )
+                except Exception as e:
+                    _logger.warning(
+                        'Rates load for %s failed (attempt %d of %d): %s',
+                        day,
+                        attempt + 1,
+                        self._retries + 1,
+                        e,
+                    )
+                    continue
+            # No rates published for the day is not worth retrying
+            outcome = 'filled' if result.total else 'empty'
+            rates_catchup_days.labels(outcome).inc()
+            return bool(result.total)
+        rates_catchup_days.labels('failed').inc()
+        return False
+
+    async def _loop(self, after: asyncio.Future | None = None) -> None:
+        if after is not None:
+            await asyncio.wait([after])
+        await self.catch_up()
         while True:
             now = datetime.now(timezone.utc)
-            nxt = _next_run(now, self._at)
+            nxt = _jittered(_next_run(now, self._at), self._jitter)
             delay = (nxt - now).total_seconds()
             _logger.info(
                 'Next daily rates load scheduled at %s UTC', nxt.isoformat()
@@ -68,11 +171,18 @@ class DailyRatesScheduler:
                 return
             except asyncio.TimeoutError:
                 pass
+            if self._leader is not None and not self._leader.is_leader:
+                _logger.info('Not the rates leader, skipping daily load')
+                record_scheduler_run('skipped')
+                continue
             try:
                 async with self._sf() as session:
-                    await self._loader.fetch_and_upsert_for_date(
+                    result = await self._loader.fetch_and_upsert_for_date(
                         session, ondate=date.today()
                     )
-                _logger.info('Daily rates loaded successfully')
+                _logger.info('Daily rates loaded successfully: %r', result)
+                record_scheduler_run('success', result.changed)
             except Exception:
                 _logger.exception('Daily rates load failed')
+                record_scheduler_run('failure')
+            await self.catch_up()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from cea.metrics import singleflight_calls
+
+SINGLEFLIGHT_ENABLED = (
+    os.getenv('SINGLEFLIGHT_ENABLED', 'true').strip().lower() == 'true'
+)
+
+T = TypeVar('T')
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent identical calls into one in-flight computation.
+
+    The first caller for a key (the leader) runs the computation on its own
+    session; callers arriving with the same key while it runs await the
+    leader's result instead of repeating the work. The result object is
+    shared, so callers must treat it as read-only. Errors are shared too.
+    If the leader is cancelled (e.g. its client went away) the waiting
+    callers retry, one of them becoming the new leader.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._flights: dict[Hashable, asyncio.Future[T]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        if not SINGLEFLIGHT_ENABLED:
+            return await fn()
+
+        while (flight := self._flights.get(key)) is not None:
+            # Raises only if this caller is cancelled; never cancels `flight`
+            await asyncio.wait((flight,))
+            if flight.cancelled():
+                continue  # the leader was: retry, maybe leading this time
+            # Counted once the role is settled: a retrying caller counts once
+            singleflight_calls.labels(self.name, 'coalesced').inc()
+            return flight.result()
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        singleflight_calls.labels(self.name, 'leader').inc()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception()  # retrieved: don't warn if nobody waited
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
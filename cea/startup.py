@@ -0,0 +1,132 @@
+"""Startup profiling: import time per module and time per lifespan phase.
+
+Enabled with `STARTUP_PROFILE=true`. The variable has to be present in the
+process environment before `cea` is imported (`run.py` loads `.env` early
+enough; with plain uvicorn export it). The report is logged once the
+background startup phases have finished.
+"""
+
+import builtins
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+_logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.started_at = time.perf_counter()
+        # module -> (self seconds, cumulative seconds)
+        self.imports: dict[str, tuple[float, float]] = {}
+        self.phases: dict[str, float] = {}
+        self._stack: list[float] = []
+        self._original_import: Any = None
+
+    def start(self) -> None:
+        """Begin timing imports of modules not loaded yet."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started_at = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop_imports(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(
+        self,
+        name: str,
+        globals: Any = None,
+        locals: Any = None,
+        fromlist: Any = (),
+        level: int = 0,
+    ) -> Any:
+        absolute = _absolute_name(name, globals, level)
+        if absolute is None:
+            return self._original_import(name, globals, locals, fromlist, level)
+        if absolute not in sys.modules:
+            candidates = [absolute]
+        else:
+            # `from package import submodule` may still load something
+            candidates = [
+                f'{absolute}.{item}'
+                for item in fromlist or ()
+                if item != '*' and f'{absolute}.{item}' not in sys.modules
+            ]
+            if not candidates:
+                return self._original_import(
+                    name, globals, locals, fromlist, level
+                )
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            for module in candidates:
+                if module in sys.modules:
+                    self.imports.setdefault(module, (elapsed - children, elapsed))
+                    break
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    def mark(self, name: str) -> None:
+        """Record the time elapsed since profiling started."""
+        self.phases[name] = time.perf_counter() - self.started_at
+
+    def report(self, top: int = 25) -> None:
+        if not self.enabled:
+            return
+        self.stop_imports()
+        total_imports = sum(own for own, _ in self.imports.values())
+        lines = [
+            f'Startup profile: {len(self.imports)} modules imported '
+            f'in {total_imports * 1e3:.1f} ms'
+        ]
+        slowest = sorted(
+            self.imports.items(), key=lambda kv: kv[1][0], reverse=True
+        )
+        for module, (own, cumulative) in slowest[:top]:
+            lines.append(
+                f'  import {module:<45} self {own * 1e3:8.2f} ms'
+                f'  cumulative {cumulative * 1e3:8.2f} ms'
+            )
+        for phase, seconds in self.phases.items():
+            lines.append(f'  phase  {phase:<45} {seconds * 1e3:8.2f} ms')
+        _logger.info('\n'.join(lines))
+
+
+def _absolute_name(name: str, globals: Any, level: int) -> str | None:
+    if not level:
+        return name
+    package = (globals or {}).get('__package__')
+    if not package:
+        return None
+    bits = package.rsplit('.', level - 1)
+    if len(bits) < level:
+        return None
+    return f'{bits[0]}.{name}' if name else bits[0]
+
+
+profiler = StartupProfiler()
+
+if os.getenv('STARTUP_PROFILE', 'false').strip().lower() == 'true':
+    profiler.start()
@@ -0,0 +1,198 @@
+"""OpenTelemetry tracing of the request path.
+
+Spans: the HTTP route (`TracingMiddleware`), service and repository
+methods (`@traced`), pool checkouts (session acquisition) and NBRB
+requests. Nothing is recorded until `setup_tracing()` installs a provider;
+until then `@traced` is a plain pass-through.
+
+Exporters (`TRACING_EXPORTER`):
+- `none` (default) — tracing off.
+- `console` — JSON spans on stdout.
+- `file` — one JSON span per line appended to `TRACING_FILE`.
+- `otlp` — OTLP/HTTP to a collector (`OTEL_EXPORTER_OTLP_ENDPOINT`);
+  needs `opentelemetry-exporter-otlp-proto-http`.
+
+Tests pass an exporter directly, which is then called synchronously:
+
+    exporter = InMemorySpanExporter()
+    setup_tracing(exporter)
+"""
+
+import functools
+import os
+import sys
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+from opentelemetry import trace
+from opentelemetry.propagate import extract
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+TRACING_EXPORTER = os.getenv('TRACING_EXPORTER', 'none').strip().lower()
+TRACING_FILE = os.getenv('TRACING_FILE', 'traces.jsonl')
+TRACING_SAMPLE_RATIO = float(os.getenv('TRACING_SAMPLE_RATIO', '1.0'))
+
+F = TypeVar('F', bound=Callable[..., Awaitable[Any]])
+
+_tracer: trace.Tracer = trace.NoOpTracer()
+_provider: Any = None
+# Output of the `file` exporter, closed by shutdown_tracing()
+_trace_file: Any = None
+
+
+def setup_tracing(exporter: Any = None) -> bool:
+    """Install a tracer provider; returns whether tracing is on.
+
+    With `exporter` (e.g. `InMemorySpanExporter`) spans are exported
+    synchronously on end; otherwise `TRACING_EXPORTER` decides and spans
+    are batched in the background.
+    """
+    global _tracer, _provider
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SimpleSpanProcessor,
+    )
+    from opentelemetry.sdk.trace.sampling import (
+        ParentBased,
+        TraceIdRatioBased,
+    )
+
+    # Before configuring the new exporter: this closes the old trace file
+    shutdown_tracing()
+    if exporter is not None:
+        processor = SimpleSpanProcessor(exporter)
+    else:
+        configured = _configured_exporter()
+        if configured is None:
+            return False
+        processor = BatchSpanProcessor(configured)
+
+    _provider = TracerProvider(
+        resource=Resource.create({'service.name': 'cea'}),
+        sampler=ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATIO)),
+    )
+    _provider.add_span_processor(processor)
+    _tracer = _provider.get_tracer('cea')
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and turn tracing off."""
+    global _tracer, _provider, _trace_file
+    if _provider is not None:
+        _provider.shutdown()
+    if _trace_file is not None:
+        _trace_file.close()
+    _provider = None
+    _trace_file = None
+    _tracer = trace.NoOpTracer()
+
+
+def _configured_exporter() -> Any:
+    global _trace_file
+    if TRACING_EXPORTER == 'none':
+        return None
+    if TRACING_EXPORTER == 'console':
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter(
+            out=sys.stdout, formatter=lambda span: span.to_json(indent=None) + '\n'
+        )
+    if TRACING_EXPORTER == 'file':
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        _trace_file = open(TRACING_FILE, 'a', encoding='utf-8')
+        return ConsoleSpanExporter(
+            out=_trace_file,
+            formatter=lambda span: span.to_json(indent=None) + '\n',
+        )
+    if TRACING_EXPORTER == 'otlp':
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter()
+    raise ValueError(f'Unknown TRACING_EXPORTER: {TRACING_EXPORTER}')
+
+
+def enabled() -> bool:
+    return _provider is not None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[trace.Span | None]:
+    """Synchronous span, e.g. around code running in SQLAlchemy's greenlet."""
+    if _provider is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as s:
+        yield s
+
+
+def traced(fn: F) -> F:
+    """Run the coroutine method `fn` in a `<Class>.<method>` span."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _provider is None:
+            return await fn(*args, **kwargs)
+        with _tracer.start_as_current_span(_span_name(fn, args)):
+            return await fn(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _span_name(fn: Callable[..., Any], args: tuple[Any, ...]) -> str:
+    # Name inherited methods after the concrete class (e.g. which repository)
+    if args and hasattr(type(args[0]), fn.__name__):
+        return f'{type(args[0]).__name__}.{fn.__name__}'
+    return fn.__qualname__
+
+
+class TracingMiddleware:
+    """Server span per request, named `<METHOD> <route template>`.
+
+    Continues an incoming W3C `traceparent` if present.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or _provider is None:
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {
+            key.decode('latin-1'): value.decode('latin-1')
+            for key, value in scope.get('headers', ())
+        }
+        with _tracer.start_as_current_span(
+            f'{scope["method"]} {scope["path"]}',
+            context=extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={
+                'http.request.method': scope['method'],
+                'url.path': scope['path'],
+            },
+        ) as server_span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    status = message['status']
+                    server_span.set_attribute('http.response.status_code', status)
+                    if status >= 500:
+                        server_span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get('route'), 'path', None)
+                if route is not None:
+                    server_span.set_attribute('http.route', route)
+                    server_span.update_name(f'{scope["method"]} {route}')
@@ -0,0 +1,41 @@
+"""Warm-up phase run once per worker before it reports ready.
+
+Executes every hot repository statement once with parameters that match
+nothing, so the statement cache, SQLAlchemy's compiled cache, asyncpg's
+prepared statements and the first pool connection are all in place before
+the first real request. Also builds the TypeAdapters used for responses.
+"""
+
+import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from cea.api.responses import adapter_for
+from cea.db.repositories import currency_rate_repository, deal_repository
+from cea.schemas.currency import CurrencyRateOut
+from cea.schemas.deal import DealReportItem, PendingDealOut
+
+_NIL_UUID = '00000000-0000-0000-0000-000000000000'
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def warm_up_serializers() -> None:
+    for tp in (list[CurrencyRateOut], list[PendingDealOut], list[DealReportItem]):
+        adapter_for(tp).dump_json([])
+
+
+async def warm_up_statements(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        await currency_rate_repository.exists_any(session)
+        await currency_rate_repository.list_by_date(
+            session, rate_date=datetime.date.min
+        )
+        await currency_rate_repository.get_latest_by_abbreviation(session, '')
+        await currency_rate_repository.latest_rates(session)
+        await deal_repository.get_by_id(session, _NIL_UUID)
+        for currency in (None, '---'):
+            await deal_repository.sums_by_currency(
+                session, date_from=_EPOCH, date_to=_EPOCH, currency=currency
+            )
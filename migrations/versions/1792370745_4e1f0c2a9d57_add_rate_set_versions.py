@@ -0,0 +1,39 @@
+"""add rate_set_versions
+
+Revision ID: 4e1f0c2a9d57
+Revises: b8c9fd7b3d82
+Create Date: 2026-10-19 09:25:45.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1f0c2a9d57'
+down_revision: Union[str, None] = 'b8c9fd7b3d82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rate_set_versions',
+        sa.Column('id', sa.SmallInteger(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.CheckConstraint('id = 1', name='single_row'),
+        sa.PrimaryKeyConstraint('id', name=op.f('rate_set_versions_pkey')),
+    )
+    op.execute('INSERT INTO rate_set_versions (id, version) VALUES (1, 1)')
+
+
+def downgrade() -> None:
+    op.drop_table('rate_set_versions')
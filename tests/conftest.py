@@ -0,0 +1,51 @@
+"""Shared fixtures.
+
+Database tests run against the Postgres configured in `.env` (migrated,
+with rates loaded, e.g. by `python -m benchmarks.seed`) and are skipped
+when it cannot be reached.
+"""
+
+import os
+
+# Tests never fetch from NBRB or compete for the loader lock
+os.environ.setdefault('LOAD_RATES_ON_STARTUP', 'false')
+os.environ.setdefault('LOAD_RATES_DAILY', 'false')
+os.environ.setdefault('LOAD_RATES_LEADER_ELECTION', 'false')
+
+import pytest  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+async def session(anyio_backend):
+    from cea.db.database import async_session, engine
+
+    try:
+        async with engine.connect():
+            pass
+    except Exception as e:
+        pytest.skip(f'Database unavailable: {e}')
+    try:
+        async with async_session() as session:
+            yield session
+    finally:
+        # Pooled connections are bound to this test's event loop
+        await engine.dispose()
+
+
+@pytest.fixture
+async def created_deals(session):
+    """Ids of deals a test creates; deleted afterwards."""
+    from cea.db.models import Deal
+
+    ids: list[str] = []
+    yield ids
+    if ids:
+        await session.rollback()
+        await session.execute(delete(Deal).where(Deal.id.in_(ids)))
+        await session.commit()
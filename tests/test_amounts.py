@@ -0,0 +1,105 @@
+import math
+import random
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pytest
+
+from cea.schemas.portfolio import PortfolioValueIn
+from cea.services import portfolio_service
+from cea.services.amounts import round_half_up
+from cea.services.portfolio_service import PortfolioService
+from cea.services.rate_index import RateIndex
+
+pytestmark = pytest.mark.anyio
+
+
+def _decimal(value: float) -> Decimal:
+    return Decimal(str(value)).quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
+
+
+def test_ties_round_half_up():
+    # 2.00025 is 2.000249999... as a float; np.round would give 2.0002
+    values = np.array([2.00025, 2.00015, 0.00005, 1.23454])
+    rounded = round_half_up(values, lambda i: _decimal(values[i]))
+    assert rounded.tolist() == [2.0003, 2.0002, 0.0001, 1.2345]
+
+
+def test_exact_fallback_only_near_ties():
+    calls = []
+
+    def exact(i):
+        calls.append(i)
+        return _decimal(values[i])
+
+    values = np.array([1.23456, 7.5, 2.00025])
+    assert round_half_up(values, exact).tolist() == [1.2346, 7.5, 2.0003]
+    assert calls == [2]
+
+
+def test_negative_ties_round_away_from_zero():
+    values = np.array([-579019.53635, -2.00025, -1.23454, -0.00001])
+    rounded = round_half_up(values, lambda i: _decimal(values[i]))
+    assert rounded.tolist() == [-579019.5364, -2.0003, -1.2345, 0.0]
+    assert math.copysign(1.0, rounded[-1]) == 1.0  # no -0.0
+
+
+def _portfolio_index(days, rng):
+    index = RateIndex()
+    for day in days:
+        # Integer rates and 5-decimal amounts: every tenth total is a tie
+        rates = {code: rng.randrange(1, 10) for code in ('USD', 'EUR', 'RUB')}
+        rates['BYN'] = 1
+        # Same rate as USD: holdings in both can cancel out
+        rates['USX'] = rates['USD']
+        index.apply(
+            {'abbreviation': code, 'rate_date': day, 'scale': 1, 'rate': rate}
+            for code, rate in rates.items()
+        )
+    return index
+
+
+def _exact_total(index, holdings, day):
+    byn = sum(
+        Decimal(str(amount)) * Decimal(str(index.as_of(code, day).rate))
+        for code, amount in holdings.items()
+    )
+    return float(byn.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP))
+
+
+@pytest.mark.parametrize(
+    'holdings',
+    [
+        # Mixed signs
+        lambda rng: {
+            code: rng.randrange(-10**11, 10**11) / 10**5
+            for code in ('USD', 'EUR', 'RUB')
+        },
+        # A large long and an almost equal short: small totals
+        lambda rng: {
+            'USD': (long := rng.randrange(10**14, 10**15)) / 10**5,
+            'USX': -(long + rng.randrange(-10**6, 10**6)) / 10**5,
+        },
+    ],
+    ids=['mixed', 'cancelling'],
+)
+async def test_portfolio_totals_match_decimal(monkeypatch, holdings):
+    rng = random.Random(47)
+    days = [date(2024, 1, 1) + timedelta(days=i) for i in range(200)]
+    index = _portfolio_index(days, rng)
+
+    async def ensure_fresh(session):
+        pass
+
+    monkeypatch.setattr(index, 'ensure_fresh', ensure_fresh)
+    monkeypatch.setattr(portfolio_service, 'rate_index', index)
+
+    for _ in range(20):
+        payload = PortfolioValueIn(
+            holdings=holdings(rng), dates=days, currency='BYN'
+        )
+        out = await PortfolioService.value(None, payload)
+        assert [point.value for point in out.values] == [
+            _exact_total(index, payload.holdings, day) for day in days
+        ]
@@ -0,0 +1,143 @@
+import math
+import random
+from datetime import date
+from decimal import Decimal
+
+import httpx
+import numpy as np
+import pytest
+
+from cea.schemas.deal import BulkConvertIn
+from cea.services import deal_service as deal_service_module
+from cea.services.deal_service import DealService
+from cea.services.errors import ValidationError
+from cea.services.rate_index import RateIndex
+
+pytestmark = pytest.mark.anyio
+
+_DAY = date(2024, 1, 2)
+
+
+def _tie_heavy(n, seed=46):
+    """Conversions whose exact results often end in a 5 at the 5th place."""
+    rng = random.Random(seed)
+    amounts, rates_from, scales_from, rates_to, scales_to = [], [], [], [], []
+    for _ in range(n):
+        amounts.append(rng.randrange(1, 10**10) / 10**5)
+        # Whole rates and round targets keep 5 decimals: every tenth result
+        # is a tie. Others rarely are.
+        rates_from.append(
+            rng.choice((rng.randrange(1, 100), rng.randrange(1, 10**5) / 10**4))
+        )
+        scales_from.append(rng.choice((1, 1, 10, 100)))
+        rates_to.append(
+            rng.choice((1.0, 2.0, 0.5, 0.25, rng.randrange(1, 10**5) / 10**4))
+        )
+        scales_to.append(rng.choice((1, 10, 100)))
+    return [
+        np.array(column, dtype=np.float64)
+        for column in (amounts, rates_from, scales_from, rates_to, scales_to)
+    ]
+
+
+def test_vectorized_matches_decimal():
+    columns = _tie_heavy(50_000)
+    vectorized = DealService._calc_amounts_to(*columns)
+
+    ties = mismatches = 0
+    for i, (amount, rate_from, scale_from, rate_to, scale_to) in enumerate(
+        zip(*(column.tolist() for column in columns))
+    ):
+        args = (
+            Decimal(str(amount)),
+            Decimal(str(rate_from)),
+            int(scale_from),
+            Decimal(str(rate_to)),
+            int(scale_to),
+        )
+        exact = args[0] * (args[1] / args[2]) / (args[3] / args[4])
+        ties += exact * 10**5 % 10 == 5 and exact * 10**5 % 1 == 0
+        if vectorized[i] != float(DealService._calc_amount_to(*args)):
+            mismatches += 1
+
+    assert ties > 500
+    assert mismatches == 0
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = RateIndex()
+    index.apply([
+        {'abbreviation': 'USD', 'rate_date': _DAY, 'scale': 1, 'rate': 3.2571},
+        {'abbreviation': 'RUB', 'rate_date': _DAY, 'scale': 100, 'rate': 3.7011},
+    ])
+
+    async def ensure_fresh(session):
+        pass
+
+    monkeypatch.setattr(index, 'ensure_fresh', ensure_fresh)
+    monkeypatch.setattr(deal_service_module, 'rate_index', index)
+    return index
+
+
+async def test_convert_endpoint(index):
+    from cea.main import app
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        resp = await client.post(
+            '/exchange/convert',
+            json={
+                'amount_from': [100.0, 250.5],
+                'currency_from': ['USD', 'RUB'],
+                'currency_to': ['RUB', 'USD'],
+            },
+        )
+
+    assert resp.status_code == 200
+    expected = [
+        float(DealService._calc_amount_to(
+            Decimal('100.0'), Decimal('3.2571'), 1, Decimal('3.7011'), 100
+        )),
+        float(DealService._calc_amount_to(
+            Decimal('250.5'), Decimal('3.7011'), 100, Decimal('3.2571'), 1
+        )),
+    ]
+    assert resp.json() == {'amount_to': expected, 'rate_date': _DAY.isoformat()}
+
+
+@pytest.mark.parametrize(
+    'payload, message',
+    [
+        (
+            {'amount_from': [1.0, 2.0], 'currency_from': ['USD'],
+             'currency_to': ['RUB', 'RUB']},
+            'equally long',
+        ),
+        (
+            {'amount_from': [1.0, 0.0], 'currency_from': ['USD', 'USD'],
+             'currency_to': ['RUB', 'RUB']},
+            r'amount_from\[1\]',
+        ),
+        (
+            {'amount_from': [-1.0], 'currency_from': ['USD'],
+             'currency_to': ['RUB']},
+            r'amount_from\[0\]',
+        ),
+        (
+            {'amount_from': [math.nan], 'currency_from': ['USD'],
+             'currency_to': ['RUB']},
+            r'amount_from\[0\]',
+        ),
+        (
+            {'amount_from': [1.0], 'currency_from': ['USD'],
+             'currency_to': ['XXX']},
+            'No XXX rate',
+        ),
+    ],
+    ids=['length-mismatch', 'zero', 'negative', 'nan', 'unknown-currency'],
+)
+async def test_convert_errors(index, payload, message):
+    with pytest.raises(ValidationError, match=message):
+        await DealService().convert_bulk(None, BulkConvertIn(**payload))
@@ -0,0 +1,116 @@
+import statistics
+from datetime import date
+
+import httpx
+import pytest
+
+from cea.services import currency_rate_service
+from cea.services.rate_index import RateIndex
+
+pytestmark = pytest.mark.anyio
+
+D1, D2, D3, D4 = (date(2024, 1, day) for day in (1, 2, 3, 4))
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = RateIndex()
+    index.apply([
+        # No rate on D3
+        {'abbreviation': 'USD', 'rate_date': D1, 'scale': 1, 'rate': 2.0},
+        {'abbreviation': 'USD', 'rate_date': D2, 'scale': 1, 'rate': 2.2},
+        {'abbreviation': 'USD', 'rate_date': D4, 'scale': 1, 'rate': 2.1},
+        # Redenominated: 3.0 per 100 RUB, then 0.031 per RUB
+        {'abbreviation': 'RUB', 'rate_date': D1, 'scale': 100, 'rate': 3.0},
+        {'abbreviation': 'RUB', 'rate_date': D2, 'scale': 1, 'rate': 0.031},
+    ])
+
+    async def ensure_fresh(session):
+        pass
+
+    monkeypatch.setattr(index, 'ensure_fresh', ensure_fresh)
+    monkeypatch.setattr(currency_rate_service, 'rate_index', index)
+    return index
+
+
+async def _get(path, **params):
+    from cea.main import app
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        return await client.get(path, params=params)
+
+
+def test_windows(index):
+    stats = index.window_stats('USD', D4, [2, 10])
+    short, full = stats['windows']
+
+    assert stats['rate_date'] == D4
+    assert stats['daily_return'] == pytest.approx(2.1 / 2.2 - 1)
+    # (D2, D4]: one rate, one return into it
+    assert short['observations'] == 1
+    assert short['change'] == pytest.approx(2.1 / 2.2 - 1)
+    assert short['mean_daily_return'] == pytest.approx(2.1 / 2.2 - 1)
+    assert short['volatility'] is None
+    # Reaches back to the first rate: nothing to compare it against
+    returns = [2.2 / 2.0 - 1, 2.1 / 2.2 - 1]
+    assert full['observations'] == 3
+    assert (full['min'], full['max']) == (2.0, 2.2)
+    assert full['mean'] == pytest.approx(6.3 / 3)
+    assert full['change'] is None
+    assert full['mean_daily_return'] == pytest.approx(statistics.mean(returns))
+    assert full['volatility'] == pytest.approx(statistics.stdev(returns))
+
+
+def test_single_observation(index):
+    stats = index.window_stats('USD', D1, [30])
+    [window] = stats['windows']
+
+    assert stats['daily_return'] is None
+    assert window['observations'] == 1
+    assert window['change'] is None
+    assert window['mean_daily_return'] is None
+    assert window['volatility'] is None
+
+
+def test_scale_change_uses_per_unit_values(index):
+    stats = index.window_stats('RUB', D3, [7])
+    [window] = stats['windows']
+
+    assert stats['rate_date'] == D2
+    assert stats['rate'] == pytest.approx(0.031)
+    assert stats['daily_return'] == pytest.approx(0.031 / 0.03 - 1)
+    assert (window['min'], window['max']) == pytest.approx((0.03, 0.031))
+
+
+async def test_stats_endpoint(index):
+    resp = await _get('/currencies/USD/stats', windows=[2, 10])
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body['rate_date'] == D4.isoformat()
+    assert [w['days'] for w in body['windows']] == [2, 10]
+
+
+@pytest.mark.parametrize(
+    'path, params',
+    [
+        ('/currencies/USD/stats', {'rate_date': '2023-12-31'}),
+        ('/currencies/XXX/stats', {}),
+    ],
+    ids=['before-first-rate', 'unknown-currency'],
+)
+async def test_no_rate_is_not_found(index, path, params):
+    resp = await _get(path, **params)
+    assert resp.status_code == 404
+
+
+@pytest.mark.parametrize(
+    'windows',
+    [[0], [3651], list(range(1, 12))],
+    ids=['zero', 'too-long', 'too-many'],
+)
+async def test_window_bounds(index, windows):
+    resp = await _get('/currencies/USD/stats', windows=windows)
+    assert resp.status_code == 400
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from cea.clients.providers import HedgedRateProvider, RateProviderError
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeProvider:
+    """Answers (or fails) after `delay` seconds."""
+
+    def __init__(self, name, *, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def get_daily_rates(self, ondate=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return [{'Cur_Abbreviation': 'USD', 'from': self.name}]
+
+
+def _winner(rates):
+    return rates[0]['from']
+
+
+async def test_fast_primary_is_not_hedged():
+    primary, mirror = FakeProvider('primary'), FakeProvider('mirror')
+    hedged = HedgedRateProvider([primary, mirror], hedge_delay=1.0)
+
+    assert _winner(await hedged.get_daily_rates()) == 'primary'
+    assert mirror.calls == 0
+
+
+async def test_slow_primary_is_hedged_and_loser_cancelled():
+    primary = FakeProvider('primary', delay=5.0)
+    mirror = FakeProvider('mirror', delay=0.01)
+    hedged = HedgedRateProvider([primary, mirror], hedge_delay=0.05)
+
+    assert _winner(await hedged.get_daily_rates()) == 'mirror'
+    assert primary.cancelled
+    # The cancelled loser counts as at least as slow as it was allowed to be
+    assert len(hedged._latencies['primary']) == 1
+    assert hedged._latencies['primary'][0] >= 0.01
+
+
+async def test_hedge_delay_follows_the_latency_quantile():
+    primary = FakeProvider('primary', delay=0.06)
+    hedged = HedgedRateProvider(
+        [primary, FakeProvider('mirror')], hedge_quantile=0.5, hedge_delay=9.0
+    )
+    for _ in range(5):
+        await hedged.get_daily_rates()
+
+    assert 0.06 <= hedged.hedge_after(primary) < 1.0
+
+
+async def test_failure_fails_over_without_recording_latency():
+    primary = FakeProvider('primary', error=ConnectionRefusedError())
+    mirror = FakeProvider('mirror')
+    hedged = HedgedRateProvider([primary, mirror], hedge_delay=5.0)
+
+    assert _winner(await hedged.get_daily_rates()) == 'mirror'
+    assert not hedged._latencies['primary']
+    assert len(hedged._latencies['mirror']) == 1
+
+
+async def test_all_failing_raises_with_every_error():
+    hedged = HedgedRateProvider(
+        [
+            FakeProvider('primary', error=ConnectionRefusedError()),
+            FakeProvider('mirror', error=ValueError('bad payload')),
+        ],
+        hedge_delay=5.0,
+    )
+
+    with pytest.raises(RateProviderError) as raised:
+        await hedged.get_daily_rates()
+    assert 'primary: ConnectionRefusedError()' in str(raised.value)
+    assert "mirror: ValueError('bad payload')" in str(raised.value)
+
+
+async def test_deadline_cancels_everything():
+    primary = FakeProvider('primary', delay=5.0)
+    mirror = FakeProvider('mirror', delay=5.0)
+    hedged = HedgedRateProvider(
+        [primary, mirror], hedge_delay=0.01, deadline=0.1
+    )
+
+    with pytest.raises(RateProviderError, match='deadline of 0.1s exceeded'):
+        await hedged.get_daily_rates()
+    assert primary.cancelled and mirror.cancelled
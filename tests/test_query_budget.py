@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from cea.enums import ConfirmActionEnum
+from cea.query_budget import QueryBudgetExceeded, expect_queries
+from cea.schemas.deal import ExchangeConfirmIn, ExchangePreviewIn
+from cea.services.processor import deal_service
+
+pytestmark = pytest.mark.anyio
+
+_PREVIEW = ExchangePreviewIn(
+    amount_from=100, currency_from='USD', currency_to='EUR'
+)
+
+
+async def test_preview_runs_three_statements(session, created_deals):
+    # Two rate lookups and the insert
+    with expect_queries(3) as queries:
+        out = await deal_service.preview(session, _PREVIEW)
+    created_deals.append(out.deal_id)
+    assert queries.count == 3
+
+
+async def test_confirm_runs_three_statements(session, created_deals):
+    deal_id = (await deal_service.preview(session, _PREVIEW)).deal_id
+    created_deals.append(deal_id)
+    payload = ExchangeConfirmIn(deal_id=deal_id, result=ConfirmActionEnum.CONFIRM)
+    # Load, update, reload
+    with expect_queries(3) as queries:
+        await deal_service.confirm(session, payload)
+    assert queries.count == 3
+
+
+async def test_report_runs_three_statements(session):
+    date_to = datetime.now(timezone.utc)
+    # Sums in, sums out and counts per currency
+    with expect_queries(3) as queries:
+        await deal_service.report(
+            session, date_from=date_to - timedelta(days=30), date_to=date_to
+        )
+    assert queries.count == 3
+
+
+async def test_budget_exceeded_lists_statements(session):
+    with pytest.raises(QueryBudgetExceeded, match='2 statements executed'):
+        with expect_queries(1):
+            await deal_service.list_pending(session)
+            await deal_service.list_pending(session)
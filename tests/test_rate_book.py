@@ -0,0 +1,203 @@
+import multiprocessing
+import os
+import time
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from cea.db.repositories import currency_rate_repository
+from cea.services.rate_book import (
+    _SLOT,
+    RateBook,
+    SharedBook,
+    _slot_offset,
+    encode,
+)
+
+pytestmark = pytest.mark.anyio
+
+_DAY = date(2024, 1, 2)
+
+
+def _rows(generation):
+    """A book whose every rate is `generation % 50`, of varying size."""
+    return [
+        {
+            'id': i,
+            'abbreviation': f'C{i:03d}',
+            'scale': 1,
+            'rate': Decimal(generation % 50),
+            'rate_date': _DAY,
+        }
+        for i in range(1 + generation % 50 * 20)
+    ]
+
+
+def _publish(path, generation, *, verified_at=None):
+    shared = SharedBook(path)
+    fd = shared.lock(wait=True)
+    try:
+        return shared.publish(
+            fd, encode(_rows(generation), verified_at or time.time())
+        )
+    finally:
+        os.close(fd)
+
+
+def _read_until(path, ready, stop, results):
+    """Reader process: check every book it sees against its generation."""
+    shared = SharedBook(path)
+    ready.release()
+    reads = torn = 0
+    last = 0
+    while not stop.is_set():
+        book = shared.read()
+        if book is None:
+            continue
+        reads += 1
+        expected = book.generation % 50
+        rates = {rate.rate for rate in book.rates.values()}
+        if rates != {Decimal(expected)} or len(book.rates) != 1 + expected * 20:
+            torn += 1
+        if book.generation < last:
+            torn += 1
+        last = book.generation
+    results.put((reads, torn))
+
+
+def test_readers_never_see_torn_books(tmp_path):
+    path = str(tmp_path / 'book')
+    _publish(path, 1)
+    ctx = multiprocessing.get_context('spawn')
+    ready, stop, results = ctx.Semaphore(0), ctx.Event(), ctx.Queue()
+    readers = [
+        ctx.Process(target=_read_until, args=(path, ready, stop, results))
+        for _ in range(3)
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        for _ in readers:
+            assert ready.acquire(timeout=30)
+        # One writer publishing back to back laps slow readers often
+        payloads = [encode(_rows(k), time.time()) for k in range(50)]
+        writer = SharedBook(path)
+        fd = writer.lock(wait=True)
+        try:
+            for generation in range(2, 20_000):
+                writer.publish(fd, payloads[generation % 50])
+        finally:
+            os.close(fd)
+    finally:
+        stop.set()
+        outcomes = [results.get(timeout=30) for _ in readers]
+        for reader in readers:
+            reader.join()
+
+    assert all(reads > 0 for reads, _ in outcomes)
+    assert [torn for _, torn in outcomes] == [0, 0, 0]
+
+
+@pytest.mark.parametrize('lapped', ['payload', 'stamp'])
+def test_lapped_reads_are_discarded(tmp_path, lapped):
+    # What a reader copies when a writer refills the slot under it
+    path = str(tmp_path / 'book')
+    generation = _publish(path, 7)
+    base = _slot_offset(generation)
+    with open(path, 'r+b') as f:
+        if lapped == 'payload':
+            f.seek(base + _SLOT.size + 10)
+            byte = f.read(1)
+            f.seek(-1, os.SEEK_CUR)
+            f.write(bytes([byte[0] ^ 0x01]))
+        else:
+            f.seek(base)
+            f.write(bytes(_SLOT.size))
+
+    assert SharedBook(path).read() is None
+
+
+def test_reader_follows_a_recreated_file(tmp_path):
+    path = str(tmp_path / 'book')
+    _publish(path, 7)
+    reader = SharedBook(path)
+    assert reader.read().generation == 1
+
+    os.unlink(path)
+    _publish(path, 8)
+    reader.reattach_if_replaced()
+
+    assert reader.read().rates['C000'].rate == Decimal(8)
+
+
+def test_publish_into_a_recreated_file_reads_it(tmp_path):
+    path = str(tmp_path / 'book')
+    shared = SharedBook(path)
+    fd = shared.lock(wait=True)
+    shared.publish(fd, encode(_rows(7), time.time()))
+    os.close(fd)
+    assert shared.read().rates['C000'].rate == Decimal(7)
+
+    os.unlink(path)
+    fd = shared.lock(wait=True)
+    shared.publish(fd, encode(_rows(8), time.time()))
+    os.close(fd)
+
+    assert shared.read().rates['C000'].rate == Decimal(8)
+
+
+async def test_off_or_missing_book_falls_back_to_the_db(tmp_path):
+    assert await RateBook(path='').current(None) is None
+
+    path = str(tmp_path / 'book')
+    other_worker = SharedBook(path).lock(wait=True)
+    try:
+        # No book yet and another worker is creating it
+        assert await RateBook(path=path).current(None) is None
+    finally:
+        os.close(other_worker)
+
+
+async def test_stale_book_is_served_while_another_worker_refreshes(tmp_path):
+    path = str(tmp_path / 'book')
+    _publish(path, 7, verified_at=time.time() - 3600)
+    other_worker = SharedBook(path).lock(wait=True)
+    try:
+        book = await RateBook(path=path, max_age=60).current(None)
+    finally:
+        os.close(other_worker)
+
+    assert book.rates['C000'].rate == Decimal(7)
+
+
+async def test_stale_book_remaps_a_recreated_file(tmp_path):
+    path = str(tmp_path / 'book')
+    _publish(path, 7, verified_at=time.time() - 3600)
+    rate_book = RateBook(path=path, max_age=60)
+    assert rate_book._shared.read().rates['C000'].rate == Decimal(7)
+
+    os.unlink(path)
+    _publish(path, 8)
+
+    # Fresh in the new file: served without a refresh (no session needed)
+    book = await rate_book.current(None)
+    assert book.rates['C000'].rate == Decimal(8)
+
+
+async def test_book_lists_what_the_db_lists(session, tmp_path):
+    book = await RateBook(path=str(tmp_path / 'book')).current(session)
+    if book is None or book.last_date is None:
+        pytest.skip('No rates loaded')
+
+    rows = await currency_rate_repository.list_by_date(
+        session, rate_date=book.last_date
+    )
+
+    def listing(rates):
+        return sorted(
+            (rate.id, rate.abbreviation, rate.scale, rate.rate, rate.rate_date)
+            for rate in rates
+        )
+
+    assert listing(book.on_last_date()) == listing(rows)
@@ -0,0 +1,91 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from cea.db.repositories import currency_rate_repository
+from cea.services.rate_index import RateIndex
+from cea.services.rate_snapshot import RateSnapshot, encode, read_version, write
+
+pytestmark = pytest.mark.anyio
+
+
+def _row(code, day, rate):
+    return {'abbreviation': code, 'rate_date': day, 'scale': 1, 'rate': rate}
+
+
+async def test_full_reload_is_swapped_in_at_once(monkeypatch):
+    index = RateIndex()
+    index.apply([_row('USD', date(2024, 1, 2), 3.1)])
+    index.version = 1
+    seen = []
+
+    async def rate_set_version(session):
+        return 2
+
+    async def history(session, *, date_from):
+        assert date_from == date.min
+        await asyncio.sleep(0)
+        # What concurrent readers see while the reload is in flight
+        seen.append((index.version, index.last_date, sorted(index.series)))
+        return [
+            _row('EUR', date(2024, 1, 3), 3.4),
+            _row('USD', date(2024, 1, 3), 3.2),
+        ]
+
+    monkeypatch.setattr(currency_rate_repository, 'rate_set_version', rate_set_version)
+    monkeypatch.setattr(currency_rate_repository, 'history', history)
+    await index._refresh(None)
+
+    assert seen == [(1, date(2024, 1, 2), ['USD'])]
+    assert index.version == 2
+    assert index.last_date == date(2024, 1, 3)
+    assert index.as_of('USD', date(2024, 1, 2)) is None
+    assert index.as_of('EUR', date(2024, 1, 5)).rate == 3.4
+
+
+async def test_version_change_reloads_old_dates(monkeypatch):
+    index = RateIndex()
+    stored = [
+        _row('USD', date(2020, 1, 2), 2.1),
+        _row('USD', date(2024, 1, 2), 3.1),
+    ]
+    versions = iter([1, 2])
+
+    async def rate_set_version(session):
+        return next(versions)
+
+    async def history(session, *, date_from):
+        return [row for row in stored if row['rate_date'] >= date_from]
+
+    monkeypatch.setattr(currency_rate_repository, 'rate_set_version', rate_set_version)
+    monkeypatch.setattr(currency_rate_repository, 'history', history)
+    await index._refresh(None)
+    # A correction years before the last date, e.g. by a backfill
+    stored[0] = _row('USD', date(2020, 1, 2), 2.2)
+    await index._refresh(None)
+
+    assert index.as_of('USD', date(2020, 6, 1)).rate == 2.2
+
+
+async def test_rate_set_version_moves_with_the_transaction(session):
+    before = await currency_rate_repository.rate_set_version(session)
+    await session.commit()
+
+    bumped = await currency_rate_repository.bump_rate_set_version(session)
+    assert bumped == before + 1
+    assert await currency_rate_repository.rate_set_version(session) == bumped
+    await session.rollback()
+
+    assert await currency_rate_repository.rate_set_version(session) == before
+
+
+def test_snapshot_carries_the_version(tmp_path):
+    path = str(tmp_path / 'rates.bin')
+    write(path, encode({'USD': ([738887, 738888], [3.1, 3.2], [1, 1])}, 42))
+
+    assert read_version(path) == 42
+    snapshot = RateSnapshot(path)
+    assert snapshot.version == 42
+    [(code, days, rates, scales)] = list(snapshot)
+    assert (code, list(days), list(rates)) == ('USD', [738887, 738888], [3.1, 3.2])
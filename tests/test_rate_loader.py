@@ -0,0 +1,59 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import delete
+
+from cea.db.models import CurrencyRate
+from cea.db.repositories import currency_rate_repository
+from cea.services.rate_loader import RateLoaderService
+
+pytestmark = pytest.mark.anyio
+
+# Far from any seeded or loaded date
+_DAY = date(2099, 1, 2)
+
+
+class FakeProvider:
+    name = 'fake'
+
+    def __init__(self, rate):
+        self.rate = rate
+
+    async def get_daily_rates(self, ondate=None):
+        return [{
+            'Cur_Abbreviation': 'USD',
+            'Cur_Scale': 1,
+            'Cur_OfficialRate': self.rate,
+            'Date': f'{_DAY.isoformat()}T00:00:00',
+        }]
+
+
+@pytest.fixture
+async def test_day(session):
+    yield _DAY
+    await session.rollback()
+    await session.execute(delete(CurrencyRate).where(CurrencyRate.rate_date == _DAY))
+    await currency_rate_repository.bump_rate_set_version(session)
+    await session.commit()
+
+
+async def test_only_changing_loads_bump_the_version(session, test_day):
+    version = await currency_rate_repository.rate_set_version(session)
+
+    result = await RateLoaderService(FakeProvider(3.1)).fetch_and_upsert_for_date(
+        session, ondate=test_day
+    )
+    assert result.inserted == 1
+    assert await currency_rate_repository.rate_set_version(session) == version + 1
+
+    result = await RateLoaderService(FakeProvider(3.1)).fetch_and_upsert_for_date(
+        session, ondate=test_day
+    )
+    assert result.unchanged == 1
+    assert await currency_rate_repository.rate_set_version(session) == version + 1
+
+    result = await RateLoaderService(FakeProvider(3.2)).fetch_and_upsert_for_date(
+        session, ondate=test_day
+    )
+    assert result.updated == 1
+    assert await currency_rate_repository.rate_set_version(session) == version + 2
@@ -0,0 +1,46 @@
+import httpx
+import pytest
+from starlette.responses import PlainTextResponse
+
+from cea import request_profiler
+from cea.request_profiler import RequestProfilerMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+async def _hello(scope, receive, send):
+    await PlainTextResponse('hello')(scope, receive, send)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(request_profiler, 'PROFILING_TOKEN', 'sekret')
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=RequestProfilerMiddleware(_hello)),
+        base_url='http://test',
+    )
+
+
+@pytest.mark.parametrize('token', ['wrong', '%C3%A9', 'sekret%C3%A9'])
+async def test_invalid_token_is_not_profiled(client, token):
+    async with client:
+        resp = await client.get(f'/?profile={token}')
+    assert resp.status_code == 200
+    assert resp.text == 'hello'
+    assert 'x-profiled-status' not in resp.headers
+
+
+async def test_non_ascii_header_token_is_not_profiled(client):
+    async with client:
+        resp = await client.get('/', headers={'X-Profile': 'sékret'.encode()})
+    assert resp.text == 'hello'
+
+
+async def test_valid_token_is_profiled(client):
+    async with client:
+        resp = await client.get(
+            '/', params={'profile': 'sekret', 'profile_format': 'speedscope'}
+        )
+    assert resp.status_code == 200
+    assert resp.headers['x-profiled-status'] == '200'
+    assert resp.headers['content-type'] == 'application/json'
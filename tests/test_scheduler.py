@@ -0,0 +1,138 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, time, timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import delete
+
+from cea.db.models import CurrencyRate
+from cea.db.repositories import currency_rate_repository
+from cea.services import scheduler
+from cea.services.rate_loader import RateUpsertResult
+from cea.services.scheduler import DailyRatesScheduler
+
+pytestmark = pytest.mark.anyio
+
+_D1, _D2, _D3 = (date(2099, 1, day) for day in (2, 3, 4))
+
+
+class FakeLoader:
+    """Plays back `outcomes[day]` (results or exceptions), one per call."""
+
+    def __init__(self, outcomes):
+        self.outcomes = {day: list(items) for day, items in outcomes.items()}
+        self.calls: list[date] = []
+        self.running = self.most_running = 0
+
+    async def fetch_and_upsert_for_date(self, session, *, ondate=None):
+        self.calls.append(ondate)
+        self.running += 1
+        self.most_running = max(self.most_running, self.running)
+        try:
+            await asyncio.sleep(0)
+            outcome = self.outcomes[ondate].pop(0)
+        finally:
+            self.running -= 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@asynccontextmanager
+async def _no_session():
+    yield None
+
+
+def _scheduler(loader, **kwargs):
+    return DailyRatesScheduler(_no_session, loader, time(12, 0), **kwargs)
+
+
+def _catchup_days(result):
+    return REGISTRY.get_sample_value(
+        'cea_rates_catchup_days_total', {'result': result}
+    ) or 0
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(scheduler, '_backoff', lambda attempt: 0)
+
+
+async def test_retries_until_filled():
+    loader = FakeLoader(
+        {_D1: [OSError('down'), OSError('down'), RateUpsertResult(3)]}
+    )
+    filled = _catchup_days('filled')
+
+    assert await _scheduler(loader, retries=3)._load_day(_D1) is True
+    assert loader.calls == [_D1] * 3
+    assert _catchup_days('filled') == filled + 1
+
+
+async def test_retry_budget():
+    loader = FakeLoader({_D1: [OSError('down')] * 10})
+    failed = _catchup_days('failed')
+
+    assert await _scheduler(loader, retries=2)._load_day(_D1) is False
+    assert loader.calls == [_D1] * 3  # first attempt + 2 retries
+    assert _catchup_days('failed') == failed + 1
+
+
+async def test_empty_day_is_not_retried():
+    loader = FakeLoader({_D1: [RateUpsertResult(), RateUpsertResult(3)]})
+    empty = _catchup_days('empty')
+
+    assert await _scheduler(loader, retries=3)._load_day(_D1) is False
+    assert loader.calls == [_D1]
+    assert _catchup_days('empty') == empty + 1
+
+
+async def test_catch_up_loads_missing_days(monkeypatch):
+    async def missing_dates(session, *, date_from, date_to):
+        assert date_to - date_from == timedelta(days=6)
+        assert date_to == date.today()
+        return [_D1, _D2, _D3]
+
+    monkeypatch.setattr(currency_rate_repository, 'missing_dates', missing_dates)
+    loader = FakeLoader({
+        _D1: [RateUpsertResult(3)],
+        _D2: [RateUpsertResult()],
+        _D3: [OSError('down'), RateUpsertResult(0, 3)],
+    })
+    catchup = _scheduler(loader, catchup_days=7, catchup_concurrency=2, retries=1)
+
+    assert await catchup.catch_up() == 2  # D2 has no rates
+    assert sorted(loader.calls) == [_D1, _D2, _D3, _D3]
+    assert loader.most_running <= 2
+
+
+async def test_catch_up_off():
+    loader = FakeLoader({})
+    assert await _scheduler(loader, catchup_days=0).catch_up() == 0
+    assert loader.calls == []
+
+
+@pytest.fixture
+async def stored_days(session):
+    """Rates stored on D1 and D3 only."""
+    session.add_all([
+        CurrencyRate(abbreviation='USD', scale=1, rate=3.2, rate_date=day)
+        for day in (_D1, _D3)
+    ])
+    await currency_rate_repository.bump_rate_set_version(session)
+    await session.commit()
+    yield
+    await session.rollback()
+    await session.execute(
+        delete(CurrencyRate).where(CurrencyRate.rate_date.in_([_D1, _D3]))
+    )
+    await currency_rate_repository.bump_rate_set_version(session)
+    await session.commit()
+
+
+async def test_missing_dates(session, stored_days):
+    missing = await currency_rate_repository.missing_dates(
+        session, date_from=_D1 - timedelta(days=1), date_to=_D3 + timedelta(days=1)
+    )
+    assert missing == [_D1 - timedelta(days=1), _D2, _D3 + timedelta(days=1)]
@@ -0,0 +1,105 @@
+import asyncio
+import itertools
+
+import pytest
+from prometheus_client import REGISTRY
+
+from cea.services.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+_names = itertools.count()
+
+
+class Computation:
+    """Counts its runs; each run waits for `release` (and may fail)."""
+
+    def __init__(self, error=None):
+        self.release = asyncio.Event()
+        self.error = error
+        self.runs = 0
+
+    async def __call__(self):
+        self.runs += 1
+        run = self.runs
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {'run': run}
+
+
+def _calls(flight, role):
+    return REGISTRY.get_sample_value(
+        'cea_singleflight_calls_total', {'flight': flight.name, 'role': role}
+    ) or 0
+
+
+async def _start(flight, computation, count, key='k'):
+    tasks = [
+        asyncio.create_task(flight.do(key, computation)) for _ in range(count)
+    ]
+    await asyncio.sleep(0)  # every caller has joined
+    return tasks
+
+
+async def test_concurrent_callers_share_one_run():
+    flight = SingleFlight(f'test-{next(_names)}')
+    computation = Computation()
+    tasks = await _start(flight, computation, 5)
+    other = await _start(flight, computation, 1, key='other')
+
+    computation.release.set()
+    results = await asyncio.gather(*tasks, *other)
+
+    assert computation.runs == 2  # one per key
+    assert all(result is results[0] for result in results[:5])
+    assert _calls(flight, 'leader') == 2
+    assert _calls(flight, 'coalesced') == 4
+
+
+async def test_errors_are_shared():
+    flight = SingleFlight(f'test-{next(_names)}')
+    computation = Computation(error=ValueError('boom'))
+    tasks = await _start(flight, computation, 3)
+
+    computation.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert computation.runs == 1
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert _calls(flight, 'coalesced') == 2
+
+
+async def test_cancelled_leader_is_rerun_once():
+    flight = SingleFlight(f'test-{next(_names)}')
+    computation = Computation()
+    leader, *waiters = await _start(flight, computation, 4)
+
+    leader.cancel()
+    while computation.runs < 2:  # until a waiter has taken over
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)  # and the others have joined it
+    computation.release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert leader.cancelled()
+    assert computation.runs == 2
+    assert results == [{'run': 2}] * 3
+    # Every call counted once: the cancelled leader, its successor, and
+    # the two that shared the successor's result
+    assert _calls(flight, 'leader') == 2
+    assert _calls(flight, 'coalesced') == 2
+
+
+async def test_cancelled_waiter_leaves_the_flight_running():
+    flight = SingleFlight(f'test-{next(_names)}')
+    computation = Computation()
+    leader, waiter = await _start(flight, computation, 2)
+
+    waiter.cancel()
+    await asyncio.sleep(0)
+    computation.release.set()
+
+    assert await leader == {'run': 1}
+    assert waiter.cancelled()
+    assert computation.runs == 1
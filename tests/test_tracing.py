@@ -0,0 +1,85 @@
+import json
+from functools import partial
+
+import httpx
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from cea import tracing
+from cea.clients.nbrb import NBRBClient
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    tracing.setup_tracing(exporter)
+    yield exporter
+    tracing.shutdown_tracing()
+
+
+def _by_name(exporter):
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+async def test_request_spans(session, exporter):
+    from cea.main import app
+
+    # The fixture's session holds no connection yet: the request checks
+    # one out of an empty pool
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        resp = await client.get('/currencies', params={'rate_date': '2000-01-01'})
+    assert resp.status_code == 200
+
+    spans = _by_name(exporter)
+    server = spans['GET /currencies']
+    assert server.attributes['http.route'] == '/currencies'
+    assert server.attributes['http.response.status_code'] == 200
+    for name in (
+        'CurrencyRateService.list_rates',
+        'CurrencyRateRepository.list_by_date',
+        'db.pool.checkout',
+    ):
+        assert name in spans, f'missing span {name}: {sorted(spans)}'
+        assert spans[name].context.trace_id == server.context.trace_id
+    # route -> service -> repository
+    assert (
+        spans['CurrencyRateService.list_rates'].parent.span_id
+        == server.context.span_id
+    )
+    assert (
+        spans['CurrencyRateRepository.list_by_date'].parent.span_id
+        == spans['CurrencyRateService.list_rates'].context.span_id
+    )
+
+
+async def test_nbrb_span(exporter, monkeypatch):
+    rates = [{'Cur_Abbreviation': 'USD', 'Cur_Scale': 1, 'Cur_OfficialRate': 3.2}]
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=rates))
+    monkeypatch.setattr(
+        httpx, 'AsyncClient', partial(httpx.AsyncClient, transport=transport)
+    )
+
+    assert await NBRBClient(base_url='http://nbrb.test').get_daily_rates() == rates
+    assert 'NBRBClient.get_daily_rates' in _by_name(exporter)
+
+
+def test_file_exporter_closes_its_file(tmp_path, monkeypatch):
+    path = tmp_path / 'traces.jsonl'
+    monkeypatch.setattr(tracing, 'TRACING_EXPORTER', 'file')
+    monkeypatch.setattr(tracing, 'TRACING_FILE', str(path))
+
+    assert tracing.setup_tracing()
+    trace_file = tracing._trace_file
+    with tracing.span('work'):
+        pass
+    tracing.shutdown_tracing()
+
+    assert trace_file.closed
+    assert tracing._trace_file is None
+    assert json.loads(path.read_text().splitlines()[0])['name'] == 'work'